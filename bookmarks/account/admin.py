@@ -1,8 +1,14 @@
 from django.contrib import admin
-from .models import Profile
+from .models import Profile, UserStats
 
 
 @admin.register(Profile)
 class ProfileAdmin(admin.ModelAdmin):
     list_display = ['user', 'date_of_birth', 'photo']
     raw_id_fields = ['user']
+
+
+@admin.register(UserStats)
+class UserStatsAdmin(admin.ModelAdmin):
+    list_display = ['user', 'images_created', 'likes_given', 'likes_received']
+    raw_id_fields = ['user']
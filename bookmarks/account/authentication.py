@@ -1,8 +1,51 @@
 from typing import Optional
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.http import HttpRequest
 
-from .models import Profile
+from .models import Profile, normalize_email
+from .throttling import password_hash_slot
+
+USER_CACHE_KEY = 'account:user:{id}'
+
+
+def get_cached_user(user_id: int) -> Optional[User]:
+    """
+    Return the user with its profile, from the cache when possible.
+    """
+    key = USER_CACHE_KEY.format(id=user_id)
+    user = cache.get(key) if settings.AUTH_USER_CACHE_TIMEOUT else None
+    if user is None:
+        try:
+            user = User.objects.select_related('profile').get(pk=user_id)
+        except User.DoesNotExist:
+            return None
+        if settings.AUTH_USER_CACHE_TIMEOUT:
+            cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+    return user
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    cache.delete(USER_CACHE_KEY.format(id=user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    Username authentication whose session lookups are served from the user cache.
+    """
+    def authenticate(
+        self, request: Optional[HttpRequest], username: Optional[str] = None, password: Optional[str] = None, **kwargs
+    ) -> Optional[User]:
+        if username is None or password is None:
+            return None
+        with password_hash_slot(request):
+            return super().authenticate(request, username, password, **kwargs)
+
+    def get_user(self, user_id: int) -> Optional[User]:
+        user = get_cached_user(user_id)
+        return user if user and self.user_can_authenticate(user) else None
 
 
 class EmailAuthBackend:
@@ -12,19 +55,20 @@ class EmailAuthBackend:
     def authenticate(
         self, request: Optional[HttpRequest], username: Optional[str] = None, password: Optional[str] = None
     ) -> Optional[User]:
+        if not username or password is None:
+            return None
         try:
-            user = User.objects.get(email=username)
+            # Indexed lookup on the unique, case-normalized address
+            user = User.objects.get(normalized_email__email=normalize_email(username))
+        except User.DoesNotExist:
+            return None
+        with password_hash_slot(request):
             if user.check_password(password):
                 return user
-            return None
-        except (User.DoesNotExist, User.MultipleObjectsReturned):
-            return None
+        return None
 
     def get_user(self, user_id: int) -> Optional[User]:
-        try:
-            return User.objects.get(pk=user_id)
-        except User.DoesNotExist:
-            return None
+        return get_cached_user(user_id)
 
 
 def create_profile(backend: str, user: User, *args: object, **kwargs: object) -> None:
@@ -0,0 +1,21 @@
+from functools import wraps
+
+from django.contrib.auth.views import redirect_to_login
+
+
+def async_login_required(view_func):
+    """
+    login_required for async views.
+
+    The user is loaded with ``request.auser()`` instead of touching the lazy
+    ``request.user`` from the event loop, then stored on the request so the
+    view and its templates can use ``request.user`` as usual.
+    """
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        request.user = user
+        return await view_func(request, *args, **kwargs)
+    return wrapper
@@ -1,6 +1,8 @@
 from django import forms
 from django.contrib.auth import get_user_model
-from .models import Profile
+from django.core.files.uploadedfile import UploadedFile
+from .models import Profile, UserEmail, normalize_email
+from .photos import PhotoError, process_photo
 
 User = get_user_model()
 
@@ -32,7 +34,7 @@ class UserRegistrationForm(forms.ModelForm):
 
     def clean_email(self):
         data = self.cleaned_data['email']
-        if User.objects.filter(email=data).exists():
+        if UserEmail.objects.filter(email=normalize_email(data)).exists():
             raise forms.ValidationError('Email already in use.')
         return data
 
@@ -56,7 +58,9 @@ class UserEditForm(forms.ModelForm):
     def clean_email(self):
         email = self.cleaned_data['email']
         # Check if the email is already in use by another user
-        users_with_email = User.objects.filter(email=email).exclude(pk=self.instance.pk)
+        users_with_email = UserEmail.objects.filter(
+            email=normalize_email(email)
+        ).exclude(user=self.instance)
         if users_with_email.exists():
             raise forms.ValidationError('A user with this email already exists.')
         return email
@@ -66,4 +70,26 @@ class UserEditForm(forms.ModelForm):
 class ProfileEditForm(forms.ModelForm):
     class Meta:
         model = Profile
-        fields = ('date_of_birth', 'photo')
\ No newline at end of file
+        fields = ('date_of_birth', 'photo')
+
+    def clean_photo(self):
+        photo = self.cleaned_data['photo']
+        self.photo_variants = None
+        if isinstance(photo, UploadedFile):
+            # Decode once here; save() stores the results instead of the upload
+            try:
+                self.photo_variants = process_photo(photo)
+            except PhotoError as exc:
+                raise forms.ValidationError(str(exc))
+        return photo
+
+    def save(self, commit=True):
+        profile = super().save(commit=False)
+        if getattr(self, 'photo_variants', None):
+            profile.set_photo(self.photo_variants)
+        elif not profile.photo:
+            # The photo was cleared
+            profile.avatar = profile.avatar_small = ''
+        if commit:
+            profile.save()
+        return profile
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+Cached adjacency of the follow graph.
+
+The ids a user follows, and the ids following them, are each cached as one
+frozenset, so "is A following B" is a set lookup and "who does A follow"
+reads k ids, instead of a query on the Contact table. Both sets of both
+users are invalidated whenever a contact is created or deleted. Eviction
+needs a cache shared by all workers (see CACHE_BACKEND); the sets also expire
+after ACCOUNT_GRAPH_CACHE_TIMEOUT.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+
+from .models import Contact
+
+FOLLOWING_KEY = 'account:following:{id}'
+FOLLOWERS_KEY = 'account:followers:{id}'
+
+
+def _get_ids(key: str, column: str, lookup: str, user_id: int) -> frozenset[int]:
+    key = key.format(id=user_id)
+    ids = cache.get(key)
+    if ids is None:
+        ids = frozenset(Contact.objects.filter(**{lookup: user_id}).values_list(column, flat=True))
+        cache.set(key, ids, settings.ACCOUNT_GRAPH_CACHE_TIMEOUT)
+    return ids
+
+
+def get_following_ids(user_id: int) -> frozenset[int]:
+    """
+    Return the ids of the users followed by the user.
+    """
+    return _get_ids(FOLLOWING_KEY, 'user_to_id', 'user_from_id', user_id)
+
+
+def get_follower_ids(user_id: int) -> frozenset[int]:
+    """
+    Return the ids of the users following the user.
+    """
+    return _get_ids(FOLLOWERS_KEY, 'user_from_id', 'user_to_id', user_id)
+
+
+def is_following(user_from_id: int, user_to_id: int) -> bool:
+    return user_to_id in get_following_ids(user_from_id)
+
+
+def invalidate_graph(user_from_id: int, user_to_id: int) -> None:
+    cache.delete_many([FOLLOWING_KEY.format(id=user_from_id), FOLLOWERS_KEY.format(id=user_to_id)])
+
+
+def follow(user_from_id: int, user_to_id: int) -> bool:
+    """
+    Create the contact and return True, or False if it already existed.
+    """
+    try:
+        with transaction.atomic():
+            _, created = Contact.objects.get_or_create(user_from_id=user_from_id, user_to_id=user_to_id)
+    except IntegrityError:
+        # A concurrent request created it first
+        return False
+    return created
+
+
+def unfollow(user_from_id: int, user_to_id: int) -> bool:
+    """
+    Delete the contact and return True, or False if there was none.
+    """
+    deleted, _ = Contact.objects.filter(user_from_id=user_from_id, user_to_id=user_to_id).delete()
+    return bool(deleted)
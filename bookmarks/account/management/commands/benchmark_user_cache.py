@@ -0,0 +1,55 @@
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from account.models import Profile
+
+
+class Command(BaseCommand):
+    """
+    Compare the number of queries per authenticated request with and without
+    the session and user caches. Test data is rolled back at the end.
+    """
+    help = 'Report the per-request query count of an authenticated page with and without the user cache.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', help='Page to request (defaults to the profile edit page).')
+        parser.add_argument('--requests', type=int, default=20)
+
+    def handle(self, *args, **options):
+        path = options['path'] or reverse('edit')
+        with transaction.atomic():
+            username = f'benchmark-{uuid.uuid4().hex[:8]}'
+            password = uuid.uuid4().hex
+            user = get_user_model().objects.create_user(username=username, password=password)
+            Profile.objects.create(user=user)
+
+            uncached = {
+                'AUTHENTICATION_BACKENDS': ['django.contrib.auth.backends.ModelBackend'],
+                'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+            }
+            cached = {
+                'AUTHENTICATION_BACKENDS': settings.AUTHENTICATION_BACKENDS,
+                'SESSION_ENGINE': settings.SESSION_ENGINE,
+            }
+            for label, overrides in (('before', uncached), ('after', cached)):
+                with override_settings(**overrides):
+                    per_request = self.measure(path, username, password, options['requests'])
+                self.stdout.write(f'{label:>6}: {per_request:.2f} queries per request to {path}')
+            transaction.set_rollback(True)
+
+    def measure(self, path: str, username: str, password: str, requests: int) -> float:
+        client = Client(SERVER_NAME=settings.ALLOWED_HOSTS[0])
+        client.login(username=username, password=password)
+        # The first request fills the caches
+        client.get(path)
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(requests):
+                client.get(path)
+        return len(queries) / requests
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from account.models import Profile
+from account.photos import PhotoError, process_photo
+
+
+class Command(BaseCommand):
+    """
+    Re-encode the profile photos uploaded before avatars were generated:
+    strip their metadata and create the avatar crops.
+    """
+    help = 'Strip metadata from existing profile photos and generate their avatars.'
+
+    def handle(self, *args, **options):
+        profiles = Profile.objects.exclude(photo='').filter(avatar='').select_related('user')
+        processed = 0
+        for profile in profiles.iterator(chunk_size=100):
+            original = profile.photo.name
+            try:
+                with profile.photo.open('rb') as f:
+                    variants = process_photo(f)
+            except (OSError, PhotoError) as exc:
+                self.stderr.write(f'{original}: {exc}')
+                continue
+            profile.set_photo(variants)
+            profile.save(update_fields=['photo', 'avatar', 'avatar_small'])
+            if profile.photo.name != original:
+                # The original still holds the metadata
+                profile.photo.storage.delete(original)
+            processed += 1
+        self.stdout.write(self.style.SUCCESS(f'{processed} photo(s) processed.'))
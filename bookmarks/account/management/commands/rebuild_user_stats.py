@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from account.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    """
+    Recompute the dashboard counters from the images and likes tables,
+    e.g. after a bulk import or manual SQL that bypassed the signals.
+    """
+    help = 'Recompute the per-user dashboard statistics.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('users', nargs='*', type=int, help='Ids of the users to rebuild (all by default).')
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_stats(options['users'] or None)
+        self.stdout.write(self.style.SUCCESS(f'{rebuilt} user(s) rebuilt.'))
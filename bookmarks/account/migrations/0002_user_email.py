@@ -0,0 +1,39 @@
+# Generated by Django 5.0.9 on 2026-10-18 11:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def index_emails(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    UserEmail = apps.get_model('account', 'UserEmail')
+    seen = set()
+    entries = []
+    for user_id, email in User.objects.exclude(email='').order_by('pk').values_list('pk', 'email'):
+        email = email.strip().casefold()
+        # The oldest account keeps an address shared by several users
+        if email not in seen:
+            seen.add(email)
+            entries.append(UserEmail(user_id=user_id, email=email))
+    UserEmail.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email', models.CharField(max_length=254, unique=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='normalized_email', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(index_emails, migrations.RunPython.noop),
+    ]
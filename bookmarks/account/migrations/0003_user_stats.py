@@ -0,0 +1,58 @@
+# Generated by Django 5.0.9 on 2026-10-18 11:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def compute_stats(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    Image = apps.get_model('images', 'Image')
+    UserStats = apps.get_model('account', 'UserStats')
+    Like = Image.user_like.through
+    UserStats.objects.bulk_create(
+        [UserStats(user_id=pk) for pk in User.objects.values_list('pk', flat=True).iterator()],
+        batch_size=1000
+    )
+    created = Image.objects.filter(
+        user_id=OuterRef('user_id')
+    ).order_by().values('user_id').annotate(total=Count('*')).values('total')
+    given = Like.objects.filter(
+        user_id=OuterRef('user_id')
+    ).order_by().values('user_id').annotate(total=Count('*')).values('total')
+    received = Like.objects.filter(
+        image__user_id=OuterRef('user_id')
+    ).order_by().values('image__user_id').annotate(total=Count('*')).values('total')
+    UserStats.objects.update(
+        images_created=Coalesce(Subquery(created), 0),
+        likes_given=Coalesce(Subquery(given), 0),
+        likes_received=Coalesce(Subquery(received), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0002_user_email'),
+        ('images', '0006_image_trending_score'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('images_created', models.PositiveIntegerField(default=0)),
+                ('likes_given', models.PositiveIntegerField(default=0)),
+                ('likes_received', models.PositiveIntegerField(default=0)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'user stats',
+            },
+        ),
+        migrations.RunPython(compute_stats, migrations.RunPython.noop),
+    ]
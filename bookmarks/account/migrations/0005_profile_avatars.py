@@ -0,0 +1,23 @@
+# Generated by Django 5.0.9 on 2026-10-18 12:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0004_contact'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='avatar',
+            field=models.ImageField(blank=True, upload_to='user/avatars/%Y/%m/%d'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='avatar_small',
+            field=models.ImageField(blank=True, upload_to='user/avatars/%Y/%m/%d'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.core.cache import caches
+from django.db import migrations
+from django.utils import timezone
+
+OLD_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+NEW_BACKEND = 'account.authentication.CachedModelBackend'
+
+
+def rewrite_backend(apps, old, new):
+    # Sessions name the backend that logged the user in; an unlisted path logs them out
+    Session = apps.get_model('sessions', 'Session')
+    engine = import_module(settings.SESSION_ENGINE)
+    sessions = Session.objects.filter(expire_date__gt=timezone.now())
+    for session in sessions.iterator():
+        store = engine.SessionStore(session.session_key)
+        data = store.decode(session.session_data)
+        if data.get(BACKEND_SESSION_KEY) != old:
+            continue
+        data[BACKEND_SESSION_KEY] = new
+        Session.objects.filter(pk=session.pk).update(session_data=store.encode(data))
+        if hasattr(store, 'cache_key'):
+            # cached_db would keep serving the old copy until it expires
+            caches[settings.SESSION_CACHE_ALIAS].delete(store.cache_key)
+
+
+def forwards(apps, schema_editor):
+    rewrite_backend(apps, OLD_BACKEND, NEW_BACKEND)
+
+
+def backwards(apps, schema_editor):
+    rewrite_backend(apps, NEW_BACKEND, OLD_BACKEND)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0005_profile_avatars'),
+        ('sessions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -12,6 +12,104 @@ class Profile(models.Model):
         upload_to='user/%Y/%m/%d',
         blank=True,
     )
+    # Square crops of the photo, generated on upload (see account/photos.py)
+    avatar = models.ImageField(upload_to='user/avatars/%Y/%m/%d', blank=True)
+    avatar_small = models.ImageField(upload_to='user/avatars/%Y/%m/%d', blank=True)
 
     def __str__(self):
         return f'Profile of {self.user.username}'
+
+    def set_photo(self, variants: dict) -> None:
+        """
+        Attach the files returned by process_photo(), without saving the profile.
+        """
+        for field, content in variants.items():
+            suffix = '' if field == 'photo' else f'-{field}'
+            getattr(self, field).save(f'{self.user_id}{suffix}.jpg', content, save=False)
+
+    @property
+    def avatar_url(self) -> str:
+        # Photos uploaded before avatars existed fall back to the photo itself
+        return (self.avatar or self.photo).url if self.photo else ''
+
+    @property
+    def avatar_small_url(self) -> str:
+        return (self.avatar_small or self.avatar or self.photo).url if self.photo else ''
+
+
+def normalize_email(email: str) -> str:
+    """
+    Return the form of an e-mail address used for lookups.
+    """
+    return email.strip().casefold()
+
+
+class UserEmail(models.Model):
+    """
+    Case-normalized, unique and indexed e-mail address of a user,
+    used for e-mail login and uniqueness checks.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        related_name='normalized_email',
+        on_delete=models.CASCADE
+    )
+    email = models.CharField(max_length=254, unique=True)
+
+    def __str__(self):
+        return self.email
+
+
+class UserStats(models.Model):
+    """
+    Per-user counters shown on the dashboard, kept up to date by signals
+    instead of being aggregated on every page load.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        related_name='stats',
+        on_delete=models.CASCADE
+    )
+    images_created = models.PositiveIntegerField(default=0)
+    likes_given = models.PositiveIntegerField(default=0)
+    likes_received = models.PositiveIntegerField(default=0)
+    followers = models.PositiveIntegerField(default=0)
+    following = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = 'user stats'
+
+    def __str__(self):
+        return f'Stats of {self.user.username}'
+
+
+class Contact(models.Model):
+    """
+    A user following another user.
+    """
+    user_from = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='rel_from_set',
+        on_delete=models.CASCADE
+    )
+    user_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='rel_to_set',
+        on_delete=models.CASCADE
+    )
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created']),
+        ]
+        constraints = [
+            # Also the index answering "who does A follow"
+            models.UniqueConstraint(fields=['user_from', 'user_to'], name='unique_contact'),
+            models.CheckConstraint(check=~models.Q(user_from=models.F('user_to')), name='no_self_contact'),
+        ]
+        ordering = ['-created']
+
+    def __str__(self):
+        return f'{self.user_from} follows {self.user_to}'
+
@@ -0,0 +1,103 @@
+"""
+Profile photo processing.
+
+An uploaded photo is decoded once (JPEG draft mode decodes at a reduced
+scale), rotated according to its EXIF orientation and re-encoded without
+its metadata (EXIF, GPS position, camera details). Only the re-encoded
+photo and its square avatar crops are stored, never the upload itself.
+
+PhotoUploadHandler caps the upload size while the request body is being
+parsed, so an oversized file is dropped chunk by chunk instead of being
+written to a temporary file first.
+"""
+
+from io import BytesIO
+from typing import IO, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from django.http import HttpRequest
+from PIL import Image as PILImage, ImageOps
+
+
+class PhotoError(ValueError):
+    pass
+
+
+class PhotoUploadHandler(FileUploadHandler):
+    """
+    Skip uploaded files larger than ACCOUNT_PHOTO_MAX_UPLOAD_BYTES and flag
+    the request with ``photo_too_large``.
+
+    Must be installed before the request body is read: the view is
+    csrf_exempt and applies csrf_protect itself after inserting it.
+    """
+    def __init__(self, request: Optional[HttpRequest] = None) -> None:
+        super().__init__(request)
+        self.received = 0
+        self.request_too_large = False
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None) -> None:
+        # A declared body larger than the limit (plus the other form fields) cannot fit
+        limit = settings.ACCOUNT_PHOTO_MAX_UPLOAD_BYTES + 64 * 1024
+        self.request_too_large = content_length > limit
+
+    def new_file(self, *args, **kwargs) -> None:
+        super().new_file(*args, **kwargs)
+        self.received = 0
+        if self.request_too_large:
+            self._reject()
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> bytes:
+        self.received += len(raw_data)
+        if self.received > settings.ACCOUNT_PHOTO_MAX_UPLOAD_BYTES:
+            self._reject()
+        return raw_data
+
+    def file_complete(self, file_size: int) -> None:
+        # Let the next handler build the uploaded file
+        return None
+
+    def _reject(self) -> None:
+        self.request.photo_too_large = True
+        raise SkipFile()
+
+
+def _encode(image: PILImage.Image, icc_profile: Optional[bytes]) -> ContentFile:
+    buffer = BytesIO()
+    # No exif= argument: the metadata of the upload is not written back
+    image.save(
+        buffer,
+        format='JPEG',
+        quality=settings.ACCOUNT_PHOTO_QUALITY,
+        optimize=True,
+        icc_profile=icc_profile
+    )
+    return ContentFile(buffer.getvalue())
+
+
+def process_photo(file: IO[bytes]) -> dict[str, ContentFile]:
+    """
+    Return the re-encoded photo and its avatars, keyed by Profile field name.
+
+    Raise PhotoError if the file is not an image or has too many pixels.
+    """
+    size = settings.ACCOUNT_PHOTO_SIZE
+    file.seek(0)
+    try:
+        with PILImage.open(file) as source:
+            if source.width * source.height > settings.ACCOUNT_PHOTO_MAX_PIXELS:
+                raise PhotoError('The image has too many pixels.')
+            icc_profile = source.info.get('icc_profile')
+            source.draft('RGB', (size, size))
+            image = ImageOps.exif_transpose(source).convert('RGB')
+    except (OSError, SyntaxError, PILImage.DecompressionBombError) as exc:
+        raise PhotoError('Upload a valid image.') from exc
+
+    image.thumbnail((size, size), PILImage.LANCZOS)
+    variants = {'photo': _encode(image, icc_profile)}
+    for field, side in settings.ACCOUNT_AVATAR_SIZES.items():
+        avatar = ImageOps.fit(image, (side, side), PILImage.LANCZOS)
+        variants[field] = _encode(avatar, icc_profile)
+    return variants
@@ -0,0 +1,125 @@
+import logging
+
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_in, user_login_failed
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from images.models import Image
+from images.signals import image_liked
+
+from .authentication import invalidate_cached_user
+from .graph import invalidate_graph
+from .models import Contact, Profile, UserEmail, UserStats, normalize_email
+from .stats import update_stats
+from .throttling import clear_account_failures, record_failure
+
+logger = logging.getLogger(__name__)
+
+
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+def user_changed(sender, instance, **kwargs) -> None:
+    invalidate_cached_user(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Profile)
+def profile_changed(sender, instance: Profile, **kwargs) -> None:
+    invalidate_cached_user(instance.user_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def sync_user_email(sender, instance, update_fields=None, **kwargs) -> None:
+    """
+    Keep the normalized e-mail lookup table in sync with User.email.
+    """
+    if update_fields is not None and 'email' not in update_fields:
+        return
+    if not instance.email:
+        UserEmail.objects.filter(user=instance).delete()
+        return
+    try:
+        with transaction.atomic():
+            UserEmail.objects.update_or_create(
+                user=instance,
+                defaults={'email': normalize_email(instance.email)}
+            )
+    except IntegrityError:
+        # The registration and edit forms reject duplicates; other paths
+        # (admin, social auth) may not, and must not fail the save.
+        logger.warning('E-mail of user %s is already used by another account', instance.pk)
+        UserEmail.objects.filter(user=instance).delete()
+
+
+@receiver(user_login_failed)
+def login_failed(sender, credentials: dict, request=None, **kwargs) -> None:
+    username = credentials.get('username')
+    # Attempts rejected before the password was checked (over the limit, or
+    # no free hash slot) are not counted as failures
+    if username and not getattr(request, 'login_throttled', False):
+        record_failure(request, username)
+
+
+@receiver(user_logged_in)
+def logged_in(sender, request, user, **kwargs) -> None:
+    # Only the account counter is cleared, not the one of the client IP
+    clear_account_failures(user.get_username())
+    if user.email:
+        clear_account_failures(user.email)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def create_user_stats(sender, instance, created: bool, raw: bool = False, **kwargs) -> None:
+    if created and not raw:
+        UserStats.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=Image)
+def image_created(sender, instance: Image, created: bool, raw: bool = False, **kwargs) -> None:
+    if created and not raw:
+        update_stats([instance.user_id], images_created=1)
+
+
+@receiver(pre_delete, sender=Image)
+def image_deleted(sender, instance: Image, **kwargs) -> None:
+    # The like rows are gone by post_delete, so collect the likers first
+    likers = list(instance.user_like.values_list('pk', flat=True))
+    update_stats([instance.user_id], images_created=-1, likes_received=-len(likers))
+    update_stats(likers, likes_given=-1)
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def user_deleted(sender, instance, **kwargs) -> None:
+    # The cascade removes the user's likes without sending image_liked
+    received = Image.user_like.through.objects.filter(
+        user=instance
+    ).exclude(image__user=instance).order_by().values('image__user_id').annotate(total=Count('*'))
+    for row in received:
+        update_stats([row['image__user_id']], likes_received=-row['total'])
+
+
+@receiver(image_liked)
+def image_like_changed(sender, image: Image, user, delta: int, **kwargs) -> None:
+    update_stats([user.pk], likes_given=delta)
+    update_stats([image.user_id], likes_received=delta)
+
+
+@receiver(post_save, sender=Contact)
+def contact_created(sender, instance: Contact, created: bool, raw: bool = False, **kwargs) -> None:
+    if created and not raw:
+        contact_changed(instance, 1)
+
+
+@receiver(post_delete, sender=Contact)
+def contact_deleted(sender, instance: Contact, **kwargs) -> None:
+    contact_changed(instance, -1)
+
+
+def contact_changed(contact: Contact, delta: int) -> None:
+    update_stats([contact.user_from_id], following=delta)
+    update_stats([contact.user_to_id], followers=delta)
+    user_from_id, user_to_id = contact.user_from_id, contact.user_to_id
+    invalidate_graph(user_from_id, user_to_id)
+    # Readers during the transaction may have cached the old sets again
+    transaction.on_commit(lambda: invalidate_graph(user_from_id, user_to_id))
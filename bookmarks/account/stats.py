@@ -0,0 +1,85 @@
+"""
+Incremental maintenance of the per-user dashboard counters.
+
+Signals add or subtract deltas with a single UPDATE each; ``rebuild_stats``
+recomputes the counters from the images, likes and contacts tables for rows that are
+missing or have drifted (bulk imports, manual SQL, ...).
+"""
+
+from typing import Iterable, Optional
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from images.models import Image
+
+from .models import Contact, UserStats
+
+Like = Image.user_like.through
+
+
+def update_stats(user_ids: Iterable[int], **deltas: int) -> None:
+    """
+    Add ``deltas`` to the counters of the given users.
+    """
+    changes = {
+        field: Greatest(F(field) + delta, 0)
+        for field, delta in deltas.items() if delta
+    }
+    user_ids = set(user_ids)
+    if not changes or not user_ids:
+        return
+    updated = UserStats.objects.filter(user_id__in=user_ids).update(**changes)
+    if updated < len(user_ids):
+        # Users without a row yet get theirs computed from scratch
+        existing = UserStats.objects.filter(user_id__in=user_ids).values_list('user_id', flat=True)
+        rebuild_stats(user_ids - set(existing))
+
+
+def rebuild_stats(user_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute the counters of the given users (all users by default) and
+    return the number of rows written.
+    """
+    users = get_user_model().objects.all()
+    if user_ids is not None:
+        users = users.filter(pk__in=list(user_ids))
+    UserStats.objects.bulk_create(
+        [UserStats(user_id=pk) for pk in users.values_list('pk', flat=True).iterator()],
+        batch_size=1000,
+        ignore_conflicts=True
+    )
+    created = Image.objects.filter(
+        user_id=OuterRef('user_id')
+    ).order_by().values('user_id').annotate(total=Count('*')).values('total')
+    given = Like.objects.filter(
+        user_id=OuterRef('user_id')
+    ).order_by().values('user_id').annotate(total=Count('*')).values('total')
+    received = Like.objects.filter(
+        image__user_id=OuterRef('user_id')
+    ).order_by().values('image__user_id').annotate(total=Count('*')).values('total')
+    followers = Contact.objects.filter(
+        user_to_id=OuterRef('user_id')
+    ).order_by().values('user_to_id').annotate(total=Count('*')).values('total')
+    following = Contact.objects.filter(
+        user_from_id=OuterRef('user_id')
+    ).order_by().values('user_from_id').annotate(total=Count('*')).values('total')
+    return UserStats.objects.filter(user__in=users).update(
+        images_created=Coalesce(Subquery(created), 0),
+        likes_given=Coalesce(Subquery(given), 0),
+        likes_received=Coalesce(Subquery(received), 0),
+        followers=Coalesce(Subquery(followers), 0),
+        following=Coalesce(Subquery(following), 0)
+    )
+
+
+def get_stats(user) -> UserStats:
+    """
+    Return the counters of a user with a single row lookup.
+    """
+    try:
+        return UserStats.objects.get(user=user)
+    except UserStats.DoesNotExist:
+        rebuild_stats([user.pk])
+        return UserStats.objects.get(user=user)
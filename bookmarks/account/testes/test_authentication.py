@@ -43,6 +43,30 @@ class EmailAuthBackendTests(TestCase):
         )
         self.assertIsNone(user)
 
+    def test_authenticate_ignores_email_case(self):
+        """Test that the e-mail lookup is case-insensitive."""
+        user = self.backend.authenticate(
+            request=None,
+            username=' TestUser@Example.COM',
+            password='testpassword'
+        )
+        self.assertEqual(user, self.user)
+
+    def test_authenticate_follows_email_change(self):
+        """Test that the lookup table follows changes of the user's e-mail."""
+        self.user.email = 'new@example.com'
+        self.user.save()
+        self.assertIsNone(self.backend.authenticate(
+            request=None,
+            username='testuser@example.com',
+            password='testpassword'
+        ))
+        self.assertEqual(self.backend.authenticate(
+            request=None,
+            username='new@example.com',
+            password='testpassword'
+        ), self.user)
+
     def test_get_user_with_valid_id(self):
         """Test that get_user returns the user for a valid ID."""
         user = self.backend.get_user(self.user.id)
@@ -0,0 +1,87 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from account.graph import get_follower_ids, get_following_ids, is_following
+from account.models import Contact, Profile
+from account.stats import get_stats, rebuild_stats
+from actions.feed import create_action, get_feed
+
+
+@override_settings(BACKGROUND_WORKERS=0)
+class FollowTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', password='testpassword', first_name='Alice')
+        self.bob = User.objects.create_user(username='bob', password='testpassword', first_name='Bob')
+        Profile.objects.create(user=self.alice)
+        Profile.objects.create(user=self.bob)
+        self.client.login(username='alice', password='testpassword')
+
+    def post_follow(self, user: User, action: str) -> dict:
+        return self.client.post(reverse('user_follow'), {'id': user.id, 'action': action}).json()
+
+    def test_follow_and_unfollow(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            data = self.post_follow(self.bob, 'follow')
+        self.assertEqual(data, {'status': 'ok', 'following': True, 'total_followers': 1})
+        # Following twice changes nothing
+        self.assertEqual(self.post_follow(self.bob, 'follow')['total_followers'], 1)
+        self.assertTrue(self.alice.rel_from_set.filter(user_to=self.bob).exists())
+        self.assertEqual(get_stats(self.alice).following, 1)
+        # The followed user is told in their feed
+        self.assertEqual([a.verb for a in get_feed(self.bob)], ['is following'])
+
+        data = self.post_follow(self.bob, 'unfollow')
+        self.assertEqual(data, {'status': 'ok', 'following': False, 'total_followers': 0})
+        self.assertEqual(get_stats(self.alice).following, 0)
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.post_follow(self.alice, 'follow'), {'status': 'error'})
+        self.assertEqual(self.client.post(reverse('user_follow'), {'id': 'x', 'action': 'follow'}).json(),
+                         {'status': 'error'})
+        self.assertEqual(self.client.post(reverse('user_follow'), {'id': 999, 'action': 'follow'}).json(),
+                         {'status': 'error'})
+        self.assertEqual(self.client.get(reverse('user_follow')).status_code, 405)
+        self.assertFalse(Contact.objects.exists())
+
+    def test_adjacency_is_cached_and_invalidated(self):
+        self.assertFalse(is_following(self.alice.id, self.bob.id))
+        with self.assertNumQueries(0):
+            self.assertEqual(get_following_ids(self.alice.id), frozenset())
+        Contact.objects.create(user_from=self.alice, user_to=self.bob)
+        with self.assertNumQueries(1):
+            self.assertTrue(is_following(self.alice.id, self.bob.id))
+        with self.assertNumQueries(0):
+            self.assertTrue(is_following(self.alice.id, self.bob.id))
+        self.assertEqual(get_follower_ids(self.bob.id), frozenset({self.alice.id}))
+
+    def test_followers_receive_actions(self):
+        Contact.objects.create(user_from=self.bob, user_to=self.alice)
+        with self.captureOnCommitCallbacks(execute=True):
+            create_action(self.alice, 'updated their profile')
+        self.assertEqual([a.verb for a in get_feed(self.bob)], ['updated their profile'])
+
+    def test_rebuild_counts_contacts(self):
+        Contact.objects.create(user_from=self.alice, user_to=self.bob)
+        self.bob.stats.followers = 7
+        self.bob.stats.save()
+        rebuild_stats()
+        self.assertEqual(get_stats(self.bob).followers, 1)
+
+    def test_people_pages(self):
+        Contact.objects.create(user_from=self.alice, user_to=self.bob)
+        response = self.client.get(reverse('user_list'))
+        self.assertContains(response, self.bob.get_absolute_url())
+        response = self.client.get(reverse('user_detail', args=['bob']))
+        self.assertTrue(response.context['is_following'])
+        self.assertContains(response, 'data-action="unfollow"')
+        self.assertEqual(self.client.get(reverse('user_detail', args=['nobody'])).status_code, 404)
+
+
+class MigrationTests(TestCase):
+    def test_no_pending_migrations(self):
+        """The follow graph lives in account's own migrations; no auth migration is pending."""
+        call_command('makemigrations', '--check', '--dry-run', stdout=StringIO())
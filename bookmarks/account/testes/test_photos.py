@@ -0,0 +1,97 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image as PILImage
+
+from account.models import Profile
+from images.models import Image
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_photo(size=(800, 600), orientation=None) -> bytes:
+    image = PILImage.new('RGB', size, (200, 30, 30))
+    exif = PILImage.Exif()
+    exif[0x010F] = 'CameraMaker'  # Make
+    if orientation:
+        exif[0x0112] = orientation
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG', exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, BACKGROUND_WORKERS=0)
+class ProfilePhotoTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword', email='t@example.com')
+        self.profile = Profile.objects.create(user=self.user)
+        self.client.login(username='testuser', password='testpassword')
+
+    def upload(self, content: bytes, name: str = 'me.jpg'):
+        return self.client.post(reverse('edit'), {
+            'username': 'testuser',
+            'email': 't@example.com',
+            'photo': SimpleUploadedFile(name, content, content_type='image/jpeg'),
+        })
+
+    def test_photo_is_stripped_rotated_and_cropped(self):
+        response = self.upload(make_photo(orientation=6))
+        self.assertEqual(response.status_code, 200)
+        self.profile.refresh_from_db()
+        with PILImage.open(self.profile.photo.path) as photo:
+            # Orientation 6: the stored photo is upright and carries no EXIF
+            self.assertEqual(photo.size, (600, 800))
+            self.assertFalse(photo.getexif())
+        for field, side in (('avatar', 240), ('avatar_small', 64)):
+            with PILImage.open(getattr(self.profile, field).path) as avatar:
+                self.assertEqual(avatar.size, (side, side))
+        self.assertEqual(self.profile.avatar_small_url, self.profile.avatar_small.url)
+
+    def test_large_photo_is_downscaled(self):
+        self.upload(make_photo(size=(3000, 1500)))
+        self.profile.refresh_from_db()
+        self.assertEqual((self.profile.photo.width, self.profile.photo.height), (1024, 512))
+
+    @override_settings(ACCOUNT_PHOTO_MAX_UPLOAD_BYTES=1024)
+    def test_oversized_upload_is_rejected_while_streaming(self):
+        response = self.upload(make_photo())
+        self.assertIn('must not be larger than 1.0\xa0KB', response.context['profile_form'].errors['photo'][0])
+        self.profile.refresh_from_db()
+        self.assertFalse(self.profile.photo)
+
+    def test_csrf_is_still_checked(self):
+        self.client.logout()
+        client = self.client_class(enforce_csrf_checks=True)
+        client.login(username='testuser', password='testpassword')
+        response = client.post(reverse('edit'), {'username': 'x'})
+        self.assertEqual(response.status_code, 403)
+
+    def test_liker_list_serves_avatars(self):
+        self.upload(make_photo())
+        self.profile.refresh_from_db()
+        image = Image.objects.create(user=self.user, title='Red', url='http://example.com/r.png')
+        image.user_like.add(self.user)
+        Image.objects.filter(pk=image.pk).update(total_likes=1)
+        response = self.client.get(image.get_absolute_url())
+        self.assertContains(response, self.profile.avatar.url)
+        self.assertNotContains(response, f'src="{self.profile.photo.url}"')
+
+    def test_existing_photos_are_processed(self):
+        self.profile.photo = SimpleUploadedFile('old.jpg', make_photo(orientation=3))
+        self.profile.save()
+        call_command('process_profile_photos', stdout=StringIO())
+        self.profile.refresh_from_db()
+        self.assertTrue(self.profile.avatar)
+        with PILImage.open(self.profile.photo.path) as photo:
+            self.assertFalse(photo.getexif())
@@ -51,3 +51,19 @@ class RegisterViewTest(TestCase):
         # Check that no user or profile is created
         self.assertFalse(User.objects.exists())
         self.assertFalse(Profile.objects.exists())
+
+    def test_register_view_rejects_email_in_other_case(self):
+        """
+        Test that an e-mail already used with a different case is rejected.
+        """
+        User.objects.create_user(username='existing', email='testuser@example.com')
+        data = {
+            'username': 'testuser',
+            'password': 'testpassword123',
+            'password2': 'testpassword123',
+            'email': 'TestUser@Example.com'
+        }
+        response = self.client.post(reverse('register'), data)
+        self.assertTemplateUsed(response, 'account/register.html')
+        self.assertIn('email', response.context['user_form'].errors)
+        self.assertFalse(User.objects.filter(username='testuser').exists())
@@ -0,0 +1,96 @@
+import threading
+from unittest.mock import patch
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+
+from account import throttling
+from account.throttling import login_stats, reset_login_stats
+
+
+@override_settings(
+    AUTH_THROTTLE_MAX_FAILURES_PER_ACCOUNT=3,
+    AUTH_THROTTLE_MAX_FAILURES_PER_IP=5,
+    AUTH_THROTTLE_WINDOW=60
+)
+class LoginThrottlingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_login_stats()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='testuser@example.com',
+            password='testpassword'
+        )
+
+    def attempt(self, username='testuser', password='wrongpassword', ip='10.0.0.1'):
+        request = RequestFactory().post('/account/login/', REMOTE_ADDR=ip)
+        return authenticate(request, username=username, password=password)
+
+    def test_account_is_throttled_after_failures(self):
+        """Test that an account over its limit is rejected without hashing."""
+        for _ in range(3):
+            self.assertIsNone(self.attempt())
+        hashed = login_stats()['hashed']
+        self.assertIsNone(self.attempt(password='testpassword'))
+        self.assertEqual(login_stats()['hashed'], hashed)
+        self.assertEqual(login_stats()['rejected'], 1)
+
+    def test_ip_is_throttled_after_failures(self):
+        """Test that an IP over its limit is rejected for every account."""
+        for i in range(5):
+            self.attempt(username=f'unknown{i}')
+        self.assertIsNone(self.attempt(password='testpassword'))
+        self.assertEqual(self.attempt(password='testpassword', ip='10.0.0.2'), self.user)
+
+    def test_failures_expire_after_window(self):
+        """Test that failures older than the window are forgotten."""
+        with patch('account.throttling.time.time', return_value=1000):
+            for _ in range(3):
+                self.attempt()
+        with patch('account.throttling.time.time', return_value=1061):
+            self.assertEqual(self.attempt(password='testpassword'), self.user)
+
+    def test_successful_login_clears_account_failures(self):
+        """Test that a successful login resets the account counter."""
+        self.client.post('/account/login/', {'username': 'testuser', 'password': 'wrong'})
+        self.client.post('/account/login/', {'username': 'testuser', 'password': 'wrong'})
+        self.client.post('/account/login/', {'username': 'testuser', 'password': 'testpassword'})
+        self.client.logout()
+        self.attempt()
+        self.assertEqual(self.attempt(password='testpassword'), self.user)
+
+    @override_settings(AUTH_HASH_WAIT_TIMEOUT=0)
+    def test_attempt_is_rejected_when_no_hash_slot_is_free(self):
+        """Test that the concurrent hash cap rejects attempts once saturated."""
+        slots = throttling._get_hash_slots()
+        acquired = 0
+        while slots.acquire(blocking=False):
+            acquired += 1
+        try:
+            self.assertIsNone(self.attempt(password='testpassword'))
+        finally:
+            for _ in range(acquired):
+                slots.release()
+        self.assertEqual(login_stats(), {'rejected': 1, 'hashed': 0})
+        # Server load is not held against the account or the IP
+        key, _ = throttling._limits(None, 'testuser')[0]
+        self.assertEqual(throttling._recent_failures(key, throttling.time.time()), 0)
+
+    @override_settings(AUTH_THROTTLE_MAX_FAILURES_PER_ACCOUNT=100)
+    def test_concurrent_failures_are_all_counted(self):
+        """Test that failures recorded at the same time are not lost."""
+        request = RequestFactory().post('/account/login/', REMOTE_ADDR='10.0.0.9')
+        threads = [
+            threading.Thread(target=lambda: [throttling.record_failure(request, 'testuser') for _ in range(10)])
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        now = throttling.time.time()
+        for key, _ in throttling._limits(request, 'testuser'):
+            self.assertEqual(throttling._recent_failures(key, now), 80)
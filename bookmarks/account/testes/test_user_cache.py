@@ -0,0 +1,82 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.cached_db import SessionStore
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from account.authentication import CachedModelBackend, EmailAuthBackend
+from account.models import Profile
+
+
+class UserCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='testuser@example.com',
+            password='testpassword'
+        )
+        self.profile = Profile.objects.create(user=self.user)
+        self.backend = EmailAuthBackend()
+
+    def test_get_user_is_served_from_cache(self):
+        """The second lookup loads the user and its profile without a query."""
+        self.backend.get_user(self.user.id)
+        with self.assertNumQueries(0):
+            user = self.backend.get_user(self.user.id)
+            self.assertEqual(user.profile, self.profile)
+
+    def test_saving_user_evicts_cache(self):
+        """Saving the user evicts the cached copy."""
+        self.backend.get_user(self.user.id)
+        self.user.first_name = 'Updated'
+        self.user.save()
+        self.assertEqual(self.backend.get_user(self.user.id).first_name, 'Updated')
+
+    def test_saving_profile_evicts_cache(self):
+        """Saving the profile evicts the cached user."""
+        self.backend.get_user(self.user.id)
+        self.profile.photo = 'user/photo.jpg'
+        self.profile.save()
+        self.assertEqual(self.backend.get_user(self.user.id).profile.photo, 'user/photo.jpg')
+
+    def test_model_backend_rejects_inactive_cached_user(self):
+        """The cached model backend still refuses inactive users."""
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(CachedModelBackend().get_user(self.user.id))
+
+    def test_steady_state_request_needs_no_auth_queries(self):
+        """Once cached, the session and user are not read from the database."""
+        self.client.login(username='testuser', password='testpassword')
+        self.client.get(reverse('edit'))
+        with self.assertNumQueries(0):
+            self.client.get(reverse('edit'))
+
+
+class SessionBackendMigrationTests(TestCase):
+    def test_sessions_keep_their_login(self):
+        """Sessions logged in through ModelBackend stay logged in once the path is rewritten."""
+        migration = import_module('account.migrations.0006_session_auth_backend')
+        user = User.objects.create_user(username='testuser', password='testpassword')
+        Profile.objects.create(user=user)
+        session = SessionStore()
+        session.update({
+            SESSION_KEY: str(user.pk),
+            BACKEND_SESSION_KEY: migration.OLD_BACKEND,
+            HASH_SESSION_KEY: user.get_session_auth_hash()
+        })
+        session.save()
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+        self.assertEqual(self.client.get(reverse('dashboard')).status_code, 302)
+
+        migration.forwards(apps, None)
+        self.assertEqual(self.client.get(reverse('dashboard')).status_code, 200)
+        self.assertEqual(
+            SessionStore(session.session_key).load()[BACKEND_SESSION_KEY], migration.NEW_BACKEND
+        )
@@ -0,0 +1,66 @@
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from account.models import UserStats
+from images.models import Image
+
+
+class UserStatsTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='testpassword')
+        self.fan = User.objects.create_user(username='fan', password='testpassword')
+        self.image = Image.objects.create(
+            user=self.owner,
+            title='Red square',
+            url='http://example.com/red.png'
+        )
+
+    def stats(self, user):
+        return UserStats.objects.get(user=user)
+
+    def like(self, action):
+        self.client.login(username='fan', password='testpassword')
+        return self.client.post(reverse('images:like'), {'id': self.image.id, 'action': action})
+
+    def test_image_creation_is_counted(self):
+        self.assertEqual(self.stats(self.owner).images_created, 1)
+        self.assertEqual(self.stats(self.fan).images_created, 0)
+
+    def test_like_and_unlike_update_both_users(self):
+        self.like('like')
+        self.like('like')  # Liking twice counts once
+        self.assertEqual(self.stats(self.fan).likes_given, 1)
+        self.assertEqual(self.stats(self.owner).likes_received, 1)
+        self.like('unlike')
+        self.assertEqual(self.stats(self.fan).likes_given, 0)
+        self.assertEqual(self.stats(self.owner).likes_received, 0)
+
+    def test_image_deletion_is_counted(self):
+        self.like('like')
+        self.image.delete()
+        self.assertEqual(self.stats(self.owner).images_created, 0)
+        self.assertEqual(self.stats(self.owner).likes_received, 0)
+        self.assertEqual(self.stats(self.fan).likes_given, 0)
+
+    def test_liker_deletion_is_counted(self):
+        self.like('like')
+        self.fan.delete()
+        self.assertEqual(self.stats(self.owner).likes_received, 0)
+
+    def test_missing_row_is_rebuilt(self):
+        self.image.user_like.add(self.fan)  # Bypasses the image_like view
+        UserStats.objects.all().delete()
+        call_command('rebuild_user_stats', verbosity=0)
+        self.assertEqual(self.stats(self.owner).images_created, 1)
+        self.assertEqual(self.stats(self.owner).likes_received, 1)
+        self.assertEqual(self.stats(self.fan).likes_given, 1)
+
+    def test_dashboard_reads_stats_row(self):
+        self.client.login(username='owner', password='testpassword')
+        self.client.get(reverse('dashboard'))
+        # The stats row and one range scan of the activity feed
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('dashboard'))
+        self.assertContains(response, 'You have bookmarked 1 image,')
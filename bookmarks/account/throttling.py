@@ -0,0 +1,162 @@
+"""
+Login throttling and password-hash budgeting.
+
+Failed logins are counted per client IP and per account over a sliding
+window. The window is split into BUCKETS time buckets, each an atomic cache
+counter (cache.add + cache.incr), so concurrent failures are never lost; the
+count is the sum of the window's buckets. Once a limit is reached, further
+attempts are rejected by ThrottleBackend, listed first in
+AUTHENTICATION_BACKENDS, before any backend hashes the password. Password
+checks themselves are capped per process by a semaphore, so a burst of
+attempts cannot pin every CPU core.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.http import HttpRequest
+
+IP_KEY = 'account:login-failures:ip:{}'
+ACCOUNT_KEY = 'account:login-failures:account:{}'
+# Buckets per window: failures expire with a granularity of window / BUCKETS
+BUCKETS = 15
+
+_stats: Counter = Counter()
+_stats_lock = threading.Lock()
+_hash_slots: Optional[threading.BoundedSemaphore] = None
+_hash_slots_lock = threading.Lock()
+
+
+def _record(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def login_stats() -> dict[str, int]:
+    """
+    Return the number of rejected attempts and of password hashes computed
+    by the current process.
+    """
+    with _stats_lock:
+        return {'rejected': _stats['rejected'], 'hashed': _stats['hashed']}
+
+
+def reset_login_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def _limits(request: Optional[HttpRequest], username: str) -> list[tuple[str, int]]:
+    account = hashlib.sha256(username.strip().casefold().encode()).hexdigest()
+    limits = [(ACCOUNT_KEY.format(account), settings.AUTH_THROTTLE_MAX_FAILURES_PER_ACCOUNT)]
+    ip = request.META.get('REMOTE_ADDR') if request else None
+    if ip:
+        limits.append((IP_KEY.format(ip), settings.AUTH_THROTTLE_MAX_FAILURES_PER_IP))
+    return limits
+
+
+def _bucket_length() -> int:
+    return max(1, math.ceil(settings.AUTH_THROTTLE_WINDOW / BUCKETS))
+
+
+def _bucket_keys(key: str, now: float) -> list[str]:
+    """
+    Return the keys of the buckets covering the window, the current one last.
+    """
+    current = int(now // _bucket_length())
+    return [f'{key}:{bucket}' for bucket in range(current - BUCKETS + 1, current + 1)]
+
+
+def _recent_failures(key: str, now: float) -> int:
+    return sum(cache.get_many(_bucket_keys(key, now)).values())
+
+
+def is_throttled(request: Optional[HttpRequest], username: str) -> bool:
+    """
+    Return True if the IP or the account reached its failure limit in the window.
+    """
+    now = time.time()
+    return any(
+        _recent_failures(key, now) >= limit
+        for key, limit in _limits(request, username)
+    )
+
+
+def record_failure(request: Optional[HttpRequest], username: str) -> None:
+    now = time.time()
+    # A bucket outlives the window it can be part of
+    timeout = settings.AUTH_THROTTLE_WINDOW + _bucket_length()
+    for key, _ in _limits(request, username):
+        bucket = _bucket_keys(key, now)[-1]
+        cache.add(bucket, 0, timeout)
+        try:
+            cache.incr(bucket)
+        except ValueError:
+            # The bucket expired between add() and incr()
+            cache.add(bucket, 1, timeout)
+
+
+def clear_account_failures(username: str) -> None:
+    key, _ = _limits(None, username)[0]
+    cache.delete_many(_bucket_keys(key, time.time()))
+
+
+def _get_hash_slots() -> threading.BoundedSemaphore:
+    global _hash_slots
+    with _hash_slots_lock:
+        if _hash_slots is None:
+            _hash_slots = threading.BoundedSemaphore(settings.AUTH_MAX_CONCURRENT_HASHES)
+    return _hash_slots
+
+
+@contextmanager
+def password_hash_slot(request: Optional[HttpRequest] = None) -> Iterator[None]:
+    """
+    Hold one of the AUTH_MAX_CONCURRENT_HASHES slots while checking a password.
+
+    Raise PermissionDenied if no slot frees up within AUTH_HASH_WAIT_TIMEOUT.
+    The password was not checked, so the attempt is not counted as a failure.
+    """
+    slots = _get_hash_slots()
+    if not slots.acquire(timeout=settings.AUTH_HASH_WAIT_TIMEOUT):
+        _record('rejected')
+        if request is not None:
+            request.login_throttled = True
+        raise PermissionDenied('Too many concurrent login attempts.')
+    try:
+        _record('hashed')
+        yield
+    finally:
+        slots.release()
+
+
+class ThrottleBackend:
+    """
+    Reject over-limit login attempts before any password is hashed.
+
+    Must come first in AUTHENTICATION_BACKENDS: raising PermissionDenied stops
+    django.contrib.auth.authenticate() from trying the following backends.
+    It never logs anyone in, so it has no get_user(): Client.force_login()
+    picks the first backend that has one.
+    """
+    def authenticate(
+        self, request: Optional[HttpRequest], username: Optional[str] = None, password: Optional[str] = None
+    ) -> Optional[User]:
+        if username is None:
+            return None
+        if is_throttled(request, username):
+            _record('rejected')
+            if request is not None:
+                # Rejected attempts do not extend the lockout
+                request.login_throttled = True
+            raise PermissionDenied('Too many failed login attempts.')
+        return None
@@ -1,10 +1,23 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import authenticate, get_user_model, login
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponse, HttpRequest
-from django.shortcuts import render
+from django.http import HttpResponse, HttpRequest, JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.template.defaultfilters import filesizeformat
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.views.decorators.http import require_POST
+
+from actions.feed import create_action, get_feed
+from images.models import Image
+
+from .decorators import async_login_required
 from .form import LoginForm, UserRegistrationForm, UserEditForm, ProfileEditForm
+from .graph import follow, is_following, unfollow
 from .models import Profile
+from .photos import PhotoUploadHandler
+from .stats import get_stats
 
 User = get_user_model()
 
@@ -39,7 +52,9 @@ def dashboard(request: HttpRequest) -> HttpResponse:
         request,
         'account/dashboard.html',
         {
-            'section': 'dashboard'
+            'section': 'dashboard',
+            'stats': get_stats(request.user),
+            'actions': get_feed(request.user)
         }
     )
 
@@ -69,8 +84,17 @@ def register(request: HttpRequest) -> HttpResponse:
     )
 
 
+@csrf_exempt
 @login_required
 def edit(request: HttpRequest) -> HttpResponse:
+    # The upload handler must be installed before the body is parsed, which
+    # the CSRF middleware would do: CSRF is checked by _edit() instead.
+    request.upload_handlers.insert(0, PhotoUploadHandler(request))
+    return _edit(request)
+
+
+@csrf_protect
+def _edit(request: HttpRequest) -> HttpResponse:
     if request.method == 'POST':
         user_form = UserEditForm(
             instance=request.user,
@@ -81,9 +105,13 @@ def edit(request: HttpRequest) -> HttpResponse:
             data=request.POST,
             files=request.FILES
         )
+        if getattr(request, 'photo_too_large', False):
+            max_size = filesizeformat(settings.ACCOUNT_PHOTO_MAX_UPLOAD_BYTES)
+            profile_form.add_error('photo', f'The photo must not be larger than {max_size}.')
         if user_form.is_valid() and profile_form.is_valid():
             user_form.save()
             profile_form.save()
+            create_action(request.user, 'updated their profile')
             messages.success(
                 request,
                 'Profile updated successfully'
@@ -100,4 +128,73 @@ def edit(request: HttpRequest) -> HttpResponse:
             'user_form': user_form,
             'profile_form': profile_form
         }
-    )
\ No newline at end of file
+    )
+
+@login_required
+def user_list(request: HttpRequest) -> HttpResponse:
+    users = User.objects.filter(is_active=True).select_related('profile', 'stats').order_by('username')
+    return render(
+        request,
+        'account/user/list.html',
+        {
+            'section': 'people',
+            'users': users
+        }
+    )
+
+
+@login_required
+def user_detail(request: HttpRequest, username: str) -> HttpResponse:
+    user = get_object_or_404(
+        User.objects.select_related('profile'),
+        username=username,
+        is_active=True
+    )
+    images = Image.objects.filter(
+        user=user,
+        status=Image.Status.READY
+    ).select_related('user', 'user__profile', 'blob').prefetch_related('blob__renditions')
+    return render(
+        request,
+        'account/user/detail.html',
+        {
+            'section': 'people',
+            'user': user,
+            'stats': get_stats(user),
+            'is_following': is_following(request.user.id, user.id),
+            'images': images[:settings.IMAGES_PER_PAGE]
+        }
+    )
+
+
+@async_login_required
+@require_POST
+async def user_follow(request: HttpRequest) -> HttpResponse:
+    """
+    Follow or unfollow a user (AJAX), answering with the new follower count.
+    """
+    user_id = request.POST.get('id')
+    action = request.POST.get('action')
+    if user_id and action in ('follow', 'unfollow'):
+        try:
+            total_followers = await sync_to_async(_toggle_follow)(int(user_id), request.user, action)
+            return JsonResponse({
+                'status': 'ok',
+                'following': action == 'follow',
+                'total_followers': total_followers,
+            })
+        except (User.DoesNotExist, ValueError):
+            pass
+    return JsonResponse({'status': 'error'})
+
+
+def _toggle_follow(user_id: int, user_from, action: str) -> int:
+    user = User.objects.get(pk=user_id, is_active=True)
+    if user.pk == user_from.pk:
+        raise ValueError('Users cannot follow themselves.')
+    if action == 'follow':
+        if follow(user_from.pk, user.pk):
+            create_action(user_from, 'is following', user)
+    else:
+        unfollow(user_from.pk, user.pk)
+    return get_stats(user).followers
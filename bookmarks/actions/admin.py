@@ -0,0 +1,16 @@
+from django.contrib import admin
+from .models import Action, FeedEntry
+
+
+@admin.register(Action)
+class ActionAdmin(admin.ModelAdmin):
+    list_display = ['user', 'verb', 'target', 'created']
+    list_filter = ['created']
+    search_fields = ['verb']
+    raw_id_fields = ['user']
+
+
+@admin.register(FeedEntry)
+class FeedEntryAdmin(admin.ModelAdmin):
+    list_display = ['owner', 'action', 'created']
+    raw_id_fields = ['owner', 'action']
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ActionsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'actions'
+
+    def ready(self):
+        # import signal handlers
+        import actions.signals  # noqa: F401
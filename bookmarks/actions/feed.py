@@ -0,0 +1,132 @@
+"""
+Activity stream: recording actions and fanning them out to user timelines.
+
+create_action() stores the action and hands the fan-out to the background
+pool once the transaction commits. The fan-out writes one FeedEntry per
+recipient (the actor, their followers, ...), so get_feed() only reads the
+newest rows of one owner through the (owner, -created) index, with no join
+across follows, images or likes. Timelines are trimmed back to
+ACTIONS_FEED_LENGTH entries once they exceed it by ACTIONS_FEED_TRIM_SLACK:
+one grouped count finds them, instead of two queries per recipient.
+"""
+
+import datetime
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.contenttypes.prefetch import GenericPrefetch
+from django.db import models
+from django.db.models import Count
+from django.utils import timezone
+
+from account.graph import get_follower_ids
+from bookmarks.tasks import run_in_background
+from images.models import Image
+
+from .models import Action, FeedEntry
+
+
+def create_action(user: User, verb: str, target: Optional[models.Model] = None) -> Optional[Action]:
+    """
+    Record an action and schedule its fan-out.
+
+    The same action repeated within ACTIONS_DEDUPE_WINDOW seconds (a like
+    toggled back and forth, a profile saved twice) is only recorded once.
+    Return the new action, or None if it was a duplicate.
+    """
+    since = timezone.now() - datetime.timedelta(seconds=settings.ACTIONS_DEDUPE_WINDOW)
+    similar = Action.objects.filter(user_id=user.id, verb=verb, created__gte=since)
+    if target is not None:
+        target_ct = ContentType.objects.get_for_model(target)
+        similar = similar.filter(target_ct=target_ct, target_id=target.pk)
+    else:
+        target_ct = None
+        similar = similar.filter(target_ct__isnull=True)
+    if similar.exists():
+        return None
+    action = Action.objects.create(user=user, verb=verb, target_ct=target_ct, target_id=getattr(target, 'pk', None))
+    run_in_background(fan_out, action.pk)
+    return action
+
+
+def feed_recipients(action: Action) -> set[int]:
+    """
+    Return the ids of the users whose timeline shows the action: the actor,
+    their followers (from the cached adjacency set), the owner of a liked or
+    bookmarked image, and a newly followed user.
+    """
+    recipients = {action.user_id, *get_follower_ids(action.user_id)}
+    if action.target_ct_id == ContentType.objects.get_for_model(User).id:
+        recipients.add(action.target_id)
+    elif action.target_ct_id == ContentType.objects.get_for_model(Image).id:
+        owner_id = Image.objects.filter(pk=action.target_id).values_list('user_id', flat=True).first()
+        if owner_id is not None:
+            recipients.add(owner_id)
+    return recipients
+
+
+def fan_out(action_id: int) -> None:
+    """
+    Write the action into every recipient's timeline and trim the timelines.
+    """
+    action = Action.objects.filter(pk=action_id).first()
+    if action is None:
+        return
+    recipients = feed_recipients(action)
+    FeedEntry.objects.bulk_create(
+        [FeedEntry(owner_id=owner_id, action=action, created=action.created) for owner_id in recipients],
+        batch_size=1000,
+        ignore_conflicts=True
+    )
+    for owner_id in overfull_feeds(recipients):
+        trim_feed(owner_id)
+
+
+def overfull_feeds(owner_ids: set[int]) -> list[int]:
+    """
+    Return the owners whose timeline exceeds ACTIONS_FEED_LENGTH by more than
+    ACTIONS_FEED_TRIM_SLACK entries.
+    """
+    limit = settings.ACTIONS_FEED_LENGTH + settings.ACTIONS_FEED_TRIM_SLACK
+    owner_ids = list(owner_ids)
+    overfull = []
+    for start in range(0, len(owner_ids), 1000):
+        overfull += FeedEntry.objects.filter(
+            owner_id__in=owner_ids[start:start + 1000]
+        ).order_by().values('owner_id').annotate(total=Count('*')).filter(
+            total__gt=limit
+        ).values_list('owner_id', flat=True)
+    return overfull
+
+
+def trim_feed(owner_id: int) -> None:
+    """
+    Delete the entries beyond the newest ACTIONS_FEED_LENGTH of a timeline.
+    """
+    newest = FeedEntry.objects.filter(owner_id=owner_id).order_by('-created', '-id')
+    # Reads at most ACTIONS_FEED_LENGTH + 1 index entries before finding the cutoff
+    cutoff = list(newest.values_list('created', 'id')[settings.ACTIONS_FEED_LENGTH:settings.ACTIONS_FEED_LENGTH + 1])
+    if not cutoff:
+        return
+    created, pk = cutoff[0]
+    FeedEntry.objects.filter(owner_id=owner_id).filter(
+        models.Q(created__lt=created) | models.Q(created=created, id__lte=pk)
+    ).delete()
+
+
+def get_feed(user: User, limit: Optional[int] = None) -> list[Action]:
+    """
+    Return the newest actions of the user's timeline.
+    """
+    limit = limit or settings.ACTIONS_FEED_PAGE
+    entries = FeedEntry.objects.filter(owner_id=user.id).select_related(
+        'action__user__profile'
+    ).prefetch_related(
+        GenericPrefetch('action__target', [
+            # Images are shown with their thumbnail
+            Image.objects.select_related('blob').prefetch_related('blob__renditions'),
+        ])
+    ).order_by('-created', '-id')[:limit]
+    return [entry.action for entry in entries]
@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+
+class Action(models.Model):
+    """
+    Something a user did: "bookmarked image", "likes", "updated their profile"...
+    optionally about a target object of any model.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='actions',
+        on_delete=models.CASCADE
+    )
+    verb = models.CharField(max_length=255)
+    created = models.DateTimeField(auto_now_add=True)
+    target_ct = models.ForeignKey(
+        ContentType,
+        blank=True,
+        null=True,
+        related_name='target_obj',
+        on_delete=models.CASCADE
+    )
+    target_id = models.PositiveIntegerField(null=True, blank=True)
+    target = GenericForeignKey('target_ct', 'target_id')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created']),
+            models.Index(fields=['target_ct', 'target_id']),
+        ]
+        ordering = ['-created']
+
+    def __str__(self):
+        return f'{self.user} {self.verb}'
+
+
+class FeedEntry(models.Model):
+    """
+    One action in one user's timeline, written when the action happens
+    (fan-out on write) so reading a feed is a single range scan on
+    (owner, -created). Each timeline is capped to ACTIONS_FEED_LENGTH entries.
+    """
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='feed',
+        on_delete=models.CASCADE
+    )
+    action = models.ForeignKey(
+        Action,
+        related_name='feed_entries',
+        on_delete=models.CASCADE
+    )
+    # Copied from the action so the timeline is ordered without a join
+    created = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['owner', '-created', '-id']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'action'], name='unique_feed_entry'),
+        ]
+        ordering = ['-created', '-id']
+        verbose_name_plural = 'feed entries'
+
+    def __str__(self):
+        return f'{self.action} (feed of {self.owner})'
@@ -0,0 +1,16 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from images.models import Image
+
+from .models import Action
+
+
+@receiver(post_delete, sender=Image)
+def image_deleted(sender, instance: Image, **kwargs) -> None:
+    # Actions about a deleted image, and their feed entries, go with it
+    Action.objects.filter(
+        target_ct=ContentType.objects.get_for_model(Image),
+        target_id=instance.pk
+    ).delete()
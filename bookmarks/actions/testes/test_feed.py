@@ -0,0 +1,98 @@
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from account.graph import get_follower_ids
+from account.models import Contact, Profile
+from actions.feed import create_action, fan_out, get_feed
+from actions.models import Action, FeedEntry
+from images.models import Image
+
+
+@override_settings(BACKGROUND_WORKERS=0)
+class ActivityFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username='owner', password='testpassword', first_name='Olive')
+        self.fan = User.objects.create_user(username='fan', password='testpassword', first_name='Fabio')
+        Profile.objects.create(user=self.owner)
+        Profile.objects.create(user=self.fan)
+        self.image = Image.objects.create(user=self.owner, title='Sunset', url='http://example.com/sunset.jpg')
+
+    def feed_verbs(self, user: User) -> list[str]:
+        return [f'{action.user.username} {action.verb}' for action in get_feed(user)]
+
+    @patch('images.views.enqueue_image_ingest')
+    def test_bookmarking_is_fanned_out_after_commit(self, enqueue):
+        self.client.login(username='owner', password='testpassword')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('images:image_create'), {
+                'title': 'Beach',
+                'url': 'http://example.com/beach.jpg',
+                'description': ''
+            })
+        action = Action.objects.get()
+        self.assertEqual(action.target, Image.objects.get(title='Beach'))
+        self.assertEqual(self.feed_verbs(self.owner), ['owner bookmarked image'])
+
+    def test_like_reaches_the_image_owner_once(self):
+        self.client.login(username='fan', password='testpassword')
+        with self.captureOnCommitCallbacks(execute=True):
+            for action in ('like', 'unlike', 'like'):
+                self.client.post(reverse('images:like'), {'id': self.image.id, 'action': action})
+        # Liking again within the dedupe window records nothing new
+        self.assertEqual(Action.objects.count(), 1)
+        self.assertEqual(self.feed_verbs(self.fan), ['fan likes'])
+        self.assertEqual(self.feed_verbs(self.owner), ['fan likes'])
+
+    def test_profile_update_is_recorded(self):
+        self.client.login(username='fan', password='testpassword')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('edit'), {'username': 'fan', 'first_name': 'Fab', 'email': 'fan@example.com'})
+        self.assertEqual(self.feed_verbs(self.fan), ['fan updated their profile'])
+
+    @override_settings(ACTIONS_FEED_LENGTH=3, ACTIONS_FEED_TRIM_SLACK=2, ACTIONS_DEDUPE_WINDOW=0)
+    def test_timelines_are_capped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(5):
+                create_action(self.fan, f'did thing {i}')
+        # Within the slack, the timeline is left alone
+        self.assertEqual(FeedEntry.objects.filter(owner=self.fan).count(), 5)
+        with self.captureOnCommitCallbacks(execute=True):
+            create_action(self.fan, 'did thing 5')
+        self.assertEqual(FeedEntry.objects.filter(owner=self.fan).count(), 3)
+        self.assertEqual(self.feed_verbs(self.fan), ['fan did thing 5', 'fan did thing 4', 'fan did thing 3'])
+
+    def test_fan_out_queries_do_not_grow_with_followers(self):
+        for i in range(20):
+            follower = User.objects.create_user(username=f'follower{i}')
+            Contact.objects.create(user_from=follower, user_to=self.fan)
+        action = Action.objects.create(user=self.fan, verb='did a thing')
+        get_follower_ids(self.fan.id)  # Cached adjacency set
+        # Action, bulk insert and the grouped timeline count
+        with self.assertNumQueries(3):
+            fan_out(action.pk)
+        self.assertEqual(FeedEntry.objects.filter(action=action).count(), 21)
+
+    def test_feed_is_read_with_a_fixed_number_of_queries(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_action(self.owner, 'bookmarked image', self.image)
+            create_action(self.fan, 'likes', self.image)
+            create_action(self.owner, 'updated their profile')
+        self.client.login(username='owner', password='testpassword')
+        self.client.get(reverse('dashboard'))
+        # Stats row, feed range scan, and one query for the target images
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('dashboard'))
+        self.assertContains(response, '>Fabio</a>\n      likes')
+        self.assertEqual(len(response.context['actions']), 3)
+
+    def test_deleting_an_image_removes_its_actions(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_action(self.fan, 'likes', self.image)
+        self.image.delete()
+        self.assertFalse(Action.objects.exists())
+        self.assertFalse(FeedEntry.objects.exists())
@@ -0,0 +1,148 @@
+"""
+Shared outbound HTTP session for the bookmarks project.
+
+Every process keeps a single ``requests.Session`` whose adapters pool
+keep-alive connections per host, so repeated fetches from the same CDN skip
+DNS, TCP and TLS setup. Idempotent requests are retried with exponential
+backoff. Use ``get_session()`` for every outbound fetch instead of the
+module-level ``requests.get``.
+
+Async code (ASGI views) uses ``get_async_client()`` instead: one
+``httpx.AsyncClient`` per event loop, with the same pool sizes and User-Agent.
+It only retries failed connections, immediately: error statuses (429, 5xx)
+are not retried and there is no backoff. Its connections are not counted by
+``pool_stats()``, which therefore covers WSGI and command-line fetches only.
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from collections import Counter
+from typing import Optional
+
+import httpx
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+
+_stats: Counter = Counter()
+_stats_lock = threading.Lock()
+
+
+def _record(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+class _CountingPoolMixin:
+    """
+    Count connection checkouts served by an open keep-alive connection (hits)
+    versus checkouts that need a new connection (misses).
+    """
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        _record('hits' if conn.is_connected else 'misses')
+        return conn
+
+
+class CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter whose per-host connection pools report hits and misses.
+    """
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool,
+        }
+
+
+def _build_session() -> requests.Session:
+    retries = Retry(
+        total=settings.HTTP_MAX_RETRIES,
+        backoff_factor=settings.HTTP_BACKOFF_FACTOR,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        raise_on_status=False,
+    )
+    adapter = PooledHTTPAdapter(
+        pool_connections=settings.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+        max_retries=retries,
+    )
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = settings.HTTP_USER_AGENT
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Return the session of the current process, creating it on first use.
+    """
+    global _session, _session_pid
+    with _lock:
+        # Sockets must not be shared with a forked child process
+        if _session is None or _session_pid != os.getpid():
+            _session = _build_session()
+            _session_pid = os.getpid()
+        return _session
+
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Return the async client of the running event loop, creating it on first use.
+
+    Connections belong to the loop that opened them, so each loop gets its own
+    client; it is dropped together with its loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            headers={'User-Agent': settings.HTTP_USER_AGENT},
+            # Concurrency is bounded by the callers; only idle connections are capped
+            limits=httpx.Limits(
+                max_connections=None,
+                max_keepalive_connections=settings.HTTP_POOL_CONNECTIONS * settings.HTTP_POOL_MAXSIZE,
+            ),
+            # Only connection failures are retried, without backoff
+            transport=httpx.AsyncHTTPTransport(retries=settings.HTTP_MAX_RETRIES),
+            follow_redirects=True,
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def pool_stats() -> dict[str, int]:
+    """
+    Return the connection pool hit and miss counters of the current process.
+    """
+    with _stats_lock:
+        return {'hits': _stats['hits'], 'misses': _stats['misses']}
+
+
+def reset_pool_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 
 from pathlib import Path
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import reverse_lazy
 #from threading import local
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,6 +44,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
 
     'images.apps.ImagesConfig',
+    'actions.apps.ActionsConfig',
 
     'social_django',
     'django_extensions',
@@ -50,6 +53,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -86,6 +90,38 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Concurrent writers (ASGI requests, background workers) wait for the
+        # write lock this many seconds before failing with "database is locked"
+        'OPTIONS': {'timeout': 20},
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# CACHE_BACKEND is one of "locmem", "file" or "redis".
+#
+# Detail page versions, cached users, login failure counters and the follow
+# graph are invalidated through the cache, so every worker process must share
+# it. locmem is per process: it is only accepted with DEBUG on (runserver,
+# tests). Production must set CACHE_BACKEND=redis (and CACHE_LOCATION); the
+# file cache is shared by the workers of one host but its incr() is not
+# atomic, so concurrent login failures may be undercounted.
+
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', ''),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / '.cache')),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379'),
+}
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+if CACHE_BACKEND == 'locmem' and not DEBUG:
+    raise ImproperlyConfigured('CACHE_BACKEND=locmem is per process; set CACHE_BACKEND=redis in production.')
+_cache_backend, _cache_location = CACHE_BACKENDS[CACHE_BACKEND]
+
+CACHES = {
+    'default': {
+        'BACKEND': _cache_backend,
+        'LOCATION': config('CACHE_LOCATION', default=_cache_location),
     }
 }
 
@@ -125,6 +161,22 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.0/howto/static-files/
 
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Content-hashed, precompressed static files served by WhiteNoise with
+# far-future caching (see bookmarks/storage.py); run collectstatic on deploy.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'bookmarks.storage.StaticStorage',
+    },
+}
+
+# Seconds browsers may cache the bookmarklet loader, which points to the
+# current hashed bookmarklet files (see images.views.bookmarklet_loader).
+IMAGES_BOOKMARKLET_LOADER_MAX_AGE = 5 * 60
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
@@ -132,6 +184,10 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_REDIRECT_URL = 'dashboard'
+
+ABSOLUTE_URL_OVERRIDES = {
+    'auth.user': lambda u: reverse_lazy('user_detail', args=[u.username])
+}
 LOGIN_URL = 'login'
 LOGOUT_URL = 'logout'
 
@@ -140,12 +196,45 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Profile photos (see account/photos.py)
+# Larger uploads are dropped while the request is parsed. Accepted photos are
+# re-encoded without metadata, at most ACCOUNT_PHOTO_SIZE pixels on a side,
+# and cropped to square avatars (Profile field name -> side in pixels).
+ACCOUNT_PHOTO_MAX_UPLOAD_BYTES = 5 * 1024 * 1024
+ACCOUNT_PHOTO_MAX_PIXELS = 40_000_000
+ACCOUNT_PHOTO_SIZE = 1024
+ACCOUNT_AVATAR_SIZES = {'avatar': 240, 'avatar_small': 64}
+ACCOUNT_PHOTO_QUALITY = 85
+
 AUTHENTICATION_BACKENDS = [
-    'django.contrib.auth.backends.ModelBackend',
+    'account.throttling.ThrottleBackend',
+    'account.authentication.CachedModelBackend',
     'account.authentication.EmailAuthBackend',
     'social_core.backends.google.GoogleOAuth2',
 ]
 
+# Seconds a user and its profile are cached for the session lookup done on
+# every request (0 disables the cache). Saving a User or Profile evicts it.
+AUTH_USER_CACHE_TIMEOUT = 60
+
+# Seconds the follow graph adjacency sets are cached (see account/graph.py).
+# Following or unfollowing evicts the sets of both users, but only in the shared
+# cache: kept short so that a per-process cache is stale for a minute at most.
+ACCOUNT_GRAPH_CACHE_TIMEOUT = 60
+
+# Login throttling (see account/throttling.py)
+# Failed logins are counted per IP and per account over a sliding window.
+AUTH_THROTTLE_WINDOW = 15 * 60
+AUTH_THROTTLE_MAX_FAILURES_PER_IP = 20
+AUTH_THROTTLE_MAX_FAILURES_PER_ACCOUNT = 5
+# Password hashes computed at the same time by one process, and seconds an
+# attempt may wait for a free slot before being rejected.
+AUTH_MAX_CONCURRENT_HASHES = config('AUTH_MAX_CONCURRENT_HASHES', default=2, cast=int)
+AUTH_HASH_WAIT_TIMEOUT = 2
+
+# Sessions are read from the cache and written through to the database
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
 SOCIAL_AUTH_GOOGLE_OAUTH2_KEY = config('GOOGLE_OAUTH_KEY')
 SOCIAL_AUTH_GOOGLE_OAUTH2_SECRET = config('GOOGLE_OAUTH_SECRET')
 
@@ -160,4 +249,86 @@ SOCIAL_AUTH_PIPELINE = (
     'social_core.pipeline.social_auth.associate_user',
     'social_core.pipeline.social_auth.load_extra_data',
     'social_core.pipeline.user.user_details',
-)
\ No newline at end of file
+)
+
+# Background workers
+# Jobs run in a bounded thread pool inside each process (see bookmarks/tasks.py).
+# Set BACKGROUND_WORKERS to 0 to run them synchronously.
+
+BACKGROUND_WORKERS = config('BACKGROUND_WORKERS', default=4, cast=int)
+BACKGROUND_QUEUE_SIZE = config('BACKGROUND_QUEUE_SIZE', default=100, cast=int)
+
+# Outbound HTTP (see bookmarks/http.py)
+# HTTP_POOL_MAXSIZE keep-alive connections are kept per host, for up to
+# HTTP_POOL_CONNECTIONS hosts per process.
+
+HTTP_POOL_CONNECTIONS = config('HTTP_POOL_CONNECTIONS', default=20, cast=int)
+HTTP_POOL_MAXSIZE = config('HTTP_POOL_MAXSIZE', default=BACKGROUND_WORKERS or 1, cast=int)
+HTTP_MAX_RETRIES = config('HTTP_MAX_RETRIES', default=2, cast=int)
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_USER_AGENT = 'bookmarks/1.0 (+http://mysite.com)'
+
+# Images ingestion
+
+# (connect, read) timeouts in seconds, and a budget for the whole download
+IMAGES_FETCH_TIMEOUT = (3.05, 10)
+IMAGES_FETCH_MAX_DURATION = 60
+IMAGES_FETCH_MAX_BYTES = 10 * 1024 * 1024
+IMAGES_FETCH_CHUNK_SIZE = 64 * 1024
+# Downloads running at once on each event loop when served through ASGI
+IMAGES_ASYNC_MAX_FETCHES = config('IMAGES_ASYNC_MAX_FETCHES', default=100, cast=int)
+# Downloads in progress are lost when a process restarts. Images still
+# pending after this many seconds are re-enqueued by requeue_pending_images,
+# to run after each deploy and from cron. Keep it well above
+# IMAGES_FETCH_MAX_DURATION so running downloads are not started twice.
+IMAGES_PENDING_RETRY_AFTER = 10 * 60
+
+# Number of images per page of the infinite-scroll list
+IMAGES_PER_PAGE = 24
+
+# Maximum number of likers shown on the image detail page
+IMAGES_DETAIL_LIKERS = 20
+# Lifetime of the cached liker fragment and anonymous detail page, in
+# seconds. Entries are also invalidated whenever the image or its likes change.
+IMAGES_DETAIL_CACHE_TIMEOUT = 10 * 60
+# Lifetime of an image's detail cache version (also its ETag), in seconds.
+# Must exceed IMAGES_DETAIL_CACHE_TIMEOUT; an expired version is recreated newer.
+IMAGES_DETAIL_VERSION_TIMEOUT = 24 * 60 * 60
+
+# Trending images (see images/ranking.py)
+# Scores are halved every IMAGES_TRENDING_HALF_LIFE seconds by the
+# decay_trending command, to run from cron every IMAGES_TRENDING_DECAY_INTERVAL.
+IMAGES_TRENDING_HALF_LIFE = 24 * 60 * 60
+IMAGES_TRENDING_DECAY_INTERVAL = 15 * 60
+IMAGES_TRENDING_MIN_SCORE = 0.01
+IMAGES_TRENDING_COUNT = 10
+IMAGES_TRENDING_CACHE_TIMEOUT = 60
+
+# Image view counter (see images/counters.py)
+# Views are counted in memory and written in batched UPDATEs at most every
+# IMAGES_VIEW_FLUSH_INTERVAL seconds, or as soon as views of
+# IMAGES_VIEW_BUFFER_SIZE different images are pending.
+IMAGES_VIEW_FLUSH_INTERVAL = 10
+IMAGES_VIEW_BUFFER_SIZE = 1000
+
+# Resized versions generated at ingest time (see images/renditions.py)
+IMAGES_RENDITION_WIDTHS = [300, 600]
+IMAGES_RENDITION_FORMATS = ['webp', 'jpeg']
+IMAGES_RENDITION_QUALITY = 82
+
+# Near-duplicate detection (see images/duplicates.py)
+# Two images are near-duplicates when their perceptual hashes differ by at
+# most IMAGES_DUPLICATE_DISTANCE bits out of 64. Up to 7 bits, each indexed
+# lookup only reads the 1 + 16 neighbours of every 16-bit hash chunk.
+IMAGES_DUPLICATE_DISTANCE = 6
+IMAGES_DETAIL_DUPLICATES = 6
+
+# Activity stream (see actions/feed.py)
+# Every user timeline keeps its newest ACTIONS_FEED_LENGTH entries; the
+# dashboard shows ACTIONS_FEED_PAGE of them. A timeline is only trimmed once
+# it holds ACTIONS_FEED_TRIM_SLACK more. An action repeated within
+# ACTIONS_DEDUPE_WINDOW seconds is recorded once.
+ACTIONS_FEED_LENGTH = 200
+ACTIONS_FEED_TRIM_SLACK = 50
+ACTIONS_FEED_PAGE = 20
+ACTIONS_DEDUPE_WINDOW = 60
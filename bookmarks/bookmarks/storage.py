@@ -0,0 +1,25 @@
+"""
+Static files storage for the bookmarks project.
+
+collectstatic copies every static file under a content-hashed name
+(css/base.3f2a9c1e.css), writes gzip and brotli variants next to it and
+records the mapping in staticfiles.json. WhiteNoise then serves hashed
+names with a far-future immutable Cache-Control header and picks the
+precompressed variant from Accept-Encoding.
+"""
+
+from django.core.files.storage import FileSystemStorage
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class StaticStorage(CompressedManifestStaticFilesStorage):
+    """
+    Manifest storage that falls back to unhashed URLs while no manifest has
+    been collected (test runs, a fresh checkout), instead of failing on
+    every {% static %} tag. Once collectstatic has run, a file missing from
+    the manifest is still an error.
+    """
+    def url(self, name: str, force: bool = False) -> str:
+        if not self.hashed_files:
+            return FileSystemStorage.url(self, name)
+        return super().url(name, force)
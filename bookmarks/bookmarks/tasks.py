@@ -0,0 +1,80 @@
+"""
+Local background task pool for the bookmarks project.
+
+Slow jobs (remote downloads, image processing, ...) are handed to a bounded
+pool of threads living inside the web process, so no external broker is
+needed. Jobs are submitted once the current transaction commits, so a worker
+never sees a row that does not exist yet.
+
+Set ``BACKGROUND_WORKERS = 0`` to run every job synchronously (tests, shell).
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_slots: Optional[threading.BoundedSemaphore] = None
+
+
+def _get_executor() -> tuple[ThreadPoolExecutor, threading.BoundedSemaphore]:
+    """
+    Create the per-process executor on first use.
+    """
+    global _executor, _slots
+    with _lock:
+        if _executor is None:
+            workers = settings.BACKGROUND_WORKERS
+            _executor = ThreadPoolExecutor(
+                max_workers=workers,
+                thread_name_prefix='bookmarks-worker'
+            )
+            # Running jobs plus queued jobs never exceed this number
+            _slots = threading.BoundedSemaphore(
+                workers + settings.BACKGROUND_QUEUE_SIZE
+            )
+    return _executor, _slots
+
+
+def _call(func: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception('Background task %s failed', func.__name__)
+
+
+def _run_in_worker(func: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+    try:
+        _call(func, args, kwargs)
+    finally:
+        # Worker threads own their database connection
+        connection.close()
+
+
+def _submit(func: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+    if settings.BACKGROUND_WORKERS <= 0:
+        _call(func, args, kwargs)
+        return
+    executor, slots = _get_executor()
+    if not slots.acquire(blocking=False):
+        # The queue is full: apply backpressure by running in the caller
+        logger.warning('Background queue full, running %s inline', func.__name__)
+        _call(func, args, kwargs)
+        return
+    future = executor.submit(_run_in_worker, func, args, kwargs)
+    future.add_done_callback(lambda f: slots.release())
+
+
+def run_in_background(func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+    """
+    Run ``func(*args, **kwargs)`` in the worker pool after the current
+    transaction commits.
+    """
+    transaction.on_commit(lambda: _submit(func, args, kwargs))
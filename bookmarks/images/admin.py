@@ -1,5 +1,19 @@
 from django.contrib import admin  # Module pour l'administration Django
-from .models import Image  # Importation du modèle Image
+from django.db.models import QuerySet  # Typage des requêtes
+from django.http import HttpRequest, StreamingHttpResponse  # Réponse envoyée au fil de l'eau
+
+from .export import FORMATS, export_lines  # Export en streaming
+from .models import Image, ImageBlob  # Importation des modèles
+from .search import filter_images  # Recherche dans l'index plein texte
+
+
+def stream_export(queryset: QuerySet[Image], format: str) -> StreamingHttpResponse:
+    """
+    Envoie l'export des images sélectionnées sans le construire en mémoire.
+    """
+    response = StreamingHttpResponse(export_lines(queryset, format), content_type=FORMATS[format])
+    response['Content-Disposition'] = f'attachment; filename="bookmarks.{format}"'
+    return response
 
 
 # Décorateur pour enregistrer le modèle Image avec une classe personnalisée d'administration
@@ -9,6 +23,37 @@ class ImageAdmin(admin.ModelAdmin):
     Personnalisation de l'interface d'administration pour le modèle Image.
     """
     # Affiche les champs spécifiés dans la liste des objets du modèle
-    list_display: list[str] = ['title', 'slug', 'image', 'created']
-    # Permet la recherche sur certains champs
-    search_fields: list[str] = ['created']
+    list_display: list[str] = ['title', 'slug', 'image', 'status', 'created']
+    # Permet de filtrer les images selon l'état du téléchargement
+    list_filter: list[str] = ['status']
+    # Permet la recherche sur certains champs (via l'index plein texte, voir get_search_results)
+    search_fields: list[str] = ['title', 'description']
+    # Exports en streaming des images sélectionnées et de leurs "likes"
+    actions: list[str] = ['export_jsonl', 'export_csv']
+
+    def get_search_results(self, request: HttpRequest, queryset: QuerySet[Image], search_term: str) -> tuple[QuerySet[Image], bool]:
+        """
+        Cherche dans l'index plein texte au lieu de `LIKE '%...%'` sur toute la table.
+        """
+        if not search_term:
+            return queryset, False
+        return filter_images(queryset, search_term), False
+
+    @admin.action(description='Export selected images and likes as JSONL')
+    def export_jsonl(self, request: HttpRequest, queryset: QuerySet[Image]) -> StreamingHttpResponse:
+        return stream_export(queryset, 'jsonl')
+
+    @admin.action(description='Export selected images and likes as CSV')
+    def export_csv(self, request: HttpRequest, queryset: QuerySet[Image]) -> StreamingHttpResponse:
+        return stream_export(queryset, 'csv')
+
+
+
+@admin.register(ImageBlob)
+class ImageBlobAdmin(admin.ModelAdmin):
+    """
+    Personnalisation de l'interface d'administration pour les fichiers partagés.
+    """
+    list_display: list[str] = ['sha256', 'file', 'size', 'ref_count', 'created']
+    # Les fichiers partagés sont gérés par le comptage de références
+    readonly_fields: list[str] = ['sha256', 'file', 'size', 'ref_count']
@@ -0,0 +1,74 @@
+"""
+Clés de version du cache de la page de détail d'une image.
+
+La version d'une image est l'horodatage (en millisecondes) de sa dernière
+modification. Elle fait partie des clés du fragment des "likes" et de la page
+anonyme : augmenter la version rend les anciennes entrées inaccessibles, sans
+avoir à les supprimer. Elle sert aussi à construire les en-têtes ETag et
+Last-Modified.
+
+La clé de version expire après `IMAGES_DETAIL_VERSION_TIMEOUT` secondes, plus que
+les entrées qu'elle protège : les identifiants demandés au hasard (images
+inexistantes) ne s'accumulent pas dans le cache. Une version recréée est plus
+récente que l'ancienne, les anciennes entrées restent donc inaccessibles.
+"""
+
+import time  # Horodatage des versions
+from datetime import datetime, timezone  # Conversion de la version en date de dernière modification
+from typing import Optional  # Typage des valeurs facultatives
+
+from django.conf import settings  # Durée de vie des clés de version
+from django.core.cache import cache  # Cache configuré par CACHE_BACKEND
+
+
+VERSION_KEY = 'images:detail:version:{id}'
+PAGE_KEY = 'images:detail:page:{id}:{slug}:{version}'
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def get_detail_version(image_id: int) -> int:
+    """
+    Retourne la version courante de la page de détail d'une image.
+    """
+    key = VERSION_KEY.format(id=image_id)
+    version = cache.get(key)
+    if version is None:
+        # Version inconnue (cache vidé) : la page est considérée comme modifiée maintenant
+        cache.add(key, _now_ms(), settings.IMAGES_DETAIL_VERSION_TIMEOUT)
+        version = cache.get(key, _now_ms())
+    return version
+
+
+def bump_detail_version(image_id: int) -> None:
+    """
+    Invalide les entrées de cache de la page de détail d'une image.
+    """
+    key = VERSION_KEY.format(id=image_id)
+    previous = cache.get(key, 0)
+    cache.set(key, max(_now_ms(), previous + 1), settings.IMAGES_DETAIL_VERSION_TIMEOUT)
+
+
+def detail_page_key(image_id: int, slug: str, version: int) -> str:
+    return PAGE_KEY.format(id=image_id, slug=slug, version=version)
+
+
+def detail_etag(request, id: int, slug: str) -> Optional[str]:
+    """
+    ETag de la page de détail, uniquement pour les visiteurs anonymes
+    (la page d'un utilisateur connecté dépend de son état de "like").
+    """
+    if request.user.is_authenticated:
+        return None
+    return f'{id}-{get_detail_version(id)}'
+
+
+def detail_last_modified(request, id: int, slug: str) -> Optional[datetime]:
+    """
+    Date de dernière modification de la page de détail, pour les visiteurs anonymes.
+    """
+    if request.user.is_authenticated:
+        return None
+    return datetime.fromtimestamp(get_detail_version(id) / 1000, tz=timezone.utc)
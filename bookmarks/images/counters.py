@@ -0,0 +1,136 @@
+"""
+Compteur de vues des images, avec regroupement des écritures.
+
+Chaque affichage de la page de détail incrémente un compteur en mémoire du processus
+(`record_view`, sous un verrou, sans accès à la base). Un minuteur vide le tampon
+`IMAGES_VIEW_FLUSH_INTERVAL` secondes après la première vue en attente, même si le
+trafic s'arrête ; le pool de workers le vide aussi dès que `IMAGES_VIEW_BUFFER_SIZE`
+images différentes sont en attente. Chaque écriture fait une seule requête UPDATE
+par valeur d'incrément (`total_views = total_views + n`), quel que soit le nombre de vues.
+
+Avec `BACKGROUND_WORKERS = 0` (tests, shell), aucun minuteur n'est démarré : le
+tampon est vidé par la première vue comptée après l'intervalle.
+
+Les vues en attente sont perdues si le processus est tué brutalement ; elles sont
+écrites à l'arrêt normal du processus (`atexit`).
+"""
+import atexit  # Écriture du tampon à l'arrêt du processus
+import logging  # Journalisation des échecs d'écriture
+import threading  # Verrou du tampon partagé par les threads
+import time  # Date de la dernière écriture
+from collections import Counter, defaultdict  # Tampon des vues et regroupement par incrément
+from typing import Optional  # Base de données des vues en attente
+
+from django.conf import settings  # Accès aux paramètres du projet (ex. IMAGES_VIEW_FLUSH_INTERVAL)
+from django.db import DatabaseError, connection  # Échec d'écriture ; base sur laquelle les vues sont comptées
+from django.db.models import F  # Incrément atomique côté base de données
+
+from bookmarks.tasks import run_in_background  # Pool de workers locaux
+
+from .models import Image  # Importation du modèle Image
+
+logger = logging.getLogger(__name__)
+
+_buffer: Counter = Counter()  # Identifiant de l'image -> vues en attente
+_lock = threading.Lock()  # Protège le tampon et la date de la dernière écriture
+_last_flush = time.monotonic()  # Date de la dernière écriture (ou de sa planification)
+_database: Optional[str] = None  # Base de données sur laquelle les vues en attente ont été comptées
+_timer: Optional[threading.Timer] = None  # Écriture planifiée des vues en attente
+UPDATE_BATCH_SIZE = 500  # Identifiants par requête UPDATE
+
+
+def record_view(image_id: int) -> None:
+    """
+    Compte une vue de l'image, sans accès à la base de données.
+    """
+    global _last_flush, _database
+    now = time.monotonic()
+    with _lock:
+        if not _buffer:
+            _database = connection.settings_dict['NAME']
+        _buffer[image_id] += 1
+        due = (
+            now - _last_flush >= settings.IMAGES_VIEW_FLUSH_INTERVAL
+            or len(_buffer) >= settings.IMAGES_VIEW_BUFFER_SIZE
+        )
+        if due:
+            _last_flush = now  # Une seule écriture planifiée à la fois
+        else:
+            _start_timer()
+    if due:
+        run_in_background(flush_views)
+
+
+def _start_timer() -> None:
+    """
+    Planifie l'écriture du tampon dans `IMAGES_VIEW_FLUSH_INTERVAL` secondes, si aucune
+    ne l'est déjà. À appeler avec le verrou du tampon.
+    """
+    global _timer
+    if _timer is None and settings.BACKGROUND_WORKERS > 0:
+        _timer = threading.Timer(settings.IMAGES_VIEW_FLUSH_INTERVAL, _flush_on_timer)
+        _timer.daemon = True  # N'empêche pas l'arrêt du processus (l'écriture `atexit` prend le relais)
+        _timer.start()
+
+
+def _flush_on_timer() -> None:
+    """
+    Écrit les vues en attente depuis le thread du minuteur.
+    """
+    global _timer, _last_flush
+    with _lock:
+        _timer = None
+        _last_flush = time.monotonic()
+    try:
+        flush_views()
+    finally:
+        connection.close()  # Le thread du minuteur possède sa connexion
+    with _lock:
+        if _buffer:
+            _start_timer()  # Vues arrivées pendant l'écriture, ou écriture en échec à retenter
+
+
+def pending_views() -> dict[int, int]:
+    """
+    Retourne une copie des vues pas encore écrites.
+    """
+    with _lock:
+        return dict(_buffer)
+
+
+def flush_views() -> int:
+    """
+    Écrit les vues en attente en quelques requêtes UPDATE et retourne le nombre de vues écrites.
+    """
+    global _database
+    with _lock:
+        views = Counter(_buffer)
+        database = _database
+        _buffer.clear()
+    if not views:
+        return 0
+    if database != connection.settings_dict['NAME']:
+        # La base a changé depuis (base de test détruite) : les identifiants ne correspondent plus
+        logger.debug('Dropping %d image views counted against another database', sum(views.values()))
+        return 0
+    # Les images vues le même nombre de fois partagent une requête
+    by_increment: defaultdict[int, list[int]] = defaultdict(list)
+    for image_id, count in views.items():
+        by_increment[count].append(image_id)
+    written = Counter()
+    try:
+        for count, image_ids in by_increment.items():
+            for start in range(0, len(image_ids), UPDATE_BATCH_SIZE):
+                batch = image_ids[start:start + UPDATE_BATCH_SIZE]
+                Image.objects.filter(pk__in=batch).update(total_views=F('total_views') + count)
+                written.update({image_id: count for image_id in batch})
+    except DatabaseError:
+        logger.exception('Could not write image views, they will be retried')
+        with _lock:
+            if not _buffer:
+                _database = database
+            _buffer.update(views - written)
+    return sum(written.values())
+
+
+atexit.register(flush_views)
@@ -0,0 +1,137 @@
+"""
+Détection des quasi-doublons par hachage perceptuel (multi-index hashing).
+
+Le hachage de 64 bits est découpé en 4 morceaux de 16 bits, chacun indexé
+(`ImageBlob.phash_0` à `phash_3`). Si deux hachages diffèrent d'au plus `d` bits,
+l'un des morceaux diffère d'au plus `d // 4` bits (principe des tiroirs) : il suffit
+de chercher, pour chaque morceau, les valeurs à cette distance, puis de vérifier
+la distance exacte sur les seuls candidats. Aucune requête ne parcourt la table.
+"""
+from collections import defaultdict  # Index en mémoire : morceau -> fichiers
+from functools import lru_cache  # Voisinages réutilisés d'un morceau à l'autre
+from itertools import combinations  # Positions des bits inversés
+from typing import Iterable, Iterator, Optional  # Typage des collections
+
+from django.conf import settings  # Accès aux paramètres du projet (ex. IMAGES_DUPLICATE_DISTANCE)
+from django.db.models import Q  # Union des recherches par morceau
+
+from .metadata import PHASH_CHUNK_BITS, PHASH_CHUNKS, hamming_distance, phash_chunks  # Découpage du hachage
+from .models import Image, ImageBlob  # Importation des modèles
+
+
+@lru_cache(maxsize=1 << PHASH_CHUNK_BITS)
+def _neighbours(chunk: int, radius: int) -> tuple[int, ...]:
+    """
+    Retourne les valeurs de 16 bits qui diffèrent du morceau d'au plus `radius` bits.
+    """
+    values = [chunk]
+    for flipped in range(1, radius + 1):
+        for positions in combinations(range(PHASH_CHUNK_BITS), flipped):
+            value = chunk
+            for position in positions:
+                value ^= 1 << position
+            values.append(value)
+    return tuple(values)
+
+
+def _chunk_radius(max_distance: int) -> int:
+    return max_distance // PHASH_CHUNKS
+
+
+def similar_blobs(phash: int, max_distance: Optional[int] = None) -> list[tuple[int, int]]:
+    """
+    Retourne les fichiers dont le hachage est à au plus `max_distance` bits de `phash`,
+    sous forme de couples (identifiant, distance), du plus proche au plus éloigné.
+    """
+    if max_distance is None:
+        max_distance = settings.IMAGES_DUPLICATE_DISTANCE
+    radius = _chunk_radius(max_distance)
+    lookup = Q()
+    for field, chunk in zip(ImageBlob.PHASH_CHUNK_FIELDS, phash_chunks(phash)):
+        lookup |= Q(**{f'{field}__in': list(_neighbours(chunk, radius))})
+    candidates = ImageBlob.objects.filter(lookup).values_list('pk', 'phash')
+    matches = [
+        (pk, distance)
+        for pk, candidate in candidates
+        if (distance := hamming_distance(phash, candidate)) <= max_distance
+    ]
+    return sorted(matches, key=lambda match: (match[1], match[0]))
+
+
+def near_duplicates(image: Image, limit: Optional[int] = None) -> list[Image]:
+    """
+    Retourne les autres images prêtes dont le fichier est identique ou presque identique,
+    de la plus proche à la plus éloignée.
+
+    Aucune requête n'est exécutée si le fichier de l'image n'a pas de hachage.
+    """
+    if image.blob is None or image.blob.phash is None:
+        return []
+    distances = dict(similar_blobs(image.blob.phash))
+    images = Image.objects.filter(
+        blob_id__in=distances,
+        status=Image.Status.READY
+    ).exclude(pk=image.pk).select_related('user', 'blob').prefetch_related('blob__renditions')
+    images = sorted(images, key=lambda other: (distances[other.blob_id], -other.pk))
+    return images if limit is None else images[:limit]
+
+
+class HashIndex:
+    """
+    Index des hachages en mémoire, sur le même principe que les colonnes indexées :
+    utilisé par `manage.py find_duplicates` pour comparer tous les fichiers sans
+    une requête par fichier.
+    """
+    def __init__(self, max_distance: int) -> None:
+        self.max_distance = max_distance
+        self.radius = _chunk_radius(max_distance)
+        self.hashes: dict[int, int] = {}  # Identifiant du fichier -> hachage
+        self.tables: list[defaultdict[int, list[int]]] = [defaultdict(list) for _ in range(PHASH_CHUNKS)]
+
+    def add(self, pk: int, phash: int) -> None:
+        self.hashes[pk] = phash
+        for table, chunk in zip(self.tables, phash_chunks(phash)):
+            table[chunk].append(pk)
+
+    def query(self, phash: int) -> Iterator[tuple[int, int]]:
+        """
+        Retourne les fichiers indexés à au plus `max_distance` bits, avec leur distance.
+        """
+        seen = set()
+        for table, chunk in zip(self.tables, phash_chunks(phash)):
+            for value in _neighbours(chunk, self.radius):
+                for pk in table.get(value, ()):
+                    if pk in seen:
+                        continue
+                    seen.add(pk)
+                    distance = hamming_distance(phash, self.hashes[pk])
+                    if distance <= self.max_distance:
+                        yield pk, distance
+
+
+def duplicate_groups(blobs: Iterable[tuple[int, int]], max_distance: int) -> list[list[int]]:
+    """
+    Regroupe les fichiers (identifiant, hachage) reliés par une chaîne de quasi-doublons.
+
+    Chaque fichier n'est comparé qu'aux fichiers déjà indexés : une recherche par fichier.
+    """
+    index = HashIndex(max_distance)
+    parent: dict[int, int] = {}
+
+    def find(pk: int) -> int:
+        # Union-find avec compression de chemin
+        while parent[pk] != pk:
+            parent[pk] = parent[parent[pk]]
+            pk = parent[pk]
+        return pk
+
+    for pk, phash in blobs:
+        parent[pk] = pk
+        for other, _ in index.query(phash):
+            parent[find(other)] = find(pk)
+        index.add(pk, phash)
+
+    groups: defaultdict[int, list[int]] = defaultdict(list)
+    for pk in parent:
+        groups[find(pk)].append(pk)
+    return [sorted(group) for group in groups.values() if len(group) > 1]
@@ -0,0 +1,64 @@
+import csv  # Écriture des lignes CSV
+import json  # Écriture des lignes JSONL
+from typing import Any, Iterator  # Typage des générateurs
+
+from django.core.serializers.json import DjangoJSONEncoder  # Sérialise les dates
+from django.db.models import QuerySet  # Typage des requêtes
+
+from .models import Image  # Importation du modèle Image
+
+FORMATS: dict[str, str] = {
+    'jsonl': 'application/x-ndjson',  # Un objet JSON par ligne
+    'csv': 'text/csv',
+}
+
+# Colonnes d'une image, puis du créateur de l'image
+IMAGE_FIELDS: tuple[str, ...] = (
+    'id', 'title', 'slug', 'url', 'image', 'description', 'status', 'total_likes', 'created',
+)
+COLUMNS: tuple[str, ...] = ('record',) + IMAGE_FIELDS + ('user',)
+
+
+class Echo:
+    """
+    Pseudo-fichier dont `write` retourne la ligne au lieu de la stocker.
+    """
+    def write(self, value: str) -> str:
+        return value
+
+
+def export_records(queryset: QuerySet[Image], chunk_size: int = 2000) -> Iterator[dict[str, Any]]:
+    """
+    Génère les images puis leurs "likes", sans jamais charger toute la table en mémoire.
+
+    `iterator()` lit les lignes par paquets de `chunk_size` (curseur côté serveur sous PostgreSQL)
+    et ne garde pas les objets dans le cache du QuerySet.
+    """
+    images = queryset.order_by('pk').values_list(*IMAGE_FIELDS, 'user__username')
+    for row in images.iterator(chunk_size=chunk_size):
+        record = dict(zip(IMAGE_FIELDS + ('user',), row))
+        record['record'] = 'image'
+        yield record
+
+    # Un "like" est une arête (image, utilisateur) exportée sur sa propre ligne
+    likes = Image.user_like.through.objects.filter(
+        image__in=queryset.values('pk')
+    ).order_by('image_id', 'user_id').values_list('image_id', 'user__username')
+    for image_id, username in likes.iterator(chunk_size=chunk_size):
+        yield {'record': 'like', 'id': image_id, 'user': username}
+
+
+def export_lines(queryset: QuerySet[Image], format: str, chunk_size: int = 2000) -> Iterator[str]:
+    """
+    Génère le contenu de l'export ligne par ligne, au format "jsonl" ou "csv".
+    """
+    records = export_records(queryset, chunk_size)
+    if format == 'jsonl':
+        for record in records:
+            yield json.dumps(record, cls=DjangoJSONEncoder) + '\n'
+        return
+    # Les lignes "like" laissent vides les colonnes propres aux images
+    writer = csv.DictWriter(Echo(), fieldnames=COLUMNS)
+    yield writer.writeheader()
+    for record in records:
+        yield writer.writerow(record)
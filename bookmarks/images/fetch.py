@@ -0,0 +1,101 @@
+import asyncio  # Délai maximal du téléchargement asynchrone
+import tempfile  # Fichier temporaire sur disque pour ne pas garder l'image en mémoire
+import time  # Mesure de la durée totale du téléchargement
+from typing import IO  # Typage du fichier temporaire retourné
+
+import httpx  # Client HTTP non bloquant
+import requests  # Exceptions du module HTTP
+from django.conf import settings  # Accès aux paramètres du projet (ex. IMAGES_FETCH_MAX_BYTES)
+
+from bookmarks.http import get_async_client, get_session  # Clients HTTP partagés (connexions persistantes par hôte)
+
+
+class ImageFetchError(Exception):
+    """
+    Erreur levée lorsque le fichier distant ne peut pas être téléchargé.
+    """
+
+
+class ImageTooLarge(ImageFetchError):
+    """
+    Erreur levée lorsque le fichier distant dépasse `IMAGES_FETCH_MAX_BYTES`.
+    """
+
+
+def fetch_to_tempfile(url: str) -> IO[bytes]:
+    """
+    Télécharge `url` par morceaux dans un fichier temporaire et le retourne positionné au début.
+
+    La mémoire utilisée ne dépend pas de la taille du fichier : seul un morceau
+    de `IMAGES_FETCH_CHUNK_SIZE` octets est en mémoire à un instant donné.
+    L'appelant est responsable de la fermeture du fichier.
+    """
+    max_bytes = settings.IMAGES_FETCH_MAX_BYTES
+    deadline = time.monotonic() + settings.IMAGES_FETCH_MAX_DURATION
+    try:
+        with get_session().get(url, stream=True, timeout=settings.IMAGES_FETCH_TIMEOUT) as response:
+            response.raise_for_status()
+            # Refuse immédiatement les fichiers annoncés comme trop gros
+            content_length = response.headers.get('Content-Length')
+            if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+                raise ImageTooLarge(f'{url} is {content_length} bytes, the limit is {max_bytes}')
+
+            temp_file = tempfile.TemporaryFile()
+            try:
+                size = 0
+                for chunk in response.iter_content(chunk_size=settings.IMAGES_FETCH_CHUNK_SIZE):
+                    size += len(chunk)
+                    # Content-Length peut être absent ou mensonger : on compte les octets reçus
+                    if size > max_bytes:
+                        raise ImageTooLarge(f'{url} is larger than {max_bytes} bytes')
+                    if time.monotonic() > deadline:
+                        raise ImageFetchError(f'{url} took too long to download')
+                    temp_file.write(chunk)
+            except BaseException:
+                temp_file.close()
+                raise
+    except requests.RequestException as exc:
+        raise ImageFetchError(str(exc)) from exc
+
+    temp_file.seek(0)
+    return temp_file
+
+
+async def afetch_to_tempfile(url: str) -> IO[bytes]:
+    """
+    Variante non bloquante de `fetch_to_tempfile` pour les vues asynchrones.
+
+    L'attente du réseau libère la boucle d'événements : un seul worker ASGI peut
+    télécharger des centaines d'images en parallèle. Les limites sont les mêmes.
+    """
+    max_bytes = settings.IMAGES_FETCH_MAX_BYTES
+    connect_timeout, read_timeout = settings.IMAGES_FETCH_TIMEOUT
+    timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+    temp_file = tempfile.TemporaryFile()
+    try:
+        async with asyncio.timeout(settings.IMAGES_FETCH_MAX_DURATION):
+            async with get_async_client().stream('GET', url, timeout=timeout) as response:
+                response.raise_for_status()
+                # Refuse immédiatement les fichiers annoncés comme trop gros
+                content_length = response.headers.get('Content-Length')
+                if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+                    raise ImageTooLarge(f'{url} is {content_length} bytes, the limit is {max_bytes}')
+                size = 0
+                async for chunk in response.aiter_bytes(chunk_size=settings.IMAGES_FETCH_CHUNK_SIZE):
+                    size += len(chunk)
+                    # Content-Length peut être absent ou mensonger : on compte les octets reçus
+                    if size > max_bytes:
+                        raise ImageTooLarge(f'{url} is larger than {max_bytes} bytes')
+                    temp_file.write(chunk)
+    except TimeoutError as exc:
+        temp_file.close()
+        raise ImageFetchError(f'{url} took too long to download') from exc
+    except httpx.HTTPError as exc:
+        temp_file.close()
+        raise ImageFetchError(str(exc)) from exc
+    except BaseException:
+        temp_file.close()
+        raise
+
+    temp_file.seek(0)
+    return temp_file
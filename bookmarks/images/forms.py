@@ -1,7 +1,4 @@
-import requests  # Module pour effectuer des requêtes HTTP (utile pour télécharger une image à partir d'une URL)
 from django import forms
-from django.core.files.base import ContentFile  # Utilisé pour traiter le contenu binaire des fichiers
-from django.utils.text import slugify  # Convertit les chaînes de caractères en un format "slugifié" (URL-friendly)
 
 from .models import Image  # Importation du modèle Image depuis vos modèles
 
@@ -24,53 +21,23 @@ class ImageCreateForm(forms.ModelForm):
         # Liste des extensions valides pour les images
         valid_extensions = ['jpg', 'jpeg', 'png']
         # Récupère l'extension du fichier en divisant l'URL à partir du dernier point
-        extension = url.rsplit('.', 1)[1].lower()
+        # (une URL sans point donne une extension invalide au lieu d'une IndexError)
+        extension = url.rsplit('.', 1)[-1].lower()
         # Vérifie si l'extension est valide
         if extension not in valid_extensions:
             # Si non, lève une exception ValidationError
             raise forms.ValidationError('The given URL does not match valid image extensions.')
         return url  # Retourne l'URL validée
 
-    # Méthode pour sauvegarder l'instance du formulaire (et effectuer des actions supplémentaires)
-    def save(self, force_insert=False, force_update=False, commit=True):
-        # Appelle la méthode save() parente mais sans sauvegarder immédiatement dans la base de données
-        image = super().save(commit=False)
-        # Récupère l'URL de l'image depuis les données validées
-        image_url = self.cleaned_data['url']
-        # Génère un nom de fichier unique basé sur le titre de l'image
-        name = slugify(image.title)  # Convertit le titre en un slug (e.g., "Mon Image" -> "mon-image")
-        # Récupère l'extension du fichier depuis l'URL
-        extension = image_url.rsplit('.', 1)[1].lower()
-        # Combine le slug et l'extension pour créer un nom de fichier
-        image_name = f'{name}.{extension}'
-        
-        # Télécharge l'image depuis l'URL spécifiée
-        response = requests.get(image_url)
-        # Sauvegarde l'image dans le champ `image` du modèle en utilisant son contenu binaire
-        image.image.save(
-            image_name,  # Nom du fichier de l'image
-            ContentFile(response.content),  # Contenu binaire de l'image téléchargée
-            save=False  # N'enregistre pas immédiatement le fichier
-        )
-        # Si `commit` est True, enregistre l'objet dans la base de données
-        if commit:
-            image.save()
-        # Retourne l'instance de l'image sauvegardée
-        return image
-
 
 """
 ### Résumé des étapes importantes :
 1. **Validation de l'URL** :
    - Vérifie que l'URL pointe vers un fichier d'image ayant une extension valide (`.jpg`, `.jpeg`, `.png`).
 
-2. **Téléchargement et sauvegarde de l'image** :
-   - Télécharge l'image depuis l'URL fournie via une requête HTTP (`requests.get()`).
-   - Génère un nom de fichier basé sur le titre de l'image en format slugifié.
-   - Sauvegarde l'image dans le champ fichier de l'objet Image avec le contenu téléchargé.
-
-3. **Personnalisation de la sauvegarde** :
-   - Le formulaire utilise la méthode `save()` pour gérer les actions supplémentaires avant d'enregistrer l'objet dans la base de données, notamment l'attribution de l'image téléchargée.
+2. **Sauvegarde sans téléchargement** :
+   - Le formulaire enregistre une image à l'état `pending` sans bloquer le worker web.
+   - Le téléchargement, la validation et l'attribution du fichier sont faits en arrière-plan par `images.tasks.ingest_image`.
 
 Ce processus garantit que seules des images valides sont acceptées, et que l'image est correctement téléchargée et associée au modèle. 🖼️✔️
 """
\ No newline at end of file
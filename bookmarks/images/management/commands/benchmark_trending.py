@@ -0,0 +1,82 @@
+import time  # Mesure du temps des requêtes
+import uuid  # Nom unique de l'utilisateur de test
+
+from django.contrib.auth import get_user_model  # Modèle utilisateur du projet
+from django.core.management.base import BaseCommand  # Classe de base des commandes manage.py
+from django.db import transaction  # Toutes les données de test sont annulées à la fin
+from django.db.models import Count  # Classement naïf par comptage des "likes"
+
+from images.models import Image  # Importation du modèle Image
+from images.ranking import trending_queryset  # Classement tendance indexé
+
+
+class Command(BaseCommand):
+    """
+    Mesure le coût du classement tendance lorsque le nombre d'images augmente.
+
+    Les images de test sont créées dans une transaction annulée à la fin de la commande.
+    """
+    help = 'Benchmark the top-N trending query against an ORDER BY COUNT() join for growing tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10_000, 100_000, 1_000_000])
+        parser.add_argument('--top', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument(
+            '--skip-count-join',
+            action='store_true',
+            help='Do not measure the ORDER BY COUNT() join, which is slow on large tables.',
+        )
+
+    def handle(self, *args, **options):
+        top = options['top']
+        with transaction.atomic():
+            user = get_user_model().objects.create(username=f'benchmark-{uuid.uuid4().hex[:8]}')
+            created = 0
+            for size in sorted(options['sizes']):
+                created = self.fill(user, created, size)
+                trending = self.measure(
+                    lambda: list(trending_queryset()[:top]),
+                    options['repeat']
+                )
+                line = f'{size:>10} images  trending top-{top}: {trending * 1000:8.3f} ms'
+                if not options['skip_count_join']:
+                    count_join = self.measure(
+                        lambda: list(
+                            Image.objects.annotate(likes=Count('user_like')).order_by('-likes')[:top]
+                        ),
+                        1
+                    )
+                    line += f'  ORDER BY COUNT(): {count_join * 1000:10.3f} ms'
+                self.stdout.write(line)
+            transaction.set_rollback(True)
+
+    def fill(self, user, created: int, size: int) -> int:
+        """
+        Ajoute des images jusqu'à atteindre `size` images de test.
+        """
+        while created < size:
+            batch = min(10_000, size - created)
+            Image.objects.bulk_create([
+                Image(
+                    user=user,
+                    title='benchmark',
+                    slug='benchmark',
+                    url=f'http://example.com/{created + i}.jpg',
+                    status=Image.Status.READY,
+                    # Scores répartis comme après plusieurs décroissances
+                    trending_score=((created + i) * 7919 % 10_000) / 100
+                )
+                for i in range(batch)
+            ])
+            created += batch
+        return created
+
+    def measure(self, query, repeat: int) -> float:
+        """
+        Retourne la durée moyenne d'une exécution de `query`, en secondes.
+        """
+        start = time.perf_counter()
+        for _ in range(repeat):
+            query()
+        return (time.perf_counter() - start) / repeat
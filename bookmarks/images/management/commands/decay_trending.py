@@ -0,0 +1,25 @@
+from django.conf import settings  # Accès aux paramètres du projet (ex. IMAGES_TRENDING_DECAY_INTERVAL)
+from django.core.management.base import BaseCommand  # Classe de base des commandes manage.py
+
+from images.ranking import decay_factor, decay_trending_scores  # Décroissance du classement
+
+
+class Command(BaseCommand):
+    """
+    Applique la décroissance périodique des scores tendance (à lancer depuis cron).
+    """
+    help = 'Decay the trending scores of images, run every IMAGES_TRENDING_DECAY_INTERVAL seconds.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--elapsed',
+            type=float,
+            default=settings.IMAGES_TRENDING_DECAY_INTERVAL,
+            help='Seconds elapsed since the previous run.',
+        )
+
+    def handle(self, *args, **options):
+        updated = decay_trending_scores(options['elapsed'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{updated} score(s) multiplied by {decay_factor(options["elapsed"]):.4f}.'
+        ))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand  # Classe de base des commandes manage.py
+
+from images.export import FORMATS, export_lines  # Export en streaming
+from images.models import Image  # Importation du modèle Image
+
+
+class Command(BaseCommand):
+    """
+    Exporte les images et leurs "likes" en JSONL ou CSV avec une mémoire constante,
+    contrairement à `dumpdata` qui charge toutes les lignes.
+    """
+    help = 'Stream all images and their likes as JSONL or CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(FORMATS), default='jsonl')
+        parser.add_argument('--output', help='File to write (defaults to standard output).')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows fetched from the database at a time.')
+
+    def handle(self, *args, **options):
+        lines = export_lines(Image.objects.all(), options['format'], options['chunk_size'])
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+            output.writelines(lines)
+        self.stderr.write(self.style.SUCCESS(f"Exported to {options['output']}."))
@@ -0,0 +1,55 @@
+import time  # Mesure de la durée de la recherche
+
+from django.conf import settings  # Distance maximale par défaut
+from django.core.management.base import BaseCommand, CommandError  # Classe de base des commandes manage.py
+from django.db.models import Count  # Fichiers partagés par plusieurs images
+
+from images.duplicates import duplicate_groups  # Regroupement des quasi-doublons
+from images.models import Image, ImageBlob  # Importation des modèles
+
+
+class Command(BaseCommand):
+    """
+    Liste les groupes d'images identiques ou presque identiques (même fichier, ou
+    hachages perceptuels proches : autre résolution, recompression...).
+    """
+    help = 'List groups of identical or near-duplicate images, using the perceptual-hash index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--distance',
+            type=int,
+            default=settings.IMAGES_DUPLICATE_DISTANCE,
+            help='Maximum number of differing hash bits (out of 64).',
+        )
+        parser.add_argument('--user', help='Only compare the images bookmarked by this username.')
+
+    def handle(self, *args, **options):
+        if not 0 <= options['distance'] < 64:
+            raise CommandError('--distance must be between 0 and 63.')
+        started = time.monotonic()
+        images = Image.objects.filter(status=Image.Status.READY, blob__isnull=False)
+        if options['user']:
+            images = images.filter(user__username=options['user'])
+        blobs = ImageBlob.objects.filter(
+            phash__isnull=False, pk__in=images.values('blob_id')
+        ).order_by('pk').values_list('pk', 'phash')
+
+        groups = duplicate_groups(blobs.iterator(chunk_size=2000), options['distance'])
+        grouped = {pk for group in groups for pk in group}
+        # Un même fichier partagé par plusieurs images (URL différentes) est un doublon exact
+        shared = images.values('blob_id').annotate(total=Count('*')).filter(total__gt=1)
+        groups += [[row['blob_id']] for row in shared if row['blob_id'] not in grouped]
+
+        total = 0
+        for group in groups:
+            members = images.filter(blob_id__in=group).select_related('user').order_by('created', 'id')
+            lines = [f'  {image.id} {image.user.username} {image.url}' for image in members]
+            if len(lines) < 2:
+                continue
+            total += 1
+            self.stdout.write(f'Group {total} ({len(lines)} images):')
+            self.stdout.write('\n'.join(lines))
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} group(s) of duplicates found in {time.monotonic() - started:.2f}s.'
+        ))
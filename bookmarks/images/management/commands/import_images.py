@@ -0,0 +1,231 @@
+import csv  # Lecture des fichiers CSV
+import json  # Lecture des fichiers JSONL
+import os  # Remplacement atomique du fichier de reprise
+import time  # Mesure du débit
+from collections import Counter  # Comptage des résultats par état
+from concurrent.futures import ThreadPoolExecutor  # Pool borné de téléchargements concurrents
+from typing import Iterator, Optional, Union  # Typage des générateurs
+
+from django.contrib.auth import get_user_model  # Modèle utilisateur du projet
+from django.core.management.base import BaseCommand, CommandError  # Base des commandes manage.py
+from django.db import connection, transaction  # Connexion propre à chaque thread, écriture par lot
+from django.db.models import Count  # Comptage des états après téléchargement
+from django.utils.text import slugify  # `bulk_create` n'appelle pas Image.save()
+
+from account.stats import update_stats  # `bulk_create` n'envoie pas les signaux post_save
+from bookmarks.http import pool_stats  # Réutilisation des connexions HTTP
+from images.forms import ImageCreateForm  # Même validation que le bookmarklet
+from images.models import Image  # Importation du modèle Image
+from images.search import index_images  # `bulk_create` n'envoie pas les signaux post_save
+from images.tasks import ingest_image  # Téléchargement, validation et stockage d'une image
+
+FIELDS = ('user', 'url', 'title', 'description')  # Colonnes attendues
+
+
+class InvalidRow(ValueError):
+    """
+    Ligne illisible du fichier, rapportée et ignorée comme une ligne invalide.
+    """
+
+
+def read_rows(path: str, format: str) -> Iterator[Union[dict, InvalidRow]]:
+    """
+    Lit les lignes du fichier une par une, sans le charger entièrement en mémoire.
+
+    Une ligne JSONL mal formée est remplacée par une `InvalidRow` : la numérotation des
+    lignes (et donc le point de reprise) ne change pas et l'import continue.
+    """
+    with open(path, newline='', encoding='utf-8') as source:
+        if format == 'csv':
+            yield from csv.DictReader(source)
+        else:
+            for line_number, line in enumerate(source, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    yield InvalidRow(f'line {line_number}: invalid JSON ({exc.msg})')
+                    continue
+                if not isinstance(row, dict):
+                    yield InvalidRow(f'line {line_number}: expected a JSON object')
+                    continue
+                yield row
+
+
+def fetch(image_id: int) -> None:
+    """
+    Télécharge une image dans un thread du pool, puis libère la connexion à la base.
+    """
+    try:
+        ingest_image(image_id)
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    """
+    Importe en masse des images à partir d'un fichier CSV ou JSONL de lignes (user, url, title, description).
+
+    Les lignes sont validées par `ImageCreateForm`, écrites par lots avec `bulk_create`, puis
+    téléchargées par un pool borné de threads. Un fichier de reprise permet de relancer la
+    commande après une interruption.
+    """
+    help = 'Import images in bulk from a CSV or JSONL file of (user, url, title, description) rows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSONL file to import.')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Input format (guessed from the extension by default).')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows written per bulk insert.')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Concurrent downloads (0 downloads in the main thread). Raise HTTP_POOL_MAXSIZE to match.',
+        )
+        parser.add_argument('--checkpoint', help='Checkpoint file (defaults to PATH.checkpoint).')
+        parser.add_argument('--restart', action='store_true', help='Ignore an existing checkpoint.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        format = options['format'] or ('csv' if path.endswith('.csv') else 'jsonl')
+        self.checkpoint = options['checkpoint'] or f'{path}.checkpoint'
+        self.batch_size = options['batch_size']
+        self.workers = options['workers']
+        self.users: dict[str, Optional[int]] = {}  # Cache des utilisateurs par nom
+        self.totals: Counter = Counter()
+        self.started = time.monotonic()
+
+        done = 0 if options['restart'] else self.read_checkpoint()
+        if done:
+            self.stdout.write(f'Resuming after row {done}.')
+
+        executor = ThreadPoolExecutor(max_workers=self.workers) if self.workers > 0 else None
+        try:
+            batch: list[tuple[int, Union[dict, InvalidRow]]] = []
+            for number, row in enumerate(read_rows(path, format), start=1):
+                if number <= done:
+                    continue  # Ligne déjà importée lors d'une exécution précédente
+                batch.append((number, row))
+                if len(batch) >= self.batch_size:
+                    self.import_batch(batch, executor)
+                    batch = []
+            if batch:
+                self.import_batch(batch, executor)
+        finally:
+            if executor:
+                executor.shutdown()
+
+        if os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)  # Import terminé : la prochaine exécution repart de zéro
+        self.report(final=True)
+
+    def read_checkpoint(self) -> int:
+        """
+        Retourne le numéro de la dernière ligne traitée lors d'une exécution précédente.
+        """
+        try:
+            with open(self.checkpoint) as checkpoint:
+                return int(checkpoint.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+        except ValueError:
+            raise CommandError(f'Invalid checkpoint file {self.checkpoint}.')
+
+    def write_checkpoint(self, number: int) -> None:
+        # Écriture atomique : une interruption ne laisse jamais un fichier à moitié écrit
+        temp_path = f'{self.checkpoint}.tmp'
+        with open(temp_path, 'w') as checkpoint:
+            checkpoint.write(str(number))
+        os.replace(temp_path, self.checkpoint)
+
+    def get_user_id(self, username: str) -> Optional[int]:
+        if username not in self.users:
+            self.users[username] = get_user_model().objects.filter(
+                username=username
+            ).values_list('pk', flat=True).first()
+        return self.users[username]
+
+    def import_batch(self, batch: list[tuple[int, Union[dict, InvalidRow]]], executor: Optional[ThreadPoolExecutor]) -> None:
+        """
+        Valide, écrit puis télécharge un lot de lignes, et enregistre le point de reprise.
+        """
+        images = []
+        for number, row in batch:
+            if isinstance(row, InvalidRow):
+                self.stderr.write(f'Row {number} skipped: {row}')
+                self.totals['invalid'] += 1
+                continue
+            form = ImageCreateForm(data={field: row.get(field) or '' for field in FIELDS[1:]})
+            user_id = self.get_user_id(row.get('user') or '')
+            if user_id is None or not form.is_valid():
+                errors = 'unknown user' if user_id is None else form.errors.as_text().replace('\n', ' ')
+                self.stderr.write(f'Row {number} skipped: {errors}')
+                self.totals['invalid'] += 1
+                continue
+            image = form.save(commit=False)
+            image.user_id = user_id
+            image.slug = slugify(image.title)
+            images.append(image)
+
+        # Les lignes déjà importées (reprise après une interruption) ne sont pas dupliquées
+        existing = {
+            (user_id, url): (pk, status)
+            for pk, user_id, url, status in Image.objects.filter(
+                url__in={image.url for image in images}
+            ).values_list('pk', 'user_id', 'url', 'status')
+        }
+        new_images, to_fetch, seen = [], [], set()
+        for image in images:
+            key = (image.user_id, image.url)
+            if key in existing:
+                pk, status = existing[key]
+                if status == Image.Status.PENDING:
+                    to_fetch.append(pk)  # Téléchargement interrompu lors de l'exécution précédente
+                self.totals['duplicate'] += 1
+            elif key not in seen:
+                seen.add(key)
+                new_images.append(image)
+            else:
+                self.totals['duplicate'] += 1
+
+        with transaction.atomic():
+            created = Image.objects.bulk_create(new_images)
+            index_images(created)  # Index de recherche mis à jour par lot
+            # Compteurs du tableau de bord mis à jour une fois par utilisateur
+            for user_id, count in Counter(image.user_id for image in created).items():
+                update_stats([user_id], images_created=count)
+        self.totals['created'] += len(created)
+        to_fetch += [image.pk for image in created]
+
+        if executor:
+            list(executor.map(fetch, to_fetch))  # Attend la fin du lot avant le point de reprise
+        else:
+            for image_id in to_fetch:
+                ingest_image(image_id)
+        statuses = Image.objects.filter(pk__in=to_fetch).order_by().values_list('status').annotate(total=Count('*'))
+        for status, count in statuses:
+            self.totals[status] += count
+
+        self.totals['rows'] += len(batch)
+        self.write_checkpoint(batch[-1][0])
+        self.report()
+
+    def report(self, final: bool = False) -> None:
+        """
+        Affiche l'avancement et le débit de l'import.
+        """
+        elapsed = time.monotonic() - self.started
+        rate = self.totals['rows'] / elapsed if elapsed else 0
+        message = (
+            f"{self.totals['rows']} rows in {elapsed:.1f}s ({rate:.1f} rows/s): "
+            f"{self.totals['created']} created, {self.totals['duplicate']} duplicate, "
+            f"{self.totals['invalid']} invalid, {self.totals[Image.Status.READY]} ready, "
+            f"{self.totals[Image.Status.FAILED]} failed"
+        )
+        if final:
+            stats = pool_stats()
+            message += f", HTTP connections reused {stats['hits']}/{stats['hits'] + stats['misses']}"
+            self.stdout.write(self.style.SUCCESS(message))
+        else:
+            self.stdout.write(message)
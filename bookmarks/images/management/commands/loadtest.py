@@ -0,0 +1,136 @@
+import asyncio  # Requêtes concurrentes sur une seule boucle d'événements
+import statistics  # Percentiles des latences
+import time  # Mesure des durées
+from importlib import import_module  # Moteur de session configuré
+from typing import Optional  # Requêtes GET sans données
+
+import httpx  # Client HTTP asynchrone
+from django.conf import settings  # Noms des cookies de session et CSRF
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model  # Session authentifiée
+from django.core.management.base import BaseCommand, CommandError  # Base des commandes manage.py
+from django.urls import reverse  # URLs des vues testées
+from django.utils.crypto import get_random_string  # Jeton CSRF aléatoire
+
+from images.models import Image  # Importation du modèle Image
+
+
+class Command(BaseCommand):
+    """
+    Envoie des requêtes concurrentes à un serveur en cours d'exécution (WSGI ou ASGI)
+    et mesure le débit et les latences des vues `image_create`, `image_like` ou `image_detail`.
+
+    Exemple :
+        gunicorn bookmarks.wsgi -w 1            # puis : manage.py loadtest --endpoint create
+        uvicorn bookmarks.asgi:application      # même commande, même base de données
+    """
+    help = 'Load-test image_create, image_like or image_detail on a running WSGI or ASGI server.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--endpoint', choices=['create', 'like', 'detail'], default='create')
+        parser.add_argument('--username', required=True, help='User the requests are sent as.')
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=100)
+        parser.add_argument(
+            '--image-url',
+            default='http://127.0.0.1:8001/image-{i}.png',
+            help='Remote image bookmarked by the create endpoint; {i} is replaced by the request number '
+                 'so that every request downloads a different URL.',
+        )
+        parser.add_argument(
+            '--wait-ready',
+            action='store_true',
+            help='After the create requests, wait until every image is downloaded and report the delay.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options['username'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"Unknown user {options['username']}.")
+        cookies = self.login_cookies(user)
+        if options['endpoint'] == 'create':
+            path = reverse('images:image_create')
+            payloads = [
+                {'title': f'Load test {i}', 'url': options['image_url'].format(i=i), 'description': ''}
+                for i in range(options['requests'])
+            ]
+        elif options['endpoint'] == 'like':
+            path = reverse('images:like')
+            image = self.get_image(user, options['image_url'])
+            payloads = [
+                {'id': image.pk, 'action': 'like' if i % 2 == 0 else 'unlike'}
+                for i in range(options['requests'])
+            ]
+        else:
+            # Requêtes GET (payload None) sur la page de détail, vues comptées par images/counters.py
+            path = self.get_image(user, options['image_url']).get_absolute_url()
+            payloads = [None] * options['requests']
+
+        started = time.monotonic()
+        latencies, errors, elapsed = asyncio.run(
+            self.run(options['base_url'] + path, cookies, payloads, options['concurrency'])
+        )
+        total = len(payloads)
+        latencies.sort()
+        self.stdout.write(
+            f"{total} requests, concurrency {options['concurrency']}: {elapsed:.2f}s, "
+            f'{total / elapsed:.1f} req/s, {errors} error(s)'
+        )
+        if len(latencies) > 1:
+            quantiles = statistics.quantiles(latencies, n=100)
+            self.stdout.write(
+                f'latency p50 {quantiles[49] * 1000:.0f} ms, p95 {quantiles[94] * 1000:.0f} ms, '
+                f'p99 {quantiles[98] * 1000:.0f} ms, max {latencies[-1] * 1000:.0f} ms'
+            )
+        if options['wait_ready'] and options['endpoint'] == 'create':
+            # Le téléchargement se poursuit après la réponse : mesure le délai jusqu'à la dernière image
+            while Image.objects.filter(user=user, status=Image.Status.PENDING).exists():
+                time.sleep(0.1)
+            self.stdout.write(f'all images downloaded {time.monotonic() - started:.2f}s after the first request')
+
+    def get_image(self, user, image_url: str) -> Image:
+        return Image.objects.filter(user=user).first() or Image.objects.create(
+            user=user, title='Load test', url=image_url.format(i=0)
+        )
+
+    def login_cookies(self, user) -> dict[str, str]:
+        """
+        Crée une session authentifiée et un jeton CSRF, comme après une connexion.
+        """
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+        session[BACKEND_SESSION_KEY] = 'account.authentication.CachedModelBackend'
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.save()
+        return {
+            settings.SESSION_COOKIE_NAME: session.session_key,
+            settings.CSRF_COOKIE_NAME: get_random_string(32),
+        }
+
+    async def run(self, url: str, cookies: dict, payloads: list[Optional[dict]], concurrency: int) -> tuple[list[float], int, float]:
+        slots = asyncio.Semaphore(concurrency)
+        latencies: list[float] = []
+        errors = 0
+        headers = {'X-CSRFToken': cookies[settings.CSRF_COOKIE_NAME], 'Referer': url}
+        limits = httpx.Limits(max_connections=concurrency)
+
+        async with httpx.AsyncClient(cookies=cookies, headers=headers, limits=limits, timeout=60) as client:
+            async def send(payload: Optional[dict]) -> None:
+                nonlocal errors
+                async with slots:
+                    started = time.monotonic()
+                    try:
+                        if payload is None:
+                            response = await client.get(url)
+                        else:
+                            response = await client.post(url, data=payload)
+                        if response.status_code >= 400:
+                            errors += 1
+                    except httpx.HTTPError:
+                        errors += 1
+                    latencies.append(time.monotonic() - started)
+
+            started = time.monotonic()
+            await asyncio.gather(*(send(payload) for payload in payloads))
+            return latencies, errors, time.monotonic() - started
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand  # Classe de base des commandes manage.py
+from django.db import transaction  # L'index n'est jamais vu à moitié reconstruit
+
+from images.search import get_backend  # Moteur de recherche de la base courante
+
+
+class Command(BaseCommand):
+    """
+    Reconstruit l'index plein texte à partir de la table des images.
+    """
+    help = 'Rebuild the full-text search index of image titles and descriptions.'
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        with transaction.atomic():
+            total = backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'{total} image(s) indexed with {type(backend).__name__}.'))
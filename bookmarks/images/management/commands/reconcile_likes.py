@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand  # Classe de base des commandes manage.py
+from django.db.models import Count, OuterRef, Subquery  # Sous-requête de comptage des "likes"
+from django.db.models.functions import Coalesce  # Remplace NULL par 0 pour les images sans "like"
+
+from images.models import Image  # Importation du modèle Image
+
+
+class Command(BaseCommand):
+    """
+    Recalcule `Image.total_likes` à partir de la table des "likes" pour corriger toute dérive.
+    """
+    help = 'Reconcile the denormalized Image.total_likes counters with the likes table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report the images whose counter has drifted.',
+        )
+
+    def handle(self, *args, **options):
+        likes = Image.user_like.through.objects.filter(
+            image_id=OuterRef('pk')
+        ).values('image_id').annotate(total=Count('*')).values('total')
+        # Une seule requête pour trouver les compteurs faux
+        drifted = Image.objects.annotate(
+            actual=Coalesce(Subquery(likes), 0)
+        ).exclude(total_likes=Coalesce(Subquery(likes), 0))
+
+        for image in drifted.only('id', 'title', 'total_likes'):
+            self.stdout.write(f'{image.id} {image.title}: {image.total_likes} -> {image.actual}')
+        if options['dry_run']:
+            return
+        fixed = Image.objects.filter(
+            pk__in=drifted.values('pk')
+        ).update(total_likes=Coalesce(Subquery(likes), 0))
+        self.stdout.write(self.style.SUCCESS(f'{fixed} image(s) reconciled.'))
@@ -0,0 +1,40 @@
+from datetime import timedelta  # Âge minimal des images en attente
+
+from django.conf import settings  # Accès aux paramètres du projet (ex. IMAGES_PENDING_RETRY_AFTER)
+from django.core.management.base import BaseCommand  # Classe de base des commandes manage.py
+from django.utils import timezone  # Date courante
+
+from images.models import Image  # Importation du modèle Image
+from images.tasks import enqueue_image_ingest  # Téléchargement dans le pool de workers
+
+
+class Command(BaseCommand):
+    """
+    Replanifie le téléchargement des images restées en attente.
+
+    Les téléchargements en cours (pool de workers ou boucle d'événements ASGI) vivent dans
+    la mémoire du processus : un redémarrage les perd et laisse les images à l'état
+    `pending`. À lancer après chaque déploiement et depuis cron.
+    """
+    help = 'Re-enqueue the download of images pending for longer than IMAGES_PENDING_RETRY_AFTER seconds.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            default=settings.IMAGES_PENDING_RETRY_AFTER,
+            help='Only images created at least this many seconds ago (downloads still running are younger).',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(seconds=options['older_than'])
+        images = Image.objects.filter(
+            status=Image.Status.PENDING,
+            created__lt=cutoff
+        ).only('pk').order_by('pk')
+        requeued = 0
+        for image in images.iterator(chunk_size=500):
+            # Les workers terminent les téléchargements avant la fin du processus
+            enqueue_image_ingest(image)
+            requeued += 1
+        self.stdout.write(self.style.SUCCESS(f'{requeued} pending image(s) re-enqueued.'))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand  # Classe de base des commandes manage.py
+
+from images.metadata import extract_metadata  # Métadonnées extraites à l'import
+from images.models import ImageBlob  # Importation du modèle ImageBlob
+
+
+class Command(BaseCommand):
+    """
+    Calcule les métadonnées des fichiers stockés avant leur extraction à l'import.
+    """
+    help = 'Extract dimensions, format, dominant color and perceptual hash of stored images missing them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Recompute the metadata of every file.')
+
+    def handle(self, *args, **options):
+        blobs = ImageBlob.objects.order_by('pk')
+        if not options['all']:
+            blobs = blobs.filter(phash__isnull=True)
+        updated = 0
+        for blob in blobs.iterator(chunk_size=500):
+            try:
+                with blob.file.open('rb') as f:
+                    metadata = extract_metadata(f)
+            except (OSError, ValueError) as exc:
+                self.stderr.write(f'{blob.file.name}: {exc}')
+                continue
+            for field, value in metadata._asdict().items():
+                setattr(blob, field, value)
+            blob.save(update_fields=list(metadata._fields))
+            updated += 1
+        self.stdout.write(self.style.SUCCESS(f'{updated} file(s) updated.'))
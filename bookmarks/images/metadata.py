@@ -0,0 +1,136 @@
+import math  # Coefficients de la DCT
+from functools import lru_cache  # Matrice de DCT calculée une seule fois
+from statistics import median  # Seuil du hachage perceptuel
+from typing import IO, NamedTuple, Optional  # Typage du résultat
+
+from PIL import Image as PILImage, ImageOps  # Lecture des en-têtes et décodage réduit
+
+HASH_SIZE = 8  # Le hachage garde les 8 x 8 fréquences les plus basses (64 bits)
+DCT_SIZE = 32  # Taille de l'image réduite sur laquelle la DCT est calculée
+PHASH_CHUNKS = 4  # Nombre de morceaux indexés du hachage
+PHASH_CHUNK_BITS = 64 // PHASH_CHUNKS  # Bits par morceau
+
+
+class ImageMetadata(NamedTuple):
+    """
+    Métadonnées d'un fichier image, calculées une seule fois à l'import.
+    """
+    width: int  # Largeur en pixels (après rotation EXIF)
+    height: int  # Hauteur en pixels (après rotation EXIF)
+    format: str  # Format du fichier (ex. "jpeg", "png")
+    dominant_color: str  # Couleur dominante au format "#rrggbb"
+    phash: int  # Hachage perceptuel sur 64 bits, en entier signé (BigIntegerField)
+
+
+def extract_metadata(file: IO[bytes]) -> ImageMetadata:
+    """
+    Lit les dimensions et le format dans l'en-tête, puis calcule la couleur dominante
+    et le hachage perceptuel sur une version réduite de l'image.
+
+    Pour les JPEG, `draft()` demande au décodeur une réduction DCT (jusqu'à 1/8) :
+    seule une fraction des pixels est décodée.
+    """
+    file.seek(0)
+    with PILImage.open(file) as source:
+        # Les dimensions et le format viennent de l'en-tête, sans décodage
+        width, height = source.size
+        format = (source.format or '').lower()
+        # L'orientation EXIF inverse la largeur et la hauteur affichées
+        if source.getexif().get(0x0112) in (5, 6, 7, 8):
+            width, height = height, width
+        source.draft('RGB', (DCT_SIZE * 2, DCT_SIZE * 2))
+        small = ImageOps.exif_transpose(source).convert('RGB')
+        small.thumbnail((DCT_SIZE * 2, DCT_SIZE * 2))
+    file.seek(0)
+    return ImageMetadata(
+        width=width,
+        height=height,
+        format=format,
+        dominant_color=dominant_color(small),
+        phash=to_signed(phash(small)),
+    )
+
+
+def dominant_color(image: PILImage.Image) -> str:
+    """
+    Retourne la couleur la plus fréquente après réduction de la palette à quelques couleurs.
+    """
+    palette_image = image.quantize(colors=8)
+    count, index = max(palette_image.getcolors())
+    red, green, blue = palette_image.getpalette()[index * 3:index * 3 + 3]
+    return f'#{red:02x}{green:02x}{blue:02x}'
+
+
+@lru_cache(maxsize=None)
+def _dct_matrix(size: int) -> tuple[tuple[float, ...], ...]:
+    """
+    Lignes de la matrice de DCT-II orthonormée, limitées aux HASH_SIZE premières fréquences.
+    """
+    return tuple(
+        tuple(
+            math.sqrt((1 if k == 0 else 2) / size) * math.cos(math.pi * (2 * n + 1) * k / (2 * size))
+            for n in range(size)
+        )
+        for k in range(HASH_SIZE)
+    )
+
+
+def phash(image: PILImage.Image) -> int:
+    """
+    Hachage perceptuel (pHash) : DCT 2D d'une version 32 x 32 en niveaux de gris, dont les
+    8 x 8 basses fréquences sont comparées à leur médiane.
+
+    La DCT 2D est séparable : elle est calculée sur les lignes puis sur les colonnes, et
+    seules les basses fréquences utiles sont calculées.
+    """
+    gray = image.convert('L').resize((DCT_SIZE, DCT_SIZE), PILImage.LANCZOS)
+    pixels = list(gray.getdata())
+    rows = [pixels[y * DCT_SIZE:(y + 1) * DCT_SIZE] for y in range(DCT_SIZE)]
+    matrix = _dct_matrix(DCT_SIZE)
+    # DCT de chaque ligne : DCT_SIZE lignes x HASH_SIZE fréquences horizontales
+    row_dct = [[sum(c * p for c, p in zip(basis, row)) for basis in matrix] for row in rows]
+    # DCT de chaque colonne du résultat : HASH_SIZE x HASH_SIZE fréquences
+    coefficients = [
+        sum(basis[y] * row_dct[y][u] for y in range(DCT_SIZE))
+        for basis in matrix
+        for u in range(HASH_SIZE)
+    ]
+    # La composante continue (luminosité moyenne) est exclue du calcul du seuil
+    threshold = median(coefficients[1:])
+    value = 0
+    for coefficient in coefficients:
+        value = (value << 1) | (coefficient > threshold)
+    return value
+
+
+def to_signed(value: int) -> int:
+    """
+    Convertit un entier non signé de 64 bits en entier signé (colonnes BIGINT).
+    """
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def to_unsigned(value: Optional[int]) -> Optional[int]:
+    """
+    Opération inverse de `to_signed`.
+    """
+    return None if value is None else value & ((1 << 64) - 1)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """
+    Nombre de bits différents entre deux hachages.
+    """
+    return (to_unsigned(a) ^ to_unsigned(b)).bit_count()
+
+
+def phash_chunks(value: int) -> list[int]:
+    """
+    Découpe un hachage en PHASH_CHUNKS morceaux non signés, du poids fort au poids faible.
+    """
+    unsigned = to_unsigned(value)
+    mask = (1 << PHASH_CHUNK_BITS) - 1
+    return [
+        (unsigned >> (PHASH_CHUNK_BITS * (PHASH_CHUNKS - 1 - i))) & mask
+        for i in range(PHASH_CHUNKS)
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.9 on 2026-10-18 11:35
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_likes(apps, schema_editor):
+    Image = apps.get_model('images', 'Image')
+    likes = Image.user_like.through.objects.filter(
+        image_id=OuterRef('pk')
+    ).values('image_id').annotate(total=Count('*')).values('total')
+    Image.objects.update(total_likes=Coalesce(Subquery(likes), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0004_image_rendition'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='total_likes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='image',
+            index=models.Index(fields=['-total_likes'], name='images_imag_total_l_0bcd7e_idx'),
+        ),
+        migrations.RunPython(count_likes, migrations.RunPython.noop),
+    ]
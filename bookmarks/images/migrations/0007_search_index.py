@@ -0,0 +1,52 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+FTS_TABLE = 'images_image_fts'
+SEARCH_TABLE = 'images_image_search'
+
+
+def create_index(apps, schema_editor):
+    """
+    Crée l'index plein texte propre à la base de données et y ajoute les images existantes.
+    """
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                f"title, description, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        except OperationalError:
+            return  # SQLite compilé sans FTS5 : la recherche se replie sur `icontains`
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description) '
+            f'SELECT id, title, description FROM images_image'
+        )
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE TABLE {SEARCH_TABLE} ('
+            f'image_id bigint PRIMARY KEY REFERENCES images_image (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+            f'document tsvector NOT NULL)'
+        )
+        schema_editor.execute(f'CREATE INDEX {SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)')
+        schema_editor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (image_id, document) "
+            f"SELECT id, setweight(to_tsvector('simple', title), 'A') || "
+            f"setweight(to_tsvector('simple', description), 'B') FROM images_image"
+        )
+
+
+def drop_index(apps, schema_editor):
+    schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0006_image_trending_score'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
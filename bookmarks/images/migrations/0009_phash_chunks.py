@@ -0,0 +1,60 @@
+# Generated by Django 5.0.9 on 2026-10-18 12:24
+
+from django.db import migrations, models
+
+from images.metadata import phash_chunks
+
+
+def split_hashes(apps, schema_editor):
+    ImageBlob = apps.get_model('images', 'ImageBlob')
+    blobs = ImageBlob.objects.filter(phash__isnull=False).only('phash')
+    for blob in blobs.iterator(chunk_size=1000):
+        blob.phash_0, blob.phash_1, blob.phash_2, blob.phash_3 = phash_chunks(blob.phash)
+        blob.save(update_fields=['phash_0', 'phash_1', 'phash_2', 'phash_3'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0008_blob_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imageblob',
+            name='phash_0',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='imageblob',
+            name='phash_1',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='imageblob',
+            name='phash_2',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='imageblob',
+            name='phash_3',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='imageblob',
+            index=models.Index(fields=['phash_0'], name='images_imag_phash_0_fbb268_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='imageblob',
+            index=models.Index(fields=['phash_1'], name='images_imag_phash_1_c15016_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='imageblob',
+            index=models.Index(fields=['phash_2'], name='images_imag_phash_2_5b83ff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='imageblob',
+            index=models.Index(fields=['phash_3'], name='images_imag_phash_3_15c505_idx'),
+        ),
+        migrations.RunPython(split_hashes, migrations.RunPython.noop),
+    ]
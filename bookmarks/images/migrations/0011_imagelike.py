@@ -0,0 +1,56 @@
+# Generated by Django 5.0.9 on 2026-10-18 13:02
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_like_dates(apps, schema_editor):
+    # La date des "likes" existants est inconnue : celle de l'image en est une borne inférieure
+    Image = apps.get_model('images', 'Image')
+    ImageLike = apps.get_model('images', 'ImageLike')
+    ImageLike.objects.update(
+        created=Subquery(Image.objects.filter(pk=OuterRef('image_id')).values('created')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0010_image_total_views'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # La table existante du ManyToManyField devient le modèle ImageLike, sans la recréer
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='ImageLike',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('image', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='images.image')),
+                        ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                    ],
+                    options={
+                        'db_table': 'images_image_user_like',
+                        'unique_together': {('image', 'user')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='image',
+                    name='user_like',
+                    field=models.ManyToManyField(blank=True, related_name='images_liked', through='images.ImageLike', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='imagelike',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_like_dates, migrations.RunPython.noop),
+    ]
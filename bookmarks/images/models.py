@@ -1,14 +1,118 @@
-from typing import Any  # Pour typage générique
+from typing import Any, Optional  # Pour typage générique
 from django.conf import settings  # Accès aux paramètres du projet (ex. AUTH_USER_MODEL)
 from django.utils.text import slugify  # Fonction pour générer des slugs à partir de chaînes de caractères
 from django.db import models  # Base pour tous les modèles Django
 from django.urls import reverse  # Permet d'accéder aux URLs
 
+from .metadata import phash_chunks  # Découpage du hachage perceptuel en morceaux indexés
+
+
+class ImageBlob(models.Model):
+    """
+    Fichier image stocké une seule fois et partagé par toutes les images au contenu identique.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)  # Empreinte SHA-256 du contenu
+    file = models.ImageField(upload_to='images/%Y/%m/%d')  # Fichier stocké sur le serveur
+    size = models.PositiveBigIntegerField(default=0)  # Taille du fichier en octets
+    ref_count = models.PositiveIntegerField(default=0)  # Nombre d'images qui utilisent ce fichier
+    created = models.DateTimeField(auto_now_add=True)  # Date de création automatique
+    # Métadonnées extraites à l'import (voir images/metadata.py), vides pour les fichiers plus anciens
+    width = models.PositiveIntegerField(null=True, blank=True)  # Largeur affichée en pixels
+    height = models.PositiveIntegerField(null=True, blank=True)  # Hauteur affichée en pixels
+    format = models.CharField(max_length=10, blank=True)  # Format du fichier (ex. "jpeg", "png")
+    dominant_color = models.CharField(max_length=7, blank=True)  # Couleur dominante "#rrggbb"
+    phash = models.BigIntegerField(null=True, blank=True)  # Hachage perceptuel sur 64 bits (signé)
+    # Le hachage découpé en 4 morceaux de 16 bits indexés (recherche des quasi-doublons, voir images/duplicates.py)
+    phash_0 = models.PositiveIntegerField(null=True, blank=True)  # Bits 63 à 48
+    phash_1 = models.PositiveIntegerField(null=True, blank=True)  # Bits 47 à 32
+    phash_2 = models.PositiveIntegerField(null=True, blank=True)  # Bits 31 à 16
+    phash_3 = models.PositiveIntegerField(null=True, blank=True)  # Bits 15 à 0
+
+    PHASH_CHUNK_FIELDS = ['phash_0', 'phash_1', 'phash_2', 'phash_3']  # Colonnes des morceaux, dans l'ordre
+
+    class Meta:
+        """
+        Métadonnées pour le modèle.
+        """
+        indexes: list[models.Index] = [
+            # Un index par morceau : une recherche par distance de Hamming ne lit que les candidats
+            models.Index(fields=['phash_0']),
+            models.Index(fields=['phash_1']),
+            models.Index(fields=['phash_2']),
+            models.Index(fields=['phash_3']),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Retourne une représentation sous forme de chaîne de caractères pour l'objet.
+        """
+        return self.sha256
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Surcharge de la méthode `save` pour tenir les morceaux indexés du hachage à jour.
+        """
+        chunks = phash_chunks(self.phash) if self.phash is not None else [None] * len(self.PHASH_CHUNK_FIELDS)
+        for field, chunk in zip(self.PHASH_CHUNK_FIELDS, chunks):
+            setattr(self, field, chunk)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'phash' in update_fields:
+            kwargs['update_fields'] = [*update_fields, *self.PHASH_CHUNK_FIELDS]
+        super().save(*args, **kwargs)
+
+    def rendition_size(self, width: int) -> Optional[tuple[int, int]]:
+        """
+        Retourne les dimensions de la version de largeur `width`, sans ouvrir le fichier
+        (les versions ne sont jamais agrandies).
+        """
+        if not self.width or not self.height:
+            return None
+        if self.width <= width:
+            return self.width, self.height
+        return width, round(self.height * width / self.width)
+
+
+class ImageRendition(models.Model):
+    """
+    Version redimensionnée d'un fichier partagé, générée à l'import pour ne jamais redimensionner pendant une requête.
+    """
+    blob = models.ForeignKey(
+        ImageBlob,  # Fichier source
+        related_name='renditions',
+        on_delete=models.CASCADE
+    )
+    width = models.PositiveIntegerField()  # Largeur demandée en pixels
+    height = models.PositiveIntegerField()  # Hauteur obtenue en pixels
+    format = models.CharField(max_length=10)  # Format de sortie (ex. "webp", "jpeg")
+    file = models.ImageField(upload_to='images/renditions/%Y/%m/%d')  # Fichier redimensionné
+
+    class Meta:
+        """
+        Métadonnées pour le modèle.
+        """
+        constraints: list[models.BaseConstraint] = [
+            models.UniqueConstraint(fields=['blob', 'width', 'format'], name='unique_rendition')
+        ]
+
+    def __str__(self) -> str:
+        """
+        Retourne une représentation sous forme de chaîne de caractères pour l'objet.
+        """
+        return f'{self.blob} {self.width}w {self.format}'
+
 
 class Image(models.Model):
     """
     Modèle représentant une image partagée par un utilisateur, avec des métadonnées associées.
     """
+    class Status(models.TextChoices):
+        """
+        États du téléchargement du fichier distant.
+        """
+        PENDING = 'pending', 'Pending'  # En attente d'un worker
+        READY = 'ready', 'Ready'  # Fichier téléchargé et validé
+        FAILED = 'failed', 'Failed'  # Téléchargement ou validation en échec
+
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,  # Utilisateur lié à l'image
         related_name='images_created',  # Nom de la relation inverse (pour accéder aux images d'un utilisateur)
@@ -17,21 +121,41 @@ class Image(models.Model):
     title = models.CharField(max_length=200)  # Titre de l'image
     slug = models.SlugField(max_length=200, blank=True)  # Champ slug (généré automatiquement si vide)
     url = models.URLField(max_length=2000)  # URL de l'image d'origine
-    image = models.ImageField(upload_to='images/%Y/%m/%d')  # Fichier image stocké sur le serveur
+    image = models.ImageField(upload_to='images/%Y/%m/%d', blank=True)  # Fichier image stocké sur le serveur (vide tant que l'image est en attente)
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING  # Les nouvelles images sont téléchargées en arrière-plan
+    )
+    blob = models.ForeignKey(
+        ImageBlob,  # Fichier partagé (déduplication par contenu)
+        related_name='images',
+        on_delete=models.PROTECT,  # Le fichier est supprimé par comptage de références
+        null=True,
+        blank=True
+    )
     description = models.TextField(blank=True)  # Description optionnelle de l'image
     created = models.DateTimeField(auto_now_add=True)  # Date de création automatique
     user_like = models.ManyToManyField(
         settings.AUTH_USER_MODEL,  # Utilisateurs ayant "liké" cette image
+        through='ImageLike',  # Table des "likes" horodatés
         related_name='images_liked',  # Nom de la relation inverse
         blank=True  # Champ optionnel
     )
+    total_likes = models.PositiveIntegerField(default=0)  # Nombre de "likes" dénormalisé (évite un COUNT(*) à chaque affichage)
+    trending_score = models.FloatField(default=0)  # "Likes" pondérés par leur récence (voir images/ranking.py)
+    total_views = models.PositiveIntegerField(default=0)  # Nombre de vues, écrit par lots (voir images/counters.py)
 
     class Meta:
         """
         Métadonnées pour le modèle.
         """
         indexes: list[models.Index] = [
-            models.Index(fields=['-created'])  # Index pour optimiser les requêtes par date de création
+            models.Index(fields=['-created']),  # Index pour optimiser les requêtes par date de création
+            models.Index(fields=['url']),  # Index pour retrouver une image déjà téléchargée depuis la même URL
+            models.Index(fields=['-total_likes']),  # Index pour trier les images les plus aimées
+            models.Index(fields=['-trending_score']),  # Index pour servir les images tendance sans tri
+            models.Index(fields=['-total_views']),  # Index pour servir les images les plus vues sans tri
         ]
         ordering: list[str] = ['-created']  # Trie par défaut : images les plus récentes en premier
 
@@ -55,6 +179,50 @@ class Image(models.Model):
         """
         return reverse('images:detail', args=[self.id, self.slug])  # Retourne l'URL absolue pour cette image
 
+    def get_rendition_url(self, width: int, format: str) -> str:
+        """
+        Retourne l'URL de la version redimensionnée, ou du fichier original si elle n'existe pas encore.
+
+        Utilise `blob.renditions` préchargé avec `prefetch_related('blob__renditions')`.
+        """
+        if self.blob_id:
+            for rendition in self.blob.renditions.all():
+                if rendition.width == width and rendition.format == format:
+                    return rendition.file.url
+        return self.image.url if self.image else ''
+
+    @property
+    def is_ready(self) -> bool:
+        """
+        Indique si le fichier de l'image est disponible.
+        """
+        return self.status == self.Status.READY
+
+
+class ImageLike(models.Model):
+    """
+    "Like" d'une image par un utilisateur (table intermédiaire de `Image.user_like`).
+
+    La date du "like" donne son poids actuel dans le score tendance, retiré lorsque le
+    "like" est annulé (voir images/ranking.py).
+    """
+    image = models.ForeignKey(Image, on_delete=models.CASCADE)  # Image aimée
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)  # Utilisateur qui l'aime
+    created = models.DateTimeField(auto_now_add=True)  # Date du "like"
+
+    class Meta:
+        """
+        Métadonnées pour le modèle.
+        """
+        db_table: str = 'images_image_user_like'  # Table créée à l'origine par le ManyToManyField
+        unique_together: list[tuple[str, str]] = [('image', 'user')]  # Un seul "like" par utilisateur
+
+    def __str__(self) -> str:
+        """
+        Retourne une représentation sous forme de chaîne de caractères pour l'objet.
+        """
+        return f'{self.user} likes {self.image}'
+
 """
 ### Changements et annotations ajoutées :
 
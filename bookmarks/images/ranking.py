@@ -0,0 +1,109 @@
+"""
+Classements des images : images tendance et images les plus vues.
+
+Chaque "like" ajoute 1 au score de l'image ; la mise à jour est faite dans la
+transaction du "like", le classement n'est donc jamais recalculé à la lecture. La
+commande `decay_trending` multiplie périodiquement tous les scores par un facteur
+de décroissance exponentielle, si bien qu'un "like" ancien pèse de moins en moins.
+Un retrait de "like" ne retire que le poids restant de ce "like", calculé d'après
+sa date (`like_weight`), et non 1 : les "likes" récents gardent leur poids. L'index sur `-trending_score`
+sert les N premières images sans tri, quel que soit le nombre d'images.
+"""
+
+from datetime import datetime  # Date d'un "like"
+
+from django.conf import settings  # Accès aux paramètres du projet (ex. IMAGES_TRENDING_HALF_LIFE)
+from django.core.cache import cache  # Cache du classement pour les lectures fréquentes
+from django.db.models import Case, F, QuerySet, Value, When  # Expressions pour mettre à jour un champ côté base de données
+from django.utils import timezone  # Date courante
+
+from .models import Image  # Importation du modèle Image
+
+
+CACHE_KEY = 'images:trending:{count}'
+MOST_VIEWED_CACHE_KEY = 'images:most-viewed:{count}'
+
+
+def trending_score_delta(delta: float) -> Case:
+    """
+    Expression de mise à jour du score lorsqu'un "like" est ajouté (+1) ou retiré
+    (moins le poids restant du "like", voir `like_weight`).
+
+    Un score devenu négligeable est remis à zéro, comme par `decay_trending_scores`.
+    """
+    return Case(
+        When(trending_score__lt=settings.IMAGES_TRENDING_MIN_SCORE - delta, then=Value(0.0)),
+        default=F('trending_score') + delta
+    )
+
+
+def like_weight(liked_at: datetime) -> float:
+    """
+    Poids restant dans le score d'un "like" donné à la date `liked_at`, après la
+    décroissance appliquée depuis par `decay_trending`.
+    """
+    return decay_factor(max((timezone.now() - liked_at).total_seconds(), 0.0))
+
+
+def trending_images(count: int = 10) -> list[Image]:
+    """
+    Retourne les `count` images les plus tendance.
+
+    Le résultat est mis en cache `IMAGES_TRENDING_CACHE_TIMEOUT` secondes.
+    """
+    key = CACHE_KEY.format(count=count)
+    images = cache.get(key)
+    if images is None:
+        images = list(trending_queryset()[:count])
+        cache.set(key, images, settings.IMAGES_TRENDING_CACHE_TIMEOUT)
+    return images
+
+
+def trending_queryset() -> QuerySet[Image]:
+    """
+    Images classées par score tendance, lues dans l'ordre de l'index sans tri.
+    """
+    return Image.objects.filter(
+        status=Image.Status.READY,
+        trending_score__gt=0
+    ).order_by('-trending_score')
+
+
+def most_viewed_images(count: int = 10) -> list[Image]:
+    """
+    Retourne les `count` images les plus vues, mises en cache comme le classement tendance.
+
+    Les vues sont écrites par lots (voir images/counters.py), en général
+    `IMAGES_VIEW_FLUSH_INTERVAL` secondes après la première vue en attente, puis le
+    classement peut rester en cache `IMAGES_TRENDING_CACHE_TIMEOUT` secondes.
+    """
+    key = MOST_VIEWED_CACHE_KEY.format(count=count)
+    images = cache.get(key)
+    if images is None:
+        images = list(Image.objects.filter(
+            status=Image.Status.READY,
+            total_views__gt=0
+        ).order_by('-total_views')[:count])
+        cache.set(key, images, settings.IMAGES_TRENDING_CACHE_TIMEOUT)
+    return images
+
+
+def decay_factor(elapsed: float) -> float:
+    """
+    Facteur de décroissance après `elapsed` secondes : le score est divisé par deux
+    toutes les `IMAGES_TRENDING_HALF_LIFE` secondes.
+    """
+    return 0.5 ** (elapsed / settings.IMAGES_TRENDING_HALF_LIFE)
+
+
+def decay_trending_scores(elapsed: float) -> int:
+    """
+    Applique la décroissance aux scores non nuls et remet à zéro les scores négligeables.
+
+    Retourne le nombre d'images mises à jour.
+    """
+    active = Image.objects.filter(trending_score__gt=0)
+    updated = active.update(trending_score=F('trending_score') * decay_factor(elapsed))
+    # Les scores négligeables sortent de l'index actif
+    active.filter(trending_score__lt=settings.IMAGES_TRENDING_MIN_SCORE).update(trending_score=0)
+    return updated
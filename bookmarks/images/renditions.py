@@ -0,0 +1,69 @@
+import os  # Manipulation du nom des fichiers
+from io import BytesIO  # Tampon mémoire pour encoder une version redimensionnée
+
+from django.conf import settings  # Accès aux paramètres du projet (ex. IMAGES_RENDITION_WIDTHS)
+from django.core.files.base import ContentFile  # Utilisé pour traiter le contenu binaire des fichiers
+from django.db import IntegrityError, transaction  # Gestion des workers concurrents
+from PIL import Image as PILImage, ImageOps  # Décodage et redimensionnement des images
+
+from .cache import bump_detail_version  # Invalidation du cache de la page de détail
+from .models import ImageBlob, ImageRendition  # Importation des modèles
+
+# Extension des fichiers pour chaque format de sortie
+EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg'}
+
+
+def generate_renditions(blob_id: int) -> None:
+    """
+    Génère les versions redimensionnées manquantes d'un fichier partagé.
+
+    L'image source est décodée une seule fois pour toutes les tailles et tous les formats
+    définis par `IMAGES_RENDITION_WIDTHS` et `IMAGES_RENDITION_FORMATS`.
+    """
+    try:
+        blob = ImageBlob.objects.get(pk=blob_id)
+    except ImageBlob.DoesNotExist:
+        return  # Fichier supprimé entre-temps
+
+    existing = set(blob.renditions.values_list('width', 'format'))
+    missing = [
+        (width, format)
+        for width in settings.IMAGES_RENDITION_WIDTHS
+        for format in settings.IMAGES_RENDITION_FORMATS
+        if (width, format) not in existing
+    ]
+    if not missing:
+        return
+
+    with blob.file.open('rb') as f:
+        source = PILImage.open(f)
+        # Décodage réduit des JPEG : inutile de décoder plus de pixels que la plus grande version
+        largest = max(width for width, _ in missing)
+        source.draft('RGB', (largest, round(source.height * largest / source.width)))
+        source = ImageOps.exif_transpose(source).convert('RGB')
+
+    base_name = os.path.splitext(os.path.basename(blob.file.name))[0]
+    for width, format in missing:
+        resized = source
+        if source.width > width:
+            height = round(source.height * width / source.width)
+            resized = source.resize((width, height), PILImage.LANCZOS)
+        buffer = BytesIO()
+        resized.save(buffer, format=format.upper(), quality=settings.IMAGES_RENDITION_QUALITY)
+
+        rendition = ImageRendition(blob=blob, width=width, height=resized.height, format=format)
+        rendition.file.save(
+            f'{base_name}-{width}w.{EXTENSIONS[format]}',
+            ContentFile(buffer.getvalue()),
+            save=False
+        )
+        try:
+            with transaction.atomic():
+                rendition.save()
+        except IntegrityError:
+            # Un autre worker a généré la même version
+            rendition.file.delete(save=False)
+
+    # Les pages en cache pointent encore vers le fichier original
+    for image_id in blob.images.values_list('id', flat=True):
+        bump_detail_version(image_id)
@@ -0,0 +1,307 @@
+"""
+Recherche plein texte sur le titre et la description des images.
+
+Un index inversé évite de parcourir toute la table avec `LIKE '%...%'` :
+
+- SQLite : table virtuelle FTS5 `images_image_fts` (rowid = id de l'image), classée par BM25 ;
+- PostgreSQL : table `images_image_search` avec une colonne `tsvector` indexée par GIN,
+  classée par `ts_rank_cd` ;
+- autres bases (ou SQLite sans FTS5) : filtre `icontains`, sans index, trié par date.
+
+Les trois moteurs exposent la même API ; l'index est tenu à jour par les signaux de
+`Image` (voir images/signals.py) et reconstruit par `manage.py rebuild_search_index`.
+"""
+import re  # Découpage de la saisie en mots
+from abc import ABC, abstractmethod  # Méthodes que chaque moteur doit fournir
+from functools import reduce  # Combinaison des filtres `icontains`
+from operator import and_  # Tous les mots doivent être présents
+from typing import Iterable, Optional  # Typage des collections
+
+from django.db import connection  # Connexion à la base par défaut
+from django.db.models import Q, QuerySet  # Filtres de repli
+from django.db.models.expressions import RawSQL  # Sous-requête sur l'index
+
+from .models import Image  # Importation du modèle Image
+
+FTS_TABLE = 'images_image_fts'  # Table virtuelle FTS5 (SQLite)
+SEARCH_TABLE = 'images_image_search'  # Table des documents tsvector (PostgreSQL)
+BATCH_SIZE = 1000  # Images indexées par requête lors d'une reconstruction
+
+
+def parse_terms(query: str) -> list[str]:
+    """
+    Extrait les mots de la saisie ; la ponctuation et les opérateurs sont ignorés.
+    """
+    return re.findall(r'\w+', query.lower())
+
+
+class SearchBackend(ABC):
+    """
+    API commune des moteurs de recherche.
+
+    `filter`, `search_ids` et `count` sont abstraites : un moteur incomplet échoue dès son
+    instanciation. L'indexation ne fait rien par défaut (moteur sans index).
+    """
+    def index(self, images: Iterable[Image]) -> None:
+        """
+        Ajoute ou remplace les documents des images dans l'index.
+        """
+
+    def remove(self, ids: Iterable[int]) -> None:
+        """
+        Retire des images de l'index.
+        """
+
+    def rebuild(self) -> int:
+        """
+        Reconstruit l'index à partir de la table des images et retourne le nombre d'images indexées.
+        """
+        self.clear()
+        total = 0
+        images = Image.objects.order_by().only('id', 'title', 'description')
+        batch = []
+        for image in images.iterator(chunk_size=BATCH_SIZE):
+            batch.append(image)
+            if len(batch) == BATCH_SIZE:
+                self.index(batch)
+                total += len(batch)
+                batch = []
+        self.index(batch)
+        return total + len(batch)
+
+    def clear(self) -> None:
+        """
+        Vide l'index.
+        """
+
+    @abstractmethod
+    def filter(self, queryset: QuerySet[Image], query: str) -> QuerySet[Image]:
+        """
+        Restreint le QuerySet aux images qui contiennent tous les mots de la recherche.
+        """
+
+    @abstractmethod
+    def search_ids(self, query: str, offset: int, limit: int, scope: Optional[QuerySet[Image]] = None) -> list[int]:
+        """
+        Retourne une page d'identifiants, du plus pertinent au moins pertinent,
+        limitée aux images de `scope` s'il est donné.
+        """
+
+    @abstractmethod
+    def count(self, query: str, scope: Optional[QuerySet[Image]] = None) -> int:
+        """
+        Retourne le nombre d'images qui correspondent à la recherche, limitées à `scope` s'il est donné.
+        """
+
+    def scope_sql(self, column: str, scope: Optional[QuerySet[Image]]) -> tuple[str, list]:
+        """
+        Condition SQL restreignant `column` aux identifiants de `scope` (ex. images prêtes).
+        """
+        if scope is None or not scope.query.has_filters():
+            return '', []
+        sql, params = scope.order_by().values('pk').query.sql_with_params()
+        return f' AND {column} IN ({sql})', list(params)
+
+
+class SQLiteFTS5Backend(SearchBackend):
+    """
+    Index FTS5 de SQLite, classé par BM25 avec un poids plus fort pour le titre.
+    """
+    def match(self, query: str) -> str:
+        # Chaque mot est cité (aucun opérateur FTS5 possible) et cherché comme préfixe
+        return ' '.join(f'"{term}"*' for term in parse_terms(query))
+
+    def index(self, images: Iterable[Image]) -> None:
+        rows = [(image.id, image.title, image.description) for image in images]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(row[0],) for row in rows])
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, description) VALUES (%s, %s, %s)',
+                rows
+            )
+
+    def remove(self, ids: Iterable[int]) -> None:
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(pk,) for pk in ids])
+
+    def clear(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+
+    def filter(self, queryset: QuerySet[Image], query: str) -> QuerySet[Image]:
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [self.match(query)]
+        ))
+
+    def search_ids(self, query: str, offset: int, limit: int, scope: Optional[QuerySet[Image]] = None) -> list[int]:
+        condition, params = self.scope_sql('rowid', scope)
+        with connection.cursor() as cursor:
+            # bm25() : plus la valeur est petite, plus le document est pertinent
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s{condition} '
+                f'ORDER BY bm25({FTS_TABLE}, 10.0, 1.0), rowid DESC LIMIT %s OFFSET %s',
+                [self.match(query), *params, limit, offset]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def count(self, query: str, scope: Optional[QuerySet[Image]] = None) -> int:
+        condition, params = self.scope_sql('rowid', scope)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT COUNT(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s{condition}',
+                [self.match(query), *params]
+            )
+            return cursor.fetchone()[0]
+
+
+class PostgresBackend(SearchBackend):
+    """
+    Documents `tsvector` de PostgreSQL indexés par GIN, le titre pesant plus que la description.
+    """
+    DOCUMENT = "setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'B')"
+
+    def tsquery(self, query: str) -> str:
+        # Tous les mots, chacun comme préfixe
+        return ' & '.join(f'{term}:*' for term in parse_terms(query))
+
+    def index(self, images: Iterable[Image]) -> None:
+        rows = [(image.id, image.title, image.description) for image in images]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {SEARCH_TABLE} (image_id, document) VALUES (%s, {self.DOCUMENT}) '
+                f'ON CONFLICT (image_id) DO UPDATE SET document = EXCLUDED.document',
+                rows
+            )
+
+    def remove(self, ids: Iterable[int]) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE image_id = ANY(%s)', [list(ids)])
+
+    def clear(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE {SEARCH_TABLE}')
+
+    def filter(self, queryset: QuerySet[Image], query: str) -> QuerySet[Image]:
+        return queryset.filter(pk__in=RawSQL(
+            f"SELECT image_id FROM {SEARCH_TABLE} WHERE document @@ to_tsquery('simple', %s)",
+            [self.tsquery(query)]
+        ))
+
+    def search_ids(self, query: str, offset: int, limit: int, scope: Optional[QuerySet[Image]] = None) -> list[int]:
+        condition, params = self.scope_sql('image_id', scope)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT image_id FROM {SEARCH_TABLE}, to_tsquery('simple', %s) query "
+                f'WHERE document @@ query{condition} ORDER BY ts_rank_cd(document, query) DESC, image_id DESC '
+                f'LIMIT %s OFFSET %s',
+                [self.tsquery(query), *params, limit, offset]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def count(self, query: str, scope: Optional[QuerySet[Image]] = None) -> int:
+        condition, params = self.scope_sql('image_id', scope)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT COUNT(*) FROM {SEARCH_TABLE} WHERE document @@ to_tsquery('simple', %s){condition}",
+                [self.tsquery(query), *params]
+            )
+            return cursor.fetchone()[0]
+
+
+class ScanBackend(SearchBackend):
+    """
+    Repli sans index : filtre `icontains` sur chaque mot, résultats triés par date.
+    """
+    def matching(self, queryset: QuerySet[Image], query: str) -> QuerySet[Image]:
+        terms = parse_terms(query)
+        return queryset.filter(reduce(and_, [
+            Q(title__icontains=term) | Q(description__icontains=term) for term in terms
+        ], Q()))
+
+    def rebuild(self) -> int:
+        return 0  # Rien à indexer
+
+    def filter(self, queryset: QuerySet[Image], query: str) -> QuerySet[Image]:
+        return self.matching(queryset, query)
+
+    def search_ids(self, query: str, offset: int, limit: int, scope: Optional[QuerySet[Image]] = None) -> list[int]:
+        images = self.matching(Image.objects.all() if scope is None else scope, query).order_by('-created', '-id')
+        return list(images.values_list('pk', flat=True)[offset:offset + limit])
+
+    def count(self, query: str, scope: Optional[QuerySet[Image]] = None) -> int:
+        return self.matching(Image.objects.all() if scope is None else scope, query).count()
+
+
+_backend: Optional[SearchBackend] = None
+
+
+def get_backend() -> SearchBackend:
+    """
+    Retourne le moteur adapté à la base de données, selon les tables créées par la migration.
+    """
+    global _backend
+    if _backend is None:
+        tables = connection.introspection.table_names()
+        if connection.vendor == 'sqlite' and FTS_TABLE in tables:
+            _backend = SQLiteFTS5Backend()
+        elif connection.vendor == 'postgresql' and SEARCH_TABLE in tables:
+            _backend = PostgresBackend()
+        else:
+            _backend = ScanBackend()
+    return _backend
+
+
+class SearchResults:
+    """
+    Séquence paresseuse des images trouvées, utilisable par `Paginator` :
+    seule la page demandée est lue dans l'index puis chargée depuis la table des images.
+
+    Les filtres du QuerySet (ex. `status=READY`) s'appliquent aussi dans l'index : le
+    nombre de résultats et les pages ne comptent que les images du QuerySet.
+    """
+    def __init__(self, query: str, queryset: QuerySet[Image]) -> None:
+        self.query = query
+        self.queryset = queryset
+        self.backend = get_backend()
+
+    def count(self) -> int:
+        return self.backend.count(self.query, self.queryset) if parse_terms(self.query) else 0
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __getitem__(self, page: slice) -> list[Image]:
+        if not parse_terms(self.query):
+            return []
+        ids = self.backend.search_ids(self.query, page.start or 0, page.stop - (page.start or 0), self.queryset)
+        images = self.queryset.in_bulk(ids)
+        # Conserve l'ordre de pertinence de l'index
+        return [images[pk] for pk in ids if pk in images]
+
+
+def index_images(images: Iterable[Image]) -> None:
+    get_backend().index(images)
+
+
+def remove_images(ids: Iterable[int]) -> None:
+    get_backend().remove(ids)
+
+
+def filter_images(queryset: QuerySet[Image], query: str) -> QuerySet[Image]:
+    """
+    Restreint un QuerySet aux images correspondant à la recherche (administration).
+    """
+    if not parse_terms(query):
+        return queryset.none()
+    return get_backend().filter(queryset, query)
+
+
+def search_images(query: str, queryset: Optional[QuerySet[Image]] = None) -> SearchResults:
+    """
+    Retourne les images correspondant à la recherche, triées par pertinence.
+    """
+    return SearchResults(query, Image.objects.all() if queryset is None else queryset)
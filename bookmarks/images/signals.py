@@ -0,0 +1,65 @@
+from django.conf import settings  # Modèle utilisateur du projet
+from django.db import transaction  # Invalidation différée après le commit
+from django.db.models import F  # Expressions évaluées côté base de données
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete  # Signaux des modèles
+from django.dispatch import Signal, receiver  # Signal personnalisé et décorateur de connexion
+
+from .cache import bump_detail_version  # Invalidation du cache de la page de détail
+from .models import Image, ImageLike  # Importation des modèles Image et ImageLike
+from .ranking import like_weight, trending_score_delta  # Poids restant d'un "like" dans le classement
+from .search import index_images, remove_images  # Index plein texte
+from .tasks import release_blob  # Comptage de références des fichiers partagés
+
+# Envoyé par la vue `image_like` lorsqu'un "like" est réellement ajouté (delta=1) ou retiré (delta=-1).
+# Arguments : image, user, delta
+image_liked = Signal()
+
+
+@receiver(post_delete, sender=Image)
+def image_deleted(sender: type[Image], instance: Image, **kwargs) -> None:
+    """
+    Libère le fichier partagé d'une image supprimée et la retire de l'index de recherche.
+    """
+    remove_images([instance.pk])
+    if instance.blob_id:
+        release_blob(instance.blob_id)
+
+
+@receiver(post_save, sender=Image)
+def image_saved(sender: type[Image], instance: Image, update_fields=None, **kwargs) -> None:
+    """
+    Invalide le cache de la page de détail d'une image modifiée et met à jour l'index de recherche.
+
+    La version n'est augmentée qu'après le commit : une requête concurrente qui lirait la
+    nouvelle version avant le commit mettrait en cache l'ancienne page sous la nouvelle clé.
+    """
+    transaction.on_commit(lambda: bump_detail_version(instance.pk))
+    # Les sauvegardes partielles qui ne touchent pas au texte (téléchargement, ...) ne réindexent pas
+    if update_fields is None or {'title', 'description'} & set(update_fields):
+        index_images([instance])
+
+
+@receiver(m2m_changed, sender=Image.user_like.through)
+def user_like_changed(sender, instance, action: str, **kwargs) -> None:
+    """
+    Invalide le cache de la page de détail lorsque les "likes" d'une image changent (après le commit).
+    """
+    if action in ('post_add', 'post_remove', 'post_clear') and isinstance(instance, Image):
+        transaction.on_commit(lambda: bump_detail_version(instance.pk))
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def user_deleted(sender, instance, **kwargs) -> None:
+    """
+    Retire des compteurs les "likes" d'un utilisateur supprimé.
+
+    Les lignes ImageLike sont supprimées en cascade sans `m2m_changed` ni `image_liked` :
+    `total_likes` et `trending_score` sont donc décrémentés ici, avant la suppression.
+    """
+    for image_id, liked_at in ImageLike.objects.filter(user=instance).values_list('image_id', 'created'):
+        # Seul le poids restant de chaque "like" est retiré du score, comme pour un retrait de "like"
+        Image.objects.filter(pk=image_id).update(
+            total_likes=F('total_likes') - 1,
+            trending_score=trending_score_delta(-like_weight(liked_at))
+        )
+        transaction.on_commit(lambda image_id=image_id: bump_detail_version(image_id))
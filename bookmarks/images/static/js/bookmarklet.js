@@ -1,5 +1,6 @@
-const siteUrl = '//mysite.com:8000/';
-const styleUrl = siteUrl + '/static/css/bookmarklet.css';
+// Versioned URLs set by the loader (images.views.bookmarklet_loader)
+const siteUrl = window.bookmarkletConfig.siteUrl;
+const styleUrl = window.bookmarkletConfig.styleUrl;
 const minWidth = 300;
 const minHeight = 300;
 
@@ -8,7 +9,7 @@ const head = document.getElementsByTagName('head')[0];
 const link = document.createElement('link');
 link.rel = 'stylesheet';
 link.type = 'text/css';
-link.href = styleUrl + '?r=' + Math.floor(Math.random()*9999999999999999);
+link.href = styleUrl;
 head.appendChild(link);
 
 // Load HTML
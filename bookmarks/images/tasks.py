@@ -0,0 +1,224 @@
+import asyncio  # Téléchargements planifiés sur la boucle d'événements (ASGI)
+import hashlib  # Empreinte SHA-256 du contenu téléchargé
+import logging  # Journalisation des erreurs de téléchargement
+import weakref  # Un sémaphore par boucle d'événements
+from typing import IO, Optional  # Typage du fichier temporaire
+
+from asgiref.sync import sync_to_async  # Accès à la base et traitement d'image hors de la boucle
+from django.conf import settings  # Accès aux paramètres du projet (ex. IMAGES_ASYNC_MAX_FETCHES)
+from django.core.files import File  # Enveloppe le fichier temporaire pour le stockage
+from django.db import IntegrityError, transaction  # Gestion des accès concurrents aux fichiers partagés
+from django.db.models import F  # Mise à jour atomique du compteur de références
+from django.utils.text import slugify  # Convertit les chaînes de caractères en un format "slugifié"
+from PIL import Image as PILImage, UnidentifiedImageError  # Validation du contenu téléchargé
+
+from bookmarks.tasks import run_in_background  # Pool de workers locaux
+
+from .fetch import ImageFetchError, afetch_to_tempfile, fetch_to_tempfile  # Téléchargement en streaming
+from .metadata import ImageMetadata, extract_metadata  # Métadonnées extraites à l'import
+from .models import Image, ImageBlob  # Importation des modèles
+from .renditions import generate_renditions  # Versions redimensionnées générées à l'import
+
+logger = logging.getLogger(__name__)
+
+# Téléchargements asynchrones en cours, gardés en référence jusqu'à leur fin
+_running_ingests: set[asyncio.Task] = set()
+_fetch_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def enqueue_image_ingest(image: Image) -> None:
+    """
+    Planifie le téléchargement d'une image en attente dans le pool de workers.
+
+    Comme sous ASGI, un téléchargement perdu au redémarrage est replanifié par
+    `manage.py requeue_pending_images`.
+    """
+    run_in_background(ingest_image, image.pk)
+
+
+def schedule_image_ingest(image: Image) -> asyncio.Task:
+    """
+    Planifie le téléchargement d'une image en attente sur la boucle d'événements courante (ASGI).
+
+    L'image doit déjà être enregistrée : la tâche démarre sans attendre de transaction.
+    La tâche n'existe qu'en mémoire : si le serveur s'arrête avant sa fin, l'image reste
+    en attente jusqu'au passage de `manage.py requeue_pending_images`. Le client httpx
+    utilisé ne réessaie que les échecs de connexion et n'alimente pas `pool_stats()`
+    (voir bookmarks/http.py).
+    """
+    task = asyncio.get_running_loop().create_task(_run_ingest(image.pk))
+    _running_ingests.add(task)
+    task.add_done_callback(_running_ingests.discard)
+    return task
+
+
+async def _run_ingest(image_id: int) -> None:
+    try:
+        await aingest_image(image_id)
+    except Exception:
+        logger.exception('Could not ingest image %s', image_id)
+
+
+def _get_fetch_slots() -> asyncio.Semaphore:
+    """
+    Retourne le sémaphore qui limite les téléchargements simultanés de la boucle courante.
+    """
+    loop = asyncio.get_running_loop()
+    if loop not in _fetch_slots:
+        _fetch_slots[loop] = asyncio.Semaphore(settings.IMAGES_ASYNC_MAX_FETCHES)
+    return _fetch_slots[loop]
+
+
+def _get_pending(image_id: int) -> tuple[Optional[Image], Optional[ImageBlob]]:
+    """
+    Retourne l'image en attente et, s'il existe, le fichier déjà téléchargé depuis la même URL.
+    """
+    try:
+        image = Image.objects.get(pk=image_id, status=Image.Status.PENDING)
+    except Image.DoesNotExist:
+        return None, None  # Image supprimée ou déjà traitée
+    source = Image.objects.filter(
+        url=image.url,
+        status=Image.Status.READY,
+        blob__isnull=False
+    ).select_related('blob').first()
+    return image, source.blob if source else None
+
+
+def ingest_image(image_id: int) -> None:
+    """
+    Télécharge, valide et attache le fichier distant d'une image en attente.
+    """
+    image, blob = _get_pending(image_id)
+    # Une image déjà téléchargée depuis la même URL évite un nouveau téléchargement
+    if image is None or (blob and _attach_blob(image, blob)):
+        return
+
+    try:
+        temp_file = fetch_to_tempfile(image.url)
+    except ImageFetchError as exc:
+        _mark_failed(image, exc)
+        return
+    _store_download(image, temp_file)
+
+
+async def aingest_image(image_id: int) -> None:
+    """
+    Variante asynchrone de `ingest_image` : le téléchargement n'occupe aucun thread,
+    seuls l'accès à la base et la validation du fichier passent par `sync_to_async`.
+    """
+    image, blob = await sync_to_async(_get_pending)(image_id)
+    if image is None or (blob and await sync_to_async(_attach_blob)(image, blob)):
+        return
+
+    try:
+        async with _get_fetch_slots():
+            temp_file = await afetch_to_tempfile(image.url)
+    except ImageFetchError as exc:
+        await sync_to_async(_mark_failed)(image, exc)
+        return
+    await sync_to_async(_store_download)(image, temp_file)
+
+
+def _store_download(image: Image, temp_file: IO[bytes]) -> None:
+    """
+    Valide le fichier téléchargé, le stocke (ou réutilise un contenu identique) et l'attache à l'image.
+    """
+    with temp_file:
+        try:
+            # Vérifie que le contenu est bien une image lisible par Pillow
+            PILImage.open(temp_file).verify()
+        except (UnidentifiedImageError, OSError, SyntaxError) as exc:
+            _mark_failed(image, exc)
+            return
+
+        try:
+            # Dimensions, format, couleur dominante et hachage perceptuel, calculés une seule fois
+            metadata = extract_metadata(temp_file)
+        except (OSError, ValueError) as exc:
+            _mark_failed(image, exc)
+            return
+
+        # Nom du fichier basé sur le titre et l'extension de l'URL
+        extension = image.url.rsplit('.', 1)[1].lower()
+        image_name = f'{slugify(image.title)}.{extension}'
+        # Un contenu identique déjà stocké est partagé plutôt que copié
+        while not _attach_blob(image, _store_blob(temp_file, image_name, metadata)):
+            pass
+
+
+def _sha256(temp_file: IO[bytes]) -> tuple[str, int]:
+    """
+    Calcule l'empreinte et la taille du fichier en le lisant par morceaux.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    temp_file.seek(0)
+    for chunk in iter(lambda: temp_file.read(64 * 1024), b''):
+        digest.update(chunk)
+        size += len(chunk)
+    temp_file.seek(0)
+    return digest.hexdigest(), size
+
+
+def _store_blob(temp_file: IO[bytes], name: str, metadata: ImageMetadata) -> ImageBlob:
+    """
+    Retourne le fichier partagé correspondant au contenu, en le stockant s'il est nouveau.
+    """
+    digest, size = _sha256(temp_file)
+    blob = ImageBlob.objects.filter(sha256=digest).first()
+    if blob:
+        return blob
+    blob = ImageBlob(sha256=digest, size=size, **metadata._asdict())
+    # Le stockage copie le fichier temporaire par morceaux
+    blob.file.save(name, File(temp_file), save=False)
+    try:
+        with transaction.atomic():
+            blob.save()
+    except IntegrityError:
+        # Un autre worker a stocké le même contenu entre-temps
+        blob.file.delete(save=False)
+        blob = ImageBlob.objects.get(sha256=digest)
+    return blob
+
+
+def _attach_blob(image: Image, blob: ImageBlob) -> bool:
+    """
+    Associe le fichier partagé à l'image et marque l'image comme prête.
+
+    Retourne False si le fichier partagé a été supprimé entre-temps.
+    """
+    with transaction.atomic():
+        taken = ImageBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+        if not taken:
+            return False
+        image.blob = blob
+        image.image.name = blob.file.name
+        image.status = Image.Status.READY
+        image.save(update_fields=['blob', 'image', 'status'])
+    if not blob.renditions.exists():
+        # Les miniatures sont générées par un worker, jamais pendant l'affichage
+        run_in_background(generate_renditions, blob.pk)
+    return True
+
+
+def release_blob(blob_id: int) -> None:
+    """
+    Décrémente le compteur de références et supprime le fichier partagé qui n'est plus utilisé.
+    """
+    with transaction.atomic():
+        ImageBlob.objects.filter(pk=blob_id).update(ref_count=F('ref_count') - 1)
+        blob = ImageBlob.objects.filter(pk=blob_id, ref_count=0).first()
+        if not blob:
+            return
+        names = [blob.file.name]
+        names += [rendition.file.name for rendition in blob.renditions.all()]
+        # La suppression conditionnelle ignore un fichier repris entre-temps par un autre worker
+        if ImageBlob.objects.filter(pk=blob_id, ref_count=0).delete()[0]:
+            transaction.on_commit(lambda: [blob.file.storage.delete(name) for name in names])
+
+
+def _mark_failed(image: Image, exc: Exception) -> None:
+    logger.warning('Could not ingest image %s from %s: %s', image.pk, image.url, exc)
+    image.status = Image.Status.FAILED
+    image.save(update_fields=['status'])
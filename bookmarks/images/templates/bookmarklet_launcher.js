@@ -1,7 +1,7 @@
 (function(){
     if(!window.bookmarklet) {
       bookmarklet_js = document.body.appendChild(document.createElement('script'));
-      bookmarklet_js.src = '//mysite.com:8000/static/js/bookmarklet.js?r='+Math.floor(Math.random()*9999999999999999);
+      bookmarklet_js.src = '//{{ request.get_host }}{% url "images:bookmarklet" %}';
       window.bookmarklet = true;
     }
     else {
@@ -0,0 +1,8 @@
+window.bookmarkletConfig = {
+    siteUrl: '{{ site_url|escapejs }}',
+    styleUrl: '{{ style_url|escapejs }}'
+};
+(function(){
+    var bookmarklet_js = document.body.appendChild(document.createElement('script'));
+    bookmarklet_js.src = '{{ script_url|escapejs }}';
+})();
@@ -0,0 +1,26 @@
+from django import template  # Bibliothèque de tags de templates
+from django.utils.html import format_html  # Attributs HTML échappés
+
+from ..models import Image  # Importation du modèle Image
+
+register = template.Library()
+
+
+@register.simple_tag
+def rendition_url(image: Image, width: int, format: str = 'jpeg') -> str:
+    """
+    Retourne l'URL de la version redimensionnée d'une image, sans jamais redimensionner pendant la requête.
+    """
+    return image.get_rendition_url(width, format)
+
+
+@register.simple_tag
+def rendition_size(image: Image, width: int) -> str:
+    """
+    Retourne les attributs `width` et `height` de la version redimensionnée, lus dans les
+    métadonnées enregistrées à l'import : le navigateur réserve la place sans ouvrir le fichier.
+    """
+    size = image.blob.rendition_size(width) if image.blob_id else None
+    if not size:
+        return ''
+    return format_html('width="{}" height="{}"', *size)
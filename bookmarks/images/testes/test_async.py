@@ -0,0 +1,64 @@
+import asyncio
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from images.fetch import ImageTooLarge, afetch_to_tempfile
+from images.models import Image
+from images.tasks import _running_ingests
+
+from .test_ingest import make_png
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def mock_client(content: bytes) -> httpx.AsyncClient:
+    """Build an async client answering every request with `content`."""
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=content))
+    return httpx.AsyncClient(transport=transport)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, BACKGROUND_WORKERS=0)
+class AsyncViewsTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+
+    async def test_asgi_create_downloads_on_event_loop(self):
+        """Under ASGI the download runs as a task of the event loop."""
+        await self.async_client.aforce_login(self.user)
+        data = {'title': 'Red square', 'url': 'http://example.com/red.png', 'description': ''}
+        with patch('images.fetch.get_async_client', return_value=mock_client(make_png())):
+            response = await self.async_client.post(reverse('images:image_create'), data)
+            self.assertEqual(response.status_code, 302)
+            await asyncio.gather(*_running_ingests)
+        image = await Image.objects.aget()
+        self.assertEqual(image.status, Image.Status.READY)
+
+    async def test_asgi_like_toggles(self):
+        await self.async_client.aforce_login(self.user)
+        image = await Image.objects.acreate(user=self.user, title='Red', url='http://example.com/red.png')
+        response = await self.async_client.post(reverse('images:like'), {'id': image.id, 'action': 'like'})
+        self.assertEqual(response.json(), {'status': 'ok', 'liked': True, 'total_likes': 1})
+        self.assertTrue(await image.user_like.filter(pk=self.user.pk).aexists())
+
+    async def test_asgi_views_require_login(self):
+        response = await self.async_client.post(reverse('images:like'), {'id': 1, 'action': 'like'})
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('/login/', response.url)
+
+    @override_settings(IMAGES_FETCH_MAX_BYTES=100)
+    async def test_async_fetch_enforces_size_limit(self):
+        with patch('images.fetch.get_async_client', return_value=mock_client(make_png((100, 100)))):
+            with self.assertRaises(ImageTooLarge):
+                await afetch_to_tempfile('http://example.com/red.png')
@@ -0,0 +1,61 @@
+import re
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from account.models import Profile
+
+
+class BookmarkletLoaderTests(TestCase):
+    def test_loader_points_to_static_files(self):
+        """The loader is public, short-lived in caches and sets the bookmarklet config."""
+        response = self.client.get(reverse('images:bookmarklet'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/javascript')
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('max-age=300', response['Cache-Control'])
+        content = response.content.decode()
+        self.assertIn("siteUrl: '//testserver/'", content)
+        self.assertRegex(content, r"styleUrl: '//testserver/static/css/bookmarklet\.([0-9a-f]{12}\.)?css'")
+        self.assertRegex(content, r"'//testserver/static/js/bookmarklet\.([0-9a-f]{12}\.)?js'")
+
+    def test_launcher_loads_the_loader(self):
+        """The dashboard link loads the versioned loader instead of a cache-busted script."""
+        user = User.objects.create_user(username='testuser', password='testpassword')
+        Profile.objects.create(user=user)
+        self.client.login(username='testuser', password='testpassword')
+        response = self.client.get(reverse('dashboard'))
+        self.assertContains(response, '//testserver/images/bookmarklet.js')
+        self.assertNotContains(response, 'Math.random')
+
+
+class CollectedStaticTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.enterClassContext(override_settings(STATIC_ROOT=cls.static_root))
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(cls.static_root, ignore_errors=True)
+
+    def test_loader_uses_hashed_names(self):
+        """Once collected, the loader hands out content-hashed URLs."""
+        content = self.client.get(reverse('images:bookmarklet')).content.decode()
+        self.assertRegex(content, r"/static/css/bookmarklet\.[0-9a-f]{12}\.css'")
+        self.assertRegex(content, r"/static/js/bookmarklet\.[0-9a-f]{12}\.js'")
+
+    def test_compressed_variants(self):
+        """collectstatic writes gzip and brotli variants of the hashed files."""
+        content = self.client.get(reverse('images:bookmarklet')).content.decode()
+        name = re.search(r"/static/(js/bookmarklet\.[0-9a-f]{12}\.js)'", content).group(1)
+        for suffix in ('', '.gz', '.br'):
+            with self.subTest(suffix=suffix), open(f'{self.static_root}/{name}{suffix}', 'rb'):
+                pass
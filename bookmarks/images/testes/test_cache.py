@@ -0,0 +1,93 @@
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from images.cache import get_detail_version
+from images.models import Image
+
+
+@override_settings(BACKGROUND_WORKERS=0)
+class ImageDetailCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.image = Image.objects.create(
+            user=self.user,
+            title='Red square',
+            url='http://example.com/red.png',
+            image='images/red.png',
+            status=Image.Status.READY
+        )
+        self.url = self.image.get_absolute_url()
+
+    def test_anonymous_page_is_served_from_cache(self):
+        """A second anonymous visit does not hit the database."""
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(first.content, second.content)
+
+    def test_like_invalidates_cached_page(self):
+        """Changing the likes of an image bumps its cache version."""
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.image.user_like.add(self.user)
+            Image.objects.filter(pk=self.image.pk).update(total_likes=1)
+        response = self.client.get(self.url)
+        self.assertContains(response, '<span class="total">1</span>', html=True)
+
+    def test_saving_image_invalidates_cached_page(self):
+        """Saving the image bumps its cache version."""
+        self.client.get(self.url)
+        self.image.description = 'A brand new description'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.image.save()
+        self.assertContains(self.client.get(self.url), 'A brand new description')
+
+    def test_conditional_request_returns_not_modified(self):
+        """An anonymous request with a matching ETag gets a 304."""
+        response = self.client.get(self.url)
+        self.assertTrue(response.has_header('Last-Modified'))
+        etag = response['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.image.save()
+        response = self.client.get(self.url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_version_is_bumped_after_commit(self):
+        """A page rendered before the writer commits is not cached under the new version."""
+        version = get_detail_version(self.image.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.image.save()
+            self.image.user_like.add(self.user)
+            # Transaction still open: readers keep the current version
+            self.assertEqual(get_detail_version(self.image.pk), version)
+        self.assertEqual(len(callbacks), 2)
+        for callback in callbacks:
+            callback()
+        self.assertGreater(get_detail_version(self.image.pk), version)
+
+    def test_authenticated_pages_are_not_cached(self):
+        """Logged in users get a fresh page without validators."""
+        self.client.login(username='testuser', password='testpassword')
+        response = self.client.get(self.url)
+        self.assertFalse(response.has_header('ETag'))
+        self.assertContains(response, 'data-action="like"')
+
+    @override_settings(IMAGES_DETAIL_VERSION_TIMEOUT=3600)
+    def test_version_keys_expire(self):
+        """Probing unknown ids only creates version keys that expire."""
+        url = reverse('images:detail', args=[self.image.id + 1000, 'missing'])
+        with patch.object(cache, 'add', wraps=cache.add) as add:
+            self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(add.call_args.args[2], 3600)
+        with patch.object(cache, 'set', wraps=cache.set) as set_, self.captureOnCommitCallbacks(execute=True):
+            self.image.save()
+        self.assertIn(3600, [call.args[2] for call in set_.call_args_list])
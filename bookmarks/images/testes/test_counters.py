@@ -0,0 +1,113 @@
+import threading
+import time
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from images import counters
+from images.counters import flush_views, pending_views, record_view
+from images.models import Image
+
+
+@override_settings(BACKGROUND_WORKERS=0, IMAGES_VIEW_FLUSH_INTERVAL=3600)
+class ImageViewCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        counters._buffer.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.images = [
+            Image.objects.create(
+                user=self.user,
+                title=f'Image {i}',
+                url=f'http://example.com/{i}.png',
+                image=f'images/{i}.png',
+                status=Image.Status.READY
+            )
+            for i in range(3)
+        ]
+        self.image = self.images[0]
+
+    def tearDown(self):
+        counters._buffer.clear()
+
+    def test_views_are_buffered_including_cache_hits(self):
+        url = self.image.get_absolute_url()
+        response = self.client.get(url)
+        with self.assertNumQueries(0):
+            self.client.get(url)  # Page servie depuis le cache
+        # Réponse 304 au navigateur qui a déjà la page
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.assertEqual(pending_views(), {self.image.id: 3})
+        self.image.refresh_from_db()
+        self.assertEqual(self.image.total_views, 0)
+
+        self.assertEqual(flush_views(), 3)
+        self.image.refresh_from_db()
+        self.assertEqual(self.image.total_views, 3)
+        self.assertEqual(pending_views(), {})
+
+    def test_flush_groups_updates_by_increment(self):
+        for image, views in zip(self.images, (2, 1, 1)):
+            for _ in range(views):
+                record_view(image.id)
+        with self.assertNumQueries(2):
+            self.assertEqual(flush_views(), 4)
+        self.assertEqual(
+            list(Image.objects.order_by('id').values_list('total_views', flat=True)), [2, 1, 1]
+        )
+
+    @override_settings(IMAGES_VIEW_BUFFER_SIZE=2)
+    def test_full_buffer_schedules_a_flush(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            record_view(self.images[0].id)
+            record_view(self.images[1].id)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(pending_views(), {})
+        self.assertEqual(Image.objects.filter(total_views=1).count(), 2)
+
+    def test_missing_images_are_not_counted(self):
+        url = reverse('images:detail', args=[self.image.id + 1000, 'missing'])
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(pending_views(), {})
+
+    @override_settings(BACKGROUND_WORKERS=1, IMAGES_VIEW_FLUSH_INTERVAL=0.05)
+    def test_timer_flushes_views_without_further_traffic(self):
+        flushed = threading.Event()
+
+        def flush():
+            counters._buffer.clear()
+            flushed.set()
+
+        counters._last_flush = time.monotonic()
+        with patch('images.counters.flush_views', side_effect=flush):
+            record_view(self.image.id)
+            timer = counters._timer
+            self.assertTrue(flushed.wait(5))
+            timer.join(5)
+        # Plus rien en attente : aucun nouveau minuteur
+        self.assertIsNone(counters._timer)
+
+    def test_failed_flush_keeps_the_views(self):
+        record_view(self.image.id)
+        with patch('django.db.models.query.QuerySet.update', side_effect=DatabaseError):
+            self.assertEqual(flush_views(), 0)
+        self.assertEqual(pending_views(), {self.image.id: 1})
+
+    def test_views_counted_against_another_database_are_dropped(self):
+        record_view(self.image.id)
+        # Le lanceur de tests rétablit la base de développement avant l'écriture `atexit`
+        with patch.dict(connection.settings_dict, {'NAME': 'other.sqlite3'}):
+            self.assertEqual(flush_views(), 0)
+        self.assertEqual(pending_views(), {})
+
+    def test_most_viewed_ranking(self):
+        Image.objects.filter(pk=self.images[1].pk).update(total_views=10)
+        Image.objects.filter(pk=self.images[2].pk).update(total_views=5)
+        self.client.login(username='testuser', password='testpassword')
+        response = self.client.get(reverse('images:most_viewed'))
+        self.assertEqual(response.context['images'], [self.images[1], self.images[2]])
+        self.assertContains(response, '10 views')
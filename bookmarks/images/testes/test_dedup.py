@@ -0,0 +1,67 @@
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+
+from images.models import Image, ImageBlob
+from images.tasks import ingest_image
+from images.testes.test_ingest import fake_response, make_png
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, BACKGROUND_WORKERS=0)
+@patch('requests.Session.get')
+class ImageDeduplicationTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+
+    def ingest(self, url):
+        image = Image.objects.create(user=self.user, title='Red square', url=url)
+        ingest_image(image.id)
+        image.refresh_from_db()
+        return image
+
+    def test_repeat_url_skips_download(self, mock_get):
+        """A URL that was already downloaded reuses the stored file."""
+        mock_get.return_value = fake_response(make_png())
+        first = self.ingest('http://example.com/red.png')
+        second = self.ingest('http://example.com/red.png')
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(second.status, Image.Status.READY)
+        self.assertEqual(second.image.name, first.image.name)
+        self.assertEqual(ImageBlob.objects.get().ref_count, 2)
+
+    def test_identical_bytes_share_one_blob(self, mock_get):
+        """Identical content downloaded from two URLs is stored once."""
+        mock_get.side_effect = lambda *args, **kwargs: fake_response(make_png())
+        first = self.ingest('http://example.com/red.png')
+        second = self.ingest('http://cdn.example.com/copy.png')
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(first.blob, second.blob)
+        self.assertEqual(ImageBlob.objects.count(), 1)
+
+    def test_file_is_deleted_with_last_reference(self, mock_get):
+        """The shared file is removed once no image references it."""
+        mock_get.return_value = fake_response(make_png())
+        first = self.ingest('http://example.com/red.png')
+        second = self.ingest('http://example.com/red.png')
+        name = first.image.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(ImageBlob.objects.get().ref_count, 1)
+        self.assertTrue(default_storage.exists(name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(ImageBlob.objects.exists())
+        self.assertFalse(default_storage.exists(name))
@@ -0,0 +1,64 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from account.models import Profile
+from images.models import Image
+
+
+@override_settings(IMAGES_DETAIL_LIKERS=5, BACKGROUND_WORKERS=0)
+class ImageDetailQueryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.image = Image.objects.create(
+            user=self.user,
+            title='Red square',
+            url='http://example.com/red.png',
+            image='images/red.png',
+            status=Image.Status.READY
+        )
+
+    def add_likers(self, count):
+        with self.captureOnCommitCallbacks(execute=True):  # Invalidation du cache après le commit
+            self._add_likers(count)
+
+    def _add_likers(self, count):
+        for i in range(count):
+            liker = User.objects.create_user(username=f'liker{self.image.user_like.count()}')
+            Profile.objects.create(user=liker)
+            self.image.user_like.add(liker)
+        Image.objects.filter(pk=self.image.pk).update(total_likes=self.image.user_like.count())
+
+    def test_query_count_does_not_grow_with_likes(self):
+        """The detail page runs a fixed number of queries whatever the number of likes."""
+        self.client.login(username='testuser', password='testpassword')
+        url = self.image.get_absolute_url()
+        # Warm the session and user caches
+        self.client.get(url)
+        self.add_likers(2)
+        # image, likers with profiles, like state
+        with self.assertNumQueries(3):
+            self.client.get(url)
+        self.add_likers(20)
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(len(response.context['likers']), 5)
+        self.assertEqual(response.context['other_likers'], 17)
+        self.assertContains(response, 'and 17 others')
+
+    def test_like_state_of_current_user(self):
+        """The like button reflects whether the current user liked the image."""
+        self.client.login(username='testuser', password='testpassword')
+        self.assertFalse(self.client.get(self.image.get_absolute_url()).context['is_liked'])
+        self.image.user_like.add(self.user)
+        response = self.client.get(self.image.get_absolute_url())
+        self.assertTrue(response.context['is_liked'])
+        self.assertContains(response, 'data-action="unlike"')
+
+    def test_anonymous_visitor_skips_like_state_query(self):
+        """Anonymous visitors do not trigger the like state query."""
+        self.add_likers(3)
+        # image, likers with profiles
+        with self.assertNumQueries(2):
+            self.client.get(self.image.get_absolute_url())
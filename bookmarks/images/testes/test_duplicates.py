@@ -0,0 +1,84 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from images.duplicates import _neighbours, duplicate_groups, near_duplicates, similar_blobs
+from images.metadata import phash_chunks, to_signed
+from images.models import Image, ImageBlob
+
+BASE = to_signed(0xF0F0_1234_ABCD_8001)
+
+
+def flip(value: int, *bits: int) -> int:
+    """Return the hash with the given bit positions inverted."""
+    for bit in bits:
+        value ^= 1 << bit
+    return to_signed(value & ((1 << 64) - 1))
+
+
+@override_settings(BACKGROUND_WORKERS=0)
+class NearDuplicateTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.login(username='testuser', password='testpassword')
+
+    def create_image(self, phash: int, title: str = 'Picture', blob: ImageBlob = None) -> Image:
+        if blob is None:
+            blob = ImageBlob.objects.create(sha256=f'{phash:x}', file='images/picture.jpg', phash=phash)
+        return Image.objects.create(
+            user=self.user,
+            title=title,
+            url=f'http://example.com/{title}.jpg',
+            status=Image.Status.READY,
+            blob=blob,
+            image=blob.file.name
+        )
+
+    def test_chunks_are_kept_in_sync_with_the_hash(self):
+        blob = ImageBlob.objects.create(sha256='a', file='images/a.jpg', phash=BASE)
+        self.assertEqual(
+            [blob.phash_0, blob.phash_1, blob.phash_2, blob.phash_3],
+            [0xF0F0, 0x1234, 0xABCD, 0x8001]
+        )
+        self.assertEqual(phash_chunks(BASE), [0xF0F0, 0x1234, 0xABCD, 0x8001])
+        self.assertEqual(len(_neighbours(0, 1)), 17)
+
+    def test_similar_blobs_uses_one_indexed_query(self):
+        close = ImageBlob.objects.create(sha256='close', file='x.jpg', phash=flip(BASE, 0, 17, 33, 50, 63))
+        ImageBlob.objects.create(sha256='far', file='y.jpg', phash=flip(BASE, *range(0, 64, 8)))
+        ImageBlob.objects.create(sha256='unhashed', file='z.jpg')
+        with self.assertNumQueries(1):
+            matches = similar_blobs(BASE, max_distance=6)
+        self.assertEqual(matches, [(close.pk, 5)])
+
+    def test_near_duplicates_of_an_image(self):
+        image = self.create_image(BASE, 'original')
+        copy = self.create_image(BASE, 'copy', blob=image.blob)  # Même fichier, autre URL
+        resized = self.create_image(flip(BASE, 3, 40), 'resized')
+        self.create_image(flip(BASE, *range(0, 64, 4)), 'other')
+        self.assertEqual(near_duplicates(image), [copy, resized])
+        self.assertEqual(near_duplicates(Image(blob=None)), [])
+
+        response = self.client.get(image.get_absolute_url())
+        self.assertContains(response, 'Similar images')
+        self.assertEqual(response.context['duplicates'], [copy, resized])
+
+    def test_duplicate_groups_are_transitive(self):
+        blobs = [(1, BASE), (2, flip(BASE, 1, 2, 3)), (3, flip(BASE, 1, 2, 3, 20, 21, 22)), (4, flip(BASE, *range(0, 64, 2)))]
+        self.assertEqual(duplicate_groups(blobs, max_distance=3), [[1, 2, 3]])
+
+    def test_find_duplicates_command(self):
+        image = self.create_image(BASE, 'original')
+        self.create_image(flip(BASE, 5), 'resized')
+        self.create_image(flip(BASE, *range(0, 64, 4)), 'other')
+        shared = self.create_image(flip(BASE, *range(0, 64, 3)), 'shared')
+        self.create_image(0, 'shared-copy', blob=shared.blob)
+        out = StringIO()
+        call_command('find_duplicates', stdout=out)
+        output = out.getvalue()
+        self.assertIn('2 group(s)', output)
+        self.assertIn(f'{image.id} testuser http://example.com/original.jpg', output)
+        self.assertIn('http://example.com/shared-copy.jpg', output)
+        self.assertNotIn('other.jpg', output)
@@ -0,0 +1,53 @@
+import csv
+import json
+from io import StringIO
+
+from django.contrib.admin import helpers
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from images.models import Image
+
+
+class ExportBookmarksTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.fan = User.objects.create_user(username='fan', password='testpassword')
+        self.images = [
+            Image.objects.create(user=self.user, title=f'Image {i}', url=f'http://example.com/{i}.png')
+            for i in range(3)
+        ]
+        self.images[0].user_like.add(self.fan, self.user)
+
+    def test_command_streams_jsonl(self):
+        output = StringIO()
+        call_command('export_bookmarks', chunk_size=2, stdout=output)
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([r['record'] for r in records], ['image'] * 3 + ['like'] * 2)
+        self.assertEqual(records[0]['title'], 'Image 0')
+        self.assertEqual(records[0]['user'], 'testuser')
+        self.assertEqual(
+            {(r['id'], r['user']) for r in records[3:]},
+            {(self.images[0].id, 'fan'), (self.images[0].id, 'testuser')}
+        )
+
+    def test_command_streams_csv(self):
+        output = StringIO()
+        call_command('export_bookmarks', format='csv', stdout=output)
+        rows = list(csv.DictReader(StringIO(output.getvalue())))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[1]['url'], 'http://example.com/1.png')
+        self.assertEqual(rows[-1]['record'], 'like')
+
+    def test_admin_action_streams_selection(self):
+        User.objects.create_superuser(username='admin', password='adminpassword')
+        self.client.login(username='admin', password='adminpassword')
+        response = self.client.post(reverse('admin:images_image_changelist'), {
+            'action': 'export_jsonl',
+            helpers.ACTION_CHECKBOX_NAME: [self.images[0].pk],
+        })
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)  # L'image sélectionnée et ses deux "likes"
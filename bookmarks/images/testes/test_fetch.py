@@ -0,0 +1,40 @@
+from unittest.mock import patch
+
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from images.fetch import ImageFetchError, ImageTooLarge, fetch_to_tempfile
+from images.testes.test_ingest import fake_response
+
+
+@override_settings(IMAGES_FETCH_MAX_BYTES=100, IMAGES_FETCH_CHUNK_SIZE=10)
+@patch('requests.Session.get')
+class FetchToTempfileTests(SimpleTestCase):
+    def test_fetch_streams_body_to_file(self, mock_get):
+        """The body is written to a temporary file, chunk by chunk, with timeouts."""
+        mock_get.return_value = fake_response(b'x' * 95)
+        with fetch_to_tempfile('http://example.com/a.png') as temp_file:
+            self.assertEqual(temp_file.read(), b'x' * 95)
+        mock_get.assert_called_once_with(
+            'http://example.com/a.png', stream=True, timeout=(3.05, 10)
+        )
+        mock_get.return_value.iter_content.assert_called_once_with(chunk_size=10)
+
+    def test_fetch_rejects_large_content_length_before_reading(self, mock_get):
+        """An oversized Content-Length is rejected without reading the body."""
+        mock_get.return_value = fake_response(b'x' * 10, headers={'Content-Length': '1000'})
+        with self.assertRaises(ImageTooLarge):
+            fetch_to_tempfile('http://example.com/a.png')
+        mock_get.return_value.iter_content.assert_not_called()
+
+    def test_fetch_rejects_body_larger_than_limit(self, mock_get):
+        """A body exceeding the limit is rejected even without Content-Length."""
+        mock_get.return_value = fake_response(b'x' * 150)
+        with self.assertRaises(ImageTooLarge):
+            fetch_to_tempfile('http://example.com/a.png')
+
+    def test_fetch_wraps_request_errors(self, mock_get):
+        """Network errors are reported as ImageFetchError."""
+        mock_get.side_effect = requests.Timeout()
+        with self.assertRaises(ImageFetchError):
+            fetch_to_tempfile('http://example.com/a.png')
@@ -0,0 +1,48 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import SimpleTestCase
+
+from bookmarks.http import get_session, pool_stats, reset_pool_stats
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'ok'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class SharedSessionTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f'http://127.0.0.1:{cls.server.server_port}/image.png'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def test_session_is_shared(self):
+        """The same session is returned within a process."""
+        self.assertIs(get_session(), get_session())
+
+    def test_connections_are_reused_per_host(self):
+        """Consecutive requests to one host reuse the keep-alive connection."""
+        get_session().close()
+        reset_pool_stats()
+        for _ in range(3):
+            response = get_session().get(self.url, timeout=5)
+            self.assertEqual(response.content, b'ok')
+        self.assertEqual(pool_stats(), {'hits': 2, 'misses': 1})
@@ -0,0 +1,101 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from account.models import UserStats
+from images.models import Image
+
+from .test_ingest import fake_response, make_png
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, BACKGROUND_WORKERS=0)
+class ImportImagesTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def write_rows(self, rows: list[dict]) -> str:
+        path = os.path.join(self.directory, 'bookmarks.jsonl')
+        with open(path, 'w') as output:
+            for row in rows:
+                output.write(json.dumps(row) + '\n')
+        return path
+
+    def row(self, number: int, **kwargs) -> dict:
+        row = {
+            'user': 'testuser',
+            'url': f'http://example.com/{number}.png',
+            'title': f'Image {number}',
+            'description': '',
+        }
+        row.update(kwargs)
+        return row
+
+    def import_images(self, path: str, **options):
+        call_command('import_images', path, workers=0, stdout=open(os.devnull, 'w'),
+                     stderr=open(os.devnull, 'w'), **options)
+
+    @patch('requests.Session.get')
+    def test_import_creates_and_fetches_valid_rows(self, mock_get):
+        mock_get.side_effect = lambda *args, **kwargs: fake_response(make_png())
+        path = self.write_rows([
+            self.row(1),
+            self.row(2),
+            self.row(3, url='http://example.com/page.html'),
+            self.row(4, user='nobody'),
+        ])
+        self.import_images(path, batch_size=2)
+        self.assertEqual(Image.objects.count(), 2)
+        self.assertFalse(Image.objects.exclude(status=Image.Status.READY).exists())
+        self.assertEqual(Image.objects.get(url='http://example.com/1.png').slug, 'image-1')
+        self.assertEqual(UserStats.objects.get(user=self.user).images_created, 2)
+        self.assertFalse(os.path.exists(f'{path}.checkpoint'))
+
+    @patch('requests.Session.get')
+    def test_import_resumes_from_checkpoint(self, mock_get):
+        mock_get.side_effect = lambda *args, **kwargs: fake_response(make_png())
+        path = self.write_rows([self.row(1), self.row(2), self.row(3)])
+        with open(f'{path}.checkpoint', 'w') as checkpoint:
+            checkpoint.write('2')
+        self.import_images(path)
+        self.assertEqual(list(Image.objects.values_list('title', flat=True)), ['Image 3'])
+
+    @patch('requests.Session.get')
+    def test_import_does_not_duplicate_rows(self, mock_get):
+        mock_get.side_effect = lambda *args, **kwargs: fake_response(make_png())
+        path = self.write_rows([self.row(1), self.row(1)])
+        self.import_images(path)
+        self.import_images(path)
+        self.assertEqual(Image.objects.count(), 1)
+        self.assertEqual(UserStats.objects.get(user=self.user).images_created, 1)
+
+    @patch('requests.Session.get')
+    def test_malformed_lines_are_skipped(self, mock_get):
+        mock_get.side_effect = lambda *args, **kwargs: fake_response(make_png())
+        path = os.path.join(self.directory, 'bookmarks.jsonl')
+        with open(path, 'w') as output:
+            output.write(json.dumps(self.row(1)) + '\n')
+            output.write('{"user": "testuser", "url": \n')
+            output.write('\n')
+            output.write('["not", "an", "object"]\n')
+            output.write(json.dumps(self.row(2)) + '\n')
+        errors = StringIO()
+        call_command('import_images', path, workers=0, stdout=StringIO(), stderr=errors)
+        self.assertEqual(Image.objects.count(), 2)
+        self.assertIn('Row 2 skipped: line 2: invalid JSON', errors.getvalue())
+        self.assertIn('Row 3 skipped: line 4: expected a JSON object', errors.getvalue())
@@ -0,0 +1,121 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest.mock import Mock, patch
+
+import requests
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image as PILImage
+
+from images.models import Image
+from images.tasks import ingest_image
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_png(size: tuple[int, int] = (10, 10)) -> bytes:
+    buffer = BytesIO()
+    PILImage.new('RGB', size, 'red').save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def fake_response(content: bytes, headers: dict = None) -> Mock:
+    """Build a streaming response usable as a context manager."""
+    response = Mock(headers=headers or {})
+    response.iter_content.side_effect = lambda chunk_size: (
+        content[i:i + chunk_size] for i in range(0, len(content), chunk_size)
+    )
+    response.__enter__ = Mock(return_value=response)
+    response.__exit__ = Mock(return_value=False)
+    return response
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, BACKGROUND_WORKERS=0)
+class ImageIngestTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.login(username='testuser', password='testpassword')
+
+    def create_image(self):
+        return Image.objects.create(
+            user=self.user,
+            title='Red square',
+            url='http://example.com/red.png'
+        )
+
+    @patch('requests.Session.get')
+    def test_create_view_stores_pending_image(self, mock_get):
+        """The view saves a pending image and defers the download until commit."""
+        data = {
+            'title': 'Red square',
+            'url': 'http://example.com/red.png',
+            'description': ''
+        }
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(reverse('images:image_create'), data)
+        image = Image.objects.get()
+        self.assertRedirects(response, image.get_absolute_url(), fetch_redirect_response=False)
+        self.assertEqual(image.status, Image.Status.PENDING)
+        mock_get.assert_not_called()
+        self.assertEqual(len(callbacks), 3)  # Invalidation du cache, téléchargement et diffusion de l'action
+
+    @patch('requests.Session.get')
+    def test_ingest_attaches_downloaded_file(self, mock_get):
+        """A valid download marks the image as ready."""
+        mock_get.return_value = fake_response(make_png())
+        image = self.create_image()
+        ingest_image(image.id)
+        image.refresh_from_db()
+        self.assertEqual(image.status, Image.Status.READY)
+        self.assertTrue(image.image.name.endswith('red-square.png'))
+
+    @patch('requests.Session.get')
+    def test_ingest_marks_invalid_content_as_failed(self, mock_get):
+        """Content that is not an image marks the image as failed."""
+        mock_get.return_value = fake_response(b'<html></html>')
+        image = self.create_image()
+        ingest_image(image.id)
+        image.refresh_from_db()
+        self.assertEqual(image.status, Image.Status.FAILED)
+        self.assertFalse(image.image)
+
+    @patch('requests.Session.get')
+    def test_ingest_marks_network_error_as_failed(self, mock_get):
+        """A network error marks the image as failed."""
+        mock_get.side_effect = requests.ConnectionError()
+        image = self.create_image()
+        ingest_image(image.id)
+        image.refresh_from_db()
+        self.assertEqual(image.status, Image.Status.FAILED)
+
+    def test_detail_view_handles_pending_image(self):
+        """The detail page renders while the download is still pending."""
+        image = self.create_image()
+        response = self.client.get(image.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'being downloaded')
+
+    @patch('requests.Session.get')
+    def test_requeue_pending_images(self, mock_get):
+        """Images left pending by a restart are downloaded again; recent ones are left alone."""
+        mock_get.return_value = fake_response(make_png())
+        stale, recent = self.create_image(), self.create_image()
+        Image.objects.filter(pk=stale.pk).update(created=timezone.now() - timedelta(hours=1))
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('requeue_pending_images', older_than=600, stdout=out)
+        self.assertIn('1 pending image(s) re-enqueued', out.getvalue())
+        stale.refresh_from_db()
+        recent.refresh_from_db()
+        self.assertEqual(stale.status, Image.Status.READY)
+        self.assertEqual(recent.status, Image.Status.PENDING)
@@ -0,0 +1,63 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from images.models import Image
+
+
+class ImageLikeTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.image = Image.objects.create(
+            user=self.user,
+            title='Red square',
+            url='http://example.com/red.png'
+        )
+        self.client.login(username='testuser', password='testpassword')
+
+    def like(self, action):
+        return self.client.post(reverse('images:like'), {'id': self.image.id, 'action': action}).json()
+
+    def test_like_updates_counter_and_returns_state(self):
+        """Liking adds the relation and returns the new count and state."""
+        self.assertEqual(self.like('like'), {'status': 'ok', 'liked': True, 'total_likes': 1})
+        self.image.refresh_from_db()
+        self.assertEqual(self.image.total_likes, 1)
+        self.assertTrue(self.image.user_like.filter(pk=self.user.pk).exists())
+
+    def test_repeated_like_is_counted_once(self):
+        """Liking twice does not inflate the counter."""
+        self.like('like')
+        self.assertEqual(self.like('like')['total_likes'], 1)
+
+    def test_unlike_decrements_counter(self):
+        """Unliking removes the relation and decrements the counter."""
+        self.like('like')
+        self.assertEqual(self.like('unlike'), {'status': 'ok', 'liked': False, 'total_likes': 0})
+        self.assertEqual(self.like('unlike')['total_likes'], 0)
+
+    def test_unknown_image_returns_error(self):
+        """An unknown image id returns an error status."""
+        response = self.client.post(reverse('images:like'), {'id': 999, 'action': 'like'})
+        self.assertEqual(response.json(), {'status': 'error'})
+
+    def test_reconcile_likes_fixes_drift(self):
+        """The reconcile_likes command recomputes drifted counters."""
+        self.image.user_like.add(self.user)
+        Image.objects.filter(pk=self.image.pk).update(total_likes=5)
+        call_command('reconcile_likes', stdout=StringIO())
+        self.image.refresh_from_db()
+        self.assertEqual(self.image.total_likes, 1)
+
+    def test_deleting_liker_decrements_counters(self):
+        """Deleting a user takes their likes out of the counter and the trending score."""
+        liker = User.objects.create_user(username='liker', password='testpassword')
+        self.client.login(username='liker', password='testpassword')
+        self.like('like')
+        liker.delete()
+        self.image.refresh_from_db()
+        self.assertEqual(self.image.total_likes, 0)
+        self.assertEqual(self.image.trending_score, 0)
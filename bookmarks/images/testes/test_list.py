@@ -0,0 +1,69 @@
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from account.models import Profile
+from images.models import Image
+from images.views import _after_cursor
+
+
+@override_settings(IMAGES_PER_PAGE=5)
+class ImageListTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        Profile.objects.create(user=self.user)
+        # Identical creation dates exercise the id tie-breaker of the cursor
+        for i in range(12):
+            Image.objects.create(
+                user=self.user,
+                title=f'Image {i}',
+                url=f'http://example.com/{i}.png',
+                status=Image.Status.READY
+            )
+        Image.objects.create(user=self.user, title='Pending', url='http://example.com/p.png')
+        Image.objects.update(created=Image.objects.first().created)
+        self.client.login(username='testuser', password='testpassword')
+
+    def test_pages_follow_each_other_without_overlap(self):
+        """Following the cursors walks every ready image exactly once."""
+        seen = []
+        url = reverse('images:list')
+        response = self.client.get(url)
+        self.assertTemplateUsed(response, 'images/image/list.html')
+        while True:
+            seen += [image.id for image in response.context['images']]
+            cursor = response.context['next_cursor']
+            if not cursor:
+                break
+            response = self.client.get(url, {'images_only': 1, 'cursor': cursor})
+            self.assertTemplateNotUsed(response, 'images/image/list.html')
+        ready = Image.objects.filter(status=Image.Status.READY)
+        self.assertEqual(len(seen), 12)
+        self.assertEqual(sorted(seen), sorted(ready.values_list('id', flat=True)))
+
+    def test_query_count_does_not_depend_on_page_size(self):
+        """Authors and profiles are fetched with the images, not one query per image."""
+        # Warm the session and user caches
+        self.client.get(reverse('images:list'))
+        # images with their authors and profiles
+        with self.assertNumQueries(1):
+            self.client.get(reverse('images:list'))
+        with self.settings(IMAGES_PER_PAGE=10), self.assertNumQueries(1):
+            self.client.get(reverse('images:list'))
+
+    def test_invalid_cursor_returns_bad_request(self):
+        """A malformed cursor is rejected."""
+        response = self.client.get(reverse('images:list'), {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+
+    @skipUnless(connection.vendor == 'sqlite', 'Query plan checked on SQLite')
+    def test_cursor_is_an_index_range(self):
+        """A deep page searches the created index from the cursor instead of scanning from the newest row."""
+        last = Image.objects.order_by('-created', 'id').last()
+        images = Image.objects.filter(status=Image.Status.READY).order_by('-created', 'id')
+        plan = _after_cursor(images, last.created, last.pk)[:5].explain()
+        self.assertIn('SEARCH', plan)
+        self.assertIn('(created<?)', plan)
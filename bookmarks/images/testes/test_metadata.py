@@ -0,0 +1,60 @@
+import shutil
+import tempfile
+from io import BytesIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from PIL import Image as PILImage, ImageDraw
+
+from images.metadata import extract_metadata, hamming_distance
+from images.models import Image
+from images.tasks import ingest_image
+
+from .test_ingest import fake_response
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_picture(size: tuple[int, int], format: str = 'PNG', shift: int = 0) -> bytes:
+    """Draw a simple scene, scaled to `size`."""
+    picture = PILImage.new('RGB', (200, 100), (30, 90, 200))
+    draw = ImageDraw.Draw(picture)
+    draw.ellipse((20 + shift, 20, 90 + shift, 90), fill=(250, 200, 0))
+    draw.rectangle((120, 40, 190, 100), fill=(20, 120, 40))
+    buffer = BytesIO()
+    picture.resize(size).save(buffer, format=format)
+    return buffer.getvalue()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, BACKGROUND_WORKERS=0)
+class ImageMetadataTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_extract_metadata(self):
+        metadata = extract_metadata(BytesIO(make_picture((400, 200))))
+        self.assertEqual((metadata.width, metadata.height, metadata.format), (400, 200, 'png'))
+        self.assertEqual(metadata.dominant_color[:3], '#1e')  # Fond bleu
+
+    def test_phash_survives_resizing_and_recompression(self):
+        original = extract_metadata(BytesIO(make_picture((400, 200)))).phash
+        smaller = extract_metadata(BytesIO(make_picture((160, 80), 'JPEG'))).phash
+        different = extract_metadata(BytesIO(make_picture((400, 200), shift=100))).phash
+        self.assertLessEqual(hamming_distance(original, smaller), 6)
+        self.assertGreater(hamming_distance(original, different), 10)
+
+    @patch('requests.Session.get')
+    def test_ingest_stores_metadata(self, mock_get):
+        mock_get.return_value = fake_response(make_picture((400, 200)))
+        user = User.objects.create_user(username='testuser', password='testpassword')
+        image = Image.objects.create(user=user, title='Scene', url='http://example.com/scene.png')
+        ingest_image(image.id)
+        image.refresh_from_db()
+        self.assertEqual((image.blob.width, image.blob.height), (400, 200))
+        self.assertIsNotNone(image.blob.phash)
+        html = Template('{% load image_tags %}{% rendition_size image 300 %}').render(Context({'image': image}))
+        self.assertEqual(html, 'width="300" height="150"')
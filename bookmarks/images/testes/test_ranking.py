@@ -0,0 +1,88 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from images.models import Image, ImageLike
+from images.ranking import decay_trending_scores, trending_images
+
+
+@override_settings(IMAGES_TRENDING_HALF_LIFE=3600)
+class TrendingRankingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.images = [
+            Image.objects.create(
+                user=self.user,
+                title=f'Image {i}',
+                url=f'http://example.com/{i}.png',
+                status=Image.Status.READY
+            )
+            for i in range(3)
+        ]
+        self.client.login(username='testuser', password='testpassword')
+
+    def like(self, image, action='like'):
+        self.client.post(reverse('images:like'), {'id': image.id, 'action': action})
+        image.refresh_from_db()
+
+    def test_like_and_unlike_update_score(self):
+        """The score follows like state changes without going negative."""
+        image = self.images[0]
+        self.like(image)
+        self.assertEqual(image.trending_score, 1)
+        self.like(image, 'unlike')
+        self.assertEqual(image.trending_score, 0)
+
+    def test_unlike_removes_only_the_decayed_weight(self):
+        """Unliking an old like keeps the weight of the recent ones."""
+        image = self.images[0]
+        self.like(image)
+        # The like is one half-life old and the score was decayed accordingly
+        ImageLike.objects.filter(image=image).update(created=timezone.now() - timedelta(seconds=3600))
+        decay_trending_scores(3600)
+        for username in ('alice', 'bob'):
+            User.objects.create_user(username=username, password='testpassword')
+            self.client.login(username=username, password='testpassword')
+            self.like(image)
+        self.assertAlmostEqual(image.trending_score, 2.5)
+        self.client.login(username='testuser', password='testpassword')
+        self.like(image, 'unlike')
+        self.assertAlmostEqual(image.trending_score, 2.0, places=3)
+
+    def test_decay_halves_scores_every_half_life(self):
+        """Scores are halved after one half-life and negligible ones are reset."""
+        Image.objects.filter(pk=self.images[0].pk).update(trending_score=8)
+        Image.objects.filter(pk=self.images[1].pk).update(trending_score=0.011)
+        decay_trending_scores(3600)
+        self.assertEqual(
+            list(Image.objects.order_by('id').values_list('trending_score', flat=True)),
+            [4, 0, 0]
+        )
+
+    def test_recent_likes_outrank_decayed_ones(self):
+        """A fresh like ranks above an older, decayed one."""
+        old, recent = self.images[0], self.images[1]
+        self.like(old)
+        call_command('decay_trending', elapsed=3600, stdout=StringIO())
+        self.like(recent)
+        self.assertEqual(trending_images(2), [recent, old])
+
+    def test_ranking_view_lists_trending_images(self):
+        """The ranking page lists images with a positive score only."""
+        self.like(self.images[2])
+        response = self.client.get(reverse('images:ranking'))
+        self.assertEqual(list(response.context['images']), [self.images[2]])
+
+    def test_benchmark_command_runs(self):
+        """The benchmark leaves no data behind."""
+        out = StringIO()
+        call_command('benchmark_trending', sizes=[20, 40], repeat=1, stdout=out)
+        self.assertIn('trending top-10', out.getvalue())
+        self.assertEqual(Image.objects.count(), 3)
@@ -0,0 +1,73 @@
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from PIL import Image as PILImage
+
+from images.models import Image, ImageRendition
+from images.renditions import generate_renditions
+from images.tasks import ingest_image
+from images.testes.test_ingest import fake_response, make_png
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    BACKGROUND_WORKERS=0,
+    IMAGES_RENDITION_WIDTHS=[300, 600],
+    IMAGES_RENDITION_FORMATS=['webp', 'jpeg']
+)
+@patch('requests.Session.get')
+class ImageRenditionTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+
+    def ingest(self):
+        image = Image.objects.create(
+            user=self.user,
+            title='Red square',
+            url='http://example.com/red.png'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            ingest_image(image.id)
+        image.refresh_from_db()
+        return image
+
+    def test_ingest_generates_configured_renditions(self, mock_get):
+        """Every configured width and format is generated once the image is ingested."""
+        mock_get.return_value = fake_response(make_png((450, 300)))
+        image = self.ingest()
+        renditions = ImageRendition.objects.filter(blob=image.blob)
+        self.assertEqual(
+            sorted(renditions.values_list('width', 'format')),
+            [(300, 'jpeg'), (300, 'webp'), (600, 'jpeg'), (600, 'webp')]
+        )
+        rendition = renditions.get(width=300, format='webp')
+        with rendition.file.open('rb') as f:
+            resized = PILImage.open(f)
+            self.assertEqual((resized.format, resized.size), ('WEBP', (300, 200)))
+
+    def test_generate_renditions_is_idempotent(self, mock_get):
+        """Running the job again does not duplicate renditions."""
+        mock_get.return_value = fake_response(make_png())
+        image = self.ingest()
+        generate_renditions(image.blob_id)
+        self.assertEqual(ImageRendition.objects.count(), 4)
+
+    def test_detail_page_uses_renditions_without_resizing(self, mock_get):
+        """The detail page only emits rendition URLs."""
+        mock_get.return_value = fake_response(make_png())
+        image = self.ingest()
+        webp = ImageRendition.objects.get(width=300, format='webp')
+        with patch('PIL.Image.open') as mock_open:
+            response = self.client.get(image.get_absolute_url())
+        mock_open.assert_not_called()
+        self.assertContains(response, webp.file.url)
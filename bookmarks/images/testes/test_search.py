@@ -0,0 +1,117 @@
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from account.models import Profile
+from images.models import Image
+from images.search import FTS_TABLE, ScanBackend, SearchBackend, search_images
+
+
+class ImageSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.login(username='testuser', password='testpassword')
+
+    def create_image(self, title: str, description: str = '', status: str = Image.Status.READY) -> Image:
+        return Image.objects.create(
+            user=self.user,
+            title=title,
+            description=description,
+            url='http://example.com/image.png',
+            image='images/image.png' if status == Image.Status.READY else '',
+            status=status
+        )
+
+    def titles(self, query: str) -> list[str]:
+        return [image.title for image in search_images(query)[0:10]]
+
+    def test_title_matches_rank_first(self):
+        self.create_image('Sunset', 'A mountain at dusk')
+        self.create_image('Mountain lake')
+        self.create_image('Beach')
+        self.assertEqual(self.titles('mountain'), ['Mountain lake', 'Sunset'])
+
+    def test_all_terms_are_required_as_prefixes(self):
+        self.create_image('Mountain lake')
+        self.create_image('Mountain road')
+        self.assertEqual(self.titles('mount lak'), ['Mountain lake'])
+
+    def test_operators_and_punctuation_are_ignored(self):
+        self.create_image('Rock "n" roll')
+        self.assertEqual(self.titles('rock OR -"'), [])
+        self.assertEqual(self.titles('"rock'), ['Rock "n" roll'])
+        self.assertEqual(self.titles('***'), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        image = self.create_image('Old title')
+        image.title = 'New title'
+        image.save()
+        self.assertEqual(self.titles('old'), [])
+        self.assertEqual(self.titles('new'), ['New title'])
+        image.delete()
+        self.assertEqual(self.titles('new'), [])
+
+    def test_view_paginates_results(self):
+        for number in range(3):
+            self.create_image(f'Cat {number}')
+        with self.settings(IMAGES_PER_PAGE=2):
+            response = self.client.get(reverse('images:search'), {'q': 'cat', 'page': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '3 results for')
+        self.assertEqual(len(response.context['page'].object_list), 1)
+
+    def test_view_shows_only_ready_images(self):
+        """Pending and failed bookmarks are neither listed nor counted."""
+        self.create_image('Cat ready')
+        self.create_image('Cat pending', status=Image.Status.PENDING)
+        self.create_image('Cat failed', status=Image.Status.FAILED)
+        response = self.client.get(reverse('images:search'), {'q': 'cat'})
+        self.assertContains(response, '1 result for')
+        self.assertEqual([image.title for image in response.context['page'].object_list], ['Cat ready'])
+
+    def test_view_query_count_does_not_grow_with_results(self):
+        Profile.objects.create(user=self.user)
+        self.create_image('Cat 0')
+        self.client.get(reverse('images:search'), {'q': 'cat'})  # Warm the session and user caches
+        with CaptureQueriesContext(connection) as one:
+            self.client.get(reverse('images:search'), {'q': 'cat'})
+        for number in range(1, 5):
+            self.create_image(f'Cat {number}')
+        with self.assertNumQueries(len(one)):
+            self.client.get(reverse('images:search'), {'q': 'cat'})
+
+    def test_admin_search_uses_index(self):
+        self.create_image('Mountain lake')
+        self.create_image('Beach')
+        User.objects.create_superuser(username='admin', password='adminpassword')
+        self.client.login(username='admin', password='adminpassword')
+        response = self.client.get(reverse('admin:images_image_changelist'), {'q': 'lake'})
+        self.assertEqual([image.title for image in response.context['cl'].result_list], ['Mountain lake'])
+
+    def test_rebuild_command_restores_index(self):
+        self.create_image('Mountain lake')
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        call_command('rebuild_search_index', verbosity=0, stdout=open('/dev/null', 'w'))
+        self.assertEqual(self.titles('lake'), ['Mountain lake'])
+
+    def test_scan_backend_fallback(self):
+        self.create_image('Mountain lake')
+        backend = ScanBackend()
+        self.assertEqual(backend.count('lake mount'), 1)
+        self.assertEqual(backend.count('beach'), 0)
+
+    def test_incomplete_backend_cannot_be_instantiated(self):
+        """A backend missing part of the query API fails when created, not at query time."""
+        class NoCountBackend(SearchBackend):
+            def filter(self, queryset, query):
+                return queryset
+
+            def search_ids(self, query, offset, limit, scope=None):
+                return []
+
+        with self.assertRaises(TypeError):
+            NoCountBackend()
@@ -7,4 +7,9 @@ urlpatterns = [
     path('create/', views.image_create, name='image_create'),
     path('detail/<int:id>/<slug:slug>/', views.image_detail, name='detail'),
     path('like/', views.image_like, name='like'),
+    path('', views.image_list, name='list'),
+    path('ranking/', views.image_ranking, name='ranking'),
+    path('most-viewed/', views.image_most_viewed, name='most_viewed'),
+    path('search/', views.image_search, name='search'),
+    path('bookmarklet.js', views.bookmarklet_loader, name='bookmarklet'),
 ]
\ No newline at end of file
@@ -1,84 +1,373 @@
+from datetime import datetime  # Date de création encodée dans le curseur de pagination
+from functools import wraps  # Décorateur de comptage des vues
+
+from asgiref.sync import sync_to_async  # Appels synchrones (ORM, templates) depuis les vues asynchrones
+from django.conf import settings  # Accès aux paramètres du projet (ex. IMAGES_PER_PAGE)
 from django.contrib import messages  # Permet d'afficher des messages temporaires à l'utilisateur
 from django.contrib.auth.decorators import login_required  # Décorateur pour restreindre l'accès aux utilisateurs connectés
+from django.core.exceptions import BadRequest  # Erreur 400 pour un curseur invalide
+from django.core.handlers.asgi import ASGIRequest  # Requête servie par l'application ASGI
 from django.http import HttpResponse, HttpRequest, JsonResponse  # Permet d'envoyer des réponses HTTP et JSON
 from django.shortcuts import redirect, render  # Utilisé pour rediriger ou rendre des templates HTML
 from django.shortcuts import get_object_or_404  # Permet d'accéder à une instance d'objet
-from django.views.decorators.http import require_POST  # Décorateur pour vérifier si la requête est de type POST
+from django.templatetags.static import static  # URL versionnée des fichiers statiques
+from django.utils.cache import patch_cache_control  # En-têtes de mise en cache du chargeur
+from django.db import connection, transaction  # Transaction pour modifier la relation et le compteur ensemble
+from django.db.models import F, Q, QuerySet  # Expressions évaluées côté base de données
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode  # Encodage du curseur
+from django.core.cache import cache  # Cache de la page de détail
+from django.core.paginator import Paginator  # Pagination des résultats de recherche
+from django.views.decorators.http import condition, require_POST  # Requêtes conditionnelles et vérification du type POST
+
+from account.decorators import async_login_required  # login_required pour les vues asynchrones
+from actions.feed import create_action  # Flux d'activité
 
+from .cache import detail_etag, detail_last_modified, detail_page_key, get_detail_version  # Versions du cache de détail
+from .counters import record_view  # Compteur de vues en mémoire
+from .duplicates import near_duplicates  # Images identiques ou presque identiques
 from .forms import ImageCreateForm  # Formulaire pour créer une instance du modèle Image
-from .models import Image  # Importe le modèle Image
+from .models import Image, ImageLike  # Importe les modèles Image et ImageLike
+from .ranking import like_weight, most_viewed_images, trending_images, trending_score_delta  # Classements des images
+from .search import search_images  # Recherche plein texte
+from .signals import image_liked  # Notifie les compteurs par utilisateur
+from .tasks import enqueue_image_ingest, schedule_image_ingest  # Téléchargement du fichier en arrière-plan
 
 # Vue pour permettre aux utilisateurs de créer une nouvelle image
-@login_required  # Assure que seuls les utilisateurs connectés peuvent accéder à cette vue
-def image_create(request):
+@async_login_required  # Assure que seuls les utilisateurs connectés peuvent accéder à cette vue
+async def image_create(request: HttpRequest) -> HttpResponse:
+    """
+    Vue asynchrone de création d'une image depuis le bookmarklet.
+
+    Sous ASGI, le téléchargement est planifié sur la boucle d'événements et n'occupe aucun
+    thread ; sous WSGI, il est confié au pool de workers comme auparavant.
+    """
     # Vérifie si la requête est de type POST (soumission de formulaire)
     if request.method == 'POST':
         # Instancie le formulaire avec les données POST envoyées par l'utilisateur
         form = ImageCreateForm(data=request.POST)
         if form.is_valid():  # Vérifie si les données du formulaire sont valides
-            # Récupère les données validées (cleaned_data contient les données nettoyées)
-            cd = form.cleaned_data
             # Crée une nouvelle instance d'Image mais sans la sauvegarder immédiatement dans la base de données
             new_image = form.save(commit=False)
             # Associe l'utilisateur actuellement connecté à l'image
             new_image.user = request.user
-            # Sauvegarde l'instance dans la base de données
-            new_image.save()
+            # Sauvegarde l'instance (état `pending`) dans la base de données
+            await new_image.asave()
+            # Le fichier distant est téléchargé en arrière-plan, la réponse part immédiatement
+            if isinstance(request, ASGIRequest):
+                schedule_image_ingest(new_image)  # Téléchargement non bloquant sur la boucle d'événements
+            else:
+                await sync_to_async(enqueue_image_ingest)(new_image)  # Pool de workers (après le commit)
+            # Enregistre l'action ; sa diffusion dans les flux est confiée au pool de workers
+            await sync_to_async(create_action)(request.user, 'bookmarked image', new_image)
             # Ajoute un message de succès à afficher à l'utilisateur
-            messages.success(request, 'Image added successfully!')
+            messages.success(request, 'Image added successfully! It will be available in a moment.')
             # Redirige l'utilisateur vers la vue détail de l'image nouvellement créée
             return redirect(new_image.get_absolute_url())
     else:
         # Si la requête n'est pas de type POST, construit le formulaire avec les données GET
         # (par exemple, des données transmises via un bookmarklet)
         form = ImageCreateForm(data=request.GET)
-    
-    # Rendu du template HTML pour afficher le formulaire
-    return render(
+
+    # Rendu du template HTML pour afficher le formulaire (les messages lus dans la session
+    # et les requêtes éventuelles du template restent synchrones)
+    return await sync_to_async(render)(
         request,  # Objet de requête
         'images/image/create.html',  # Template utilisé pour afficher la page de création
         {'form': form}  # Contexte contenant le formulaire
     )
 
-def image_detail(request,id: int, slug: str) -> HttpResponse:
+def bookmarklet_loader(request: HttpRequest) -> HttpResponse:
+    """
+    Script chargé par le lanceur du bookmarklet (voir bookmarklet_launcher.js).
+
+    Il donne les URL actuelles, avec l'empreinte du contenu, du script et de la feuille de
+    style du bookmarklet : ces fichiers sont servis avec un cache de longue durée et
+    seul ce petit script est mis en cache `IMAGES_BOOKMARKLET_LOADER_MAX_AGE` secondes.
+    """
+    origin = f'//{request.get_host()}'  # Même schéma (http ou https) que la page visitée
+    response = render(
+        request,
+        'bookmarklet_loader.js',
+        {
+            'site_url': f'{origin}/',
+            'script_url': origin + static('js/bookmarklet.js'),
+            'style_url': origin + static('css/bookmarklet.css'),
+        },
+        content_type='text/javascript'
+    )
+    patch_cache_control(response, public=True, max_age=settings.IMAGES_BOOKMARKLET_LOADER_MAX_AGE)
+    return response
+
+
+def _after_cursor(images: QuerySet[Image], created: datetime, pk: int) -> QuerySet[Image]:
+    """
+    Restreint les images triées par (-created, id) à celles qui suivent le curseur.
+
+    Le OU seul ne peut pas servir de plage d'index : la borne `created <= curseur` permet
+    de commencer la lecture de l'index au curseur au lieu de l'image la plus récente.
+    """
+    return images.filter(
+        created__lte=created
+    ).filter(Q(created__lt=created) | Q(created=created, id__gt=pk))
+
+
+def _encode_cursor(image: Image) -> str:
+    """
+    Encode la position de la dernière image d'une page (date de création et identifiant).
+    """
+    return urlsafe_base64_encode(f'{image.created.isoformat()}|{image.id}'.encode())
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created, pk = urlsafe_base64_decode(cursor).decode().split('|')
+        return datetime.fromisoformat(created), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise BadRequest('Invalid cursor.')
+
+
+@login_required
+def image_list(request: HttpRequest) -> HttpResponse:
+    """
+    Vue listant les images par pages successives (défilement infini).
+
+    La pagination par curseur reprend après la dernière image affichée au lieu d'utiliser
+    OFFSET : une page lointaine coûte autant que la première grâce à la plage d'index sur `-created`.
+    """
+    images = Image.objects.filter(
+        status=Image.Status.READY
+    ).select_related(
+        'user', 'user__profile', 'blob'  # Évite une requête par image pour l'auteur et son profil
+    ).prefetch_related(
+        'blob__renditions'
+    ).order_by('-created', 'id')  # L'identifiant départage les images créées au même instant
+
+    cursor = request.GET.get('cursor')
+    if cursor:
+        created, pk = _decode_cursor(cursor)
+        images = _after_cursor(images, created, pk)
+
+    per_page = settings.IMAGES_PER_PAGE
+    # Une image de plus que nécessaire indique s'il existe une page suivante
+    page = list(images[:per_page + 1])
+    next_cursor = _encode_cursor(page[per_page - 1]) if len(page) > per_page else None
+    context = {
+        'section': 'images',
+        'images': page[:per_page],
+        'next_cursor': next_cursor,
+    }
+    if request.GET.get('images_only'):
+        # Requête AJAX : seul le fragment HTML des images est rendu
+        return render(request, 'images/image/list_images.html', context)
+    return render(request, 'images/image/list.html', context)
+
+
+def count_view(view):
+    """
+    Compte chaque affichage de la page de détail, y compris les pages servies depuis le
+    cache et les réponses 304 : placé avant `condition`, il voit toutes les requêtes GET.
+
+    La vue est comptée après la réponse : une image inexistante lève `Http404` et
+    n'ajoute rien au tampon. Une réponse 304 répond à un ETag envoyé avec une page 200.
+    """
+    @wraps(view)
+    def wrapper(request: HttpRequest, id: int, slug: str) -> HttpResponse:
+        response = view(request, id, slug)
+        if request.method == 'GET' and response.status_code in (200, 304):
+            record_view(id)  # Incrément en mémoire, écrit par lots
+        return response
+    return wrapper
+
+
+@count_view
+@condition(etag_func=detail_etag, last_modified_func=detail_last_modified)  # Réponses 304 pour les visiteurs anonymes
+def image_detail(request: HttpRequest, id: int, slug: str) -> HttpResponse:
     """
     Vue pour afficher les détails d'une image donnée.
+
+    La page complète est mise en cache pour les visiteurs anonymes ; la clé contient
+    la version de l'image, augmentée à chaque modification de l'image ou de ses "likes".
     """
-    image = get_object_or_404(Image, id=id, slug=slug)  # Recherche de l'image avec l'ID et le slug
-    return render(
+    cacheable = not request.user.is_authenticated and not len(messages.get_messages(request))
+    if cacheable:
+        page_key = detail_page_key(id, slug, get_detail_version(id))
+        content = cache.get(page_key)
+        if content is not None:
+            return HttpResponse(content)
+
+    image = get_object_or_404(
+        # Les versions redimensionnées sont chargées avec l'image pour le template
+        Image.objects.select_related('blob').prefetch_related('blob__renditions'),
+        id=id,
+        slug=slug
+    )  # Recherche de l'image avec l'ID et le slug
+    response = render(
         request,  # Objet de requête
         'images/image/detail.html',  # Template utilisé pour afficher la page de détail
-        {'section': 'images', 'image': image}  # Contexte contenant l'image
+        _detail_context(request, image)  # Contexte préparé avec un nombre fixe de requêtes
+    )
+    if cacheable:
+        cache.set(page_key, response.content, settings.IMAGES_DETAIL_CACHE_TIMEOUT)
+    return response
+
+
+def _detail_context(request: HttpRequest, image: Image) -> dict:
+    """
+    Prépare le contexte de la page de détail sans requête par utilisateur ayant aimé l'image.
+    """
+    # Échantillon limité des utilisateurs, chargé avec leur profil en une seule requête ;
+    # la requête n'est exécutée que si le fragment n'est pas en cache
+    likers = image.user_like.select_related('profile')[:settings.IMAGES_DETAIL_LIKERS]
+    # Un seul EXISTS au lieu de charger tous les utilisateurs pour tester l'appartenance
+    is_liked = (
+        request.user.is_authenticated
+        and image.user_like.filter(pk=request.user.pk).exists()
+    )
+    return {
+        'section': 'images',
+        'image': image,
+        'likers': likers,
+        'other_likers': max(image.total_likes - settings.IMAGES_DETAIL_LIKERS, 0),
+        'is_liked': is_liked,
+        'total_likes': image.total_likes,
+        # Mêmes photos enregistrées depuis d'autres URL ou à d'autres résolutions (requête indexée)
+        'duplicates': near_duplicates(image, settings.IMAGES_DETAIL_DUPLICATES),
+        'cache_version': get_detail_version(image.id),
+        'cache_timeout': settings.IMAGES_DETAIL_CACHE_TIMEOUT,
+    }
+
+
+@login_required
+def image_ranking(request: HttpRequest) -> HttpResponse:
+    """
+    Vue affichant les images tendance : "likes" pondérés par leur récence.
+    """
+    return render(
+        request,
+        'images/image/ranking.html',
+        {
+            'section': 'images',
+            'images': trending_images(settings.IMAGES_TRENDING_COUNT)
+        }
     )
 
+
 @login_required
+def image_most_viewed(request: HttpRequest) -> HttpResponse:
+    """
+    Vue affichant les images les plus vues, lues dans l'ordre de l'index sur `-total_views`.
+    """
+    return render(
+        request,
+        'images/image/most_viewed.html',
+        {
+            'section': 'images',
+            'images': most_viewed_images(settings.IMAGES_TRENDING_COUNT)
+        }
+    )
+
+
+@login_required
+def image_search(request: HttpRequest) -> HttpResponse:
+    """
+    Vue de recherche plein texte dans les titres et descriptions, triée par pertinence.
+
+    Seuls les identifiants de la page demandée sont lus dans l'index, puis les images
+    correspondantes sont chargées en une requête.
+    """
+    query = request.GET.get('q', '').strip()
+    results = search_images(
+        query,
+        Image.objects.filter(
+            status=Image.Status.READY  # Les images en attente ou en échec n'ont pas de fichier à afficher
+        ).select_related(
+            'user', 'user__profile', 'blob'  # Évite une requête par image pour l'auteur et son profil
+        ).prefetch_related('blob__renditions')
+    )
+    page = Paginator(results, settings.IMAGES_PER_PAGE).get_page(request.GET.get('page'))
+    return render(
+        request,
+        'images/image/search.html',
+        {
+            'section': 'images',
+            'query': query,
+            'page': page,
+        }
+    )
+
+
+@async_login_required
 @require_POST
-def image_like(request: HttpRequest) -> HttpResponse:
+async def image_like(request: HttpRequest) -> HttpResponse:
+    """
+    Vue AJAX asynchrone pour aimer ou ne plus aimer une image.
+
+    La transaction (verrou, relation, compteurs) est exécutée d'un bloc par `sync_to_async` :
+    l'ORM asynchrone ne gère pas encore les transactions.
+    """
     image_id = request.POST.get('id')
     action = request.POST.get('action')
-    if image_id and action:
+    if image_id and action in ('like', 'unlike'):
         try:
-            image = Image.objects.get(id=image_id)
-            if action == 'like':
-                image.user_like.add(request.user)
-            else:
-                image.user_like.remove(request.user)
-            return JsonResponse({'status': 'ok'})
-        except Image.DoesNotExist:
+            total_likes = await sync_to_async(_toggle_like)(image_id, request.user, action)
+            return JsonResponse({
+                'status': 'ok',
+                'liked': action == 'like',
+                'total_likes': total_likes,
+            })
+        except (Image.DoesNotExist, ValueError):
             pass
     return JsonResponse({'status': 'error'})
 
 
+@transaction.atomic
+def _toggle_like(image_id: str, user, action: str) -> int:
+    """
+    Ajoute ou retire le "like" de l'utilisateur et retourne le nouveau nombre de "likes".
+
+    La relation et le compteur dénormalisé sont modifiés dans la même transaction.
+    """
+    if connection.vendor == 'sqlite':
+        # SQLite ignore select_for_update : une écriture vide prend d'emblée le verrou d'écriture,
+        # les transactions concurrentes attendent au lieu d'échouer avec "database is locked"
+        Image.objects.filter(id=image_id).update(total_likes=F('total_likes'))
+    # Verrouille la ligne pour sérialiser les "likes" concurrents sur la même image
+    image = Image.objects.select_for_update().get(id=image_id)
+    # Date du "like" existant (None si l'utilisateur n'aime pas l'image)
+    liked_at = ImageLike.objects.filter(image=image, user=user).values_list('created', flat=True).first()
+    delta = 0
+    if action == 'like' and liked_at is None:
+        image.user_like.add(user)
+        delta = 1
+        score_delta = 1.0
+        create_action(user, 'likes', image)  # Diffusée dans les flux après le commit
+    elif action == 'unlike' and liked_at is not None:
+        image.user_like.remove(user)
+        delta = -1
+        score_delta = -like_weight(liked_at)  # Seul le poids restant de ce "like" est retiré
+    if delta:
+        # Mise à jour atomique côté base, sans lire puis réécrire le compteur
+        Image.objects.filter(pk=image.pk).update(
+            total_likes=F('total_likes') + delta,
+            trending_score=trending_score_delta(score_delta)  # Classement tenu à jour à chaque "like"
+        )
+        image.refresh_from_db(fields=['total_likes'])
+        # Les statistiques du tableau de bord sont mises à jour dans la même transaction
+        image_liked.send(sender=Image, image=image, user=user, delta=delta)
+    return image.total_likes
+
+
 """
 ### Résumé des étapes importantes :
 
 1. **Restriction aux utilisateurs connectés** :
-   - La vue est protégée par le décorateur `@login_required`, ce qui empêche les utilisateurs non connectés d'y accéder.
+   - La vue est protégée par le décorateur `@async_login_required` (équivalent asynchrone de `@login_required`), ce qui empêche les utilisateurs non connectés d'y accéder.
 
 2. **Gestion des requêtes POST** :
    - Si l'utilisateur soumet un formulaire (`request.method == 'POST'`), les données sont utilisées pour initialiser le formulaire `ImageCreateForm`.
    - Une fois que le formulaire est validé (`form.is_valid()`), une nouvelle instance d'image est créée sans être immédiatement enregistrée dans la base de données (`commit=False`).
-   - L'image est ensuite associée à l'utilisateur actuellement connecté (`new_image.user = request.user`) avant d'être sauvegardée.
+   - L'image est ensuite associée à l'utilisateur actuellement connecté (`new_image.user = request.user`) avant d'être sauvegardée à l'état `pending`.
+   - Le téléchargement du fichier distant est planifié sur la boucle d'événements sous ASGI (`schedule_image_ingest`, client `httpx` non bloquant) ou confié au pool de workers sous WSGI (`enqueue_image_ingest`) ; la requête n'attend pas l'hôte distant.
 
 3. **Gestion des requêtes GET** :
    - Si la requête est de type GET, le formulaire est initialisé avec les données envoyées en paramètre (par exemple, via un bookmarklet).
@@ -95,7 +384,7 @@ def image_like(request: HttpRequest) -> HttpResponse:
 ### Points importants :
 - **Sécurité et validations** :
    - Le formulaire `ImageCreateForm` gère les validations de l'URL et des autres champs (comme vu dans votre code précédent).
-   - L'utilisation de `@login_required` garantit que seuls les utilisateurs autorisés peuvent soumettre des images.
+   - L'utilisation de `@async_login_required` garantit que seuls les utilisateurs autorisés peuvent soumettre des images.
 
 - **Expérience utilisateur** :
    - Les messages (via `django.contrib.messages`) améliorent la communication avec l'utilisateur en affichant des informations sur le statut de l'opération.